@@ -0,0 +1,114 @@
+"""
+Concurrent-request throughput of an async endpoint whose upstream call blocks
+the event loop (how the bug handlers worked before) versus one that awaits the
+pooled async client or hands the call to the bounded thread pool (how they
+work now).
+
+A stub HTTP server stands in for Supabase and answers every request after
+--latency seconds, so the numbers only depend on how the handler waits.
+
+    python -m backend.benchmarks.bench_async_endpoints --requests 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+from backend.services.blocking import run_blocking
+from backend.services.http_pool import PooledHTTPClient
+
+
+def start_stub_upstream(latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            body = b"[]"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/bugs"
+
+
+def build_app(upstream_url: str):
+    app = FastAPI()
+    sync_client = httpx.Client()
+    pooled = PooledHTTPClient(http2=False)
+
+    @app.get("/blocking")
+    async def blocking():
+        # before: a sync HTTP call inside an async handler stalls the loop
+        return sync_client.get(upstream_url).json()
+
+    @app.get("/awaited")
+    async def awaited():
+        return (await pooled.request("GET", upstream_url)).json()
+
+    @app.get("/offloaded")
+    async def offloaded():
+        return (await run_blocking(sync_client.get, upstream_url)).json()
+
+    return app, sync_client, pooled
+
+
+async def measure(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> Dict[str, Any]:
+    slots = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one():
+        async with slots:
+            started = time.perf_counter()
+            resp = await client.get(path)
+            resp.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+async def main(total: int, concurrency: int, latency: float) -> None:
+    server, upstream_url = start_stub_upstream(latency)
+    app, sync_client, pooled = build_app(upstream_url)
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            print(f"{total} requests, concurrency {concurrency}, upstream latency {latency * 1000:.0f} ms")
+            print(f"{'handler':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+            for path, label in (("/blocking", "before"), ("/awaited", "async"), ("/offloaded", "threadpool")):
+                result = await measure(client, path, total, concurrency)
+                print(f"{label:<12}{result['rps']:>10.1f}{result['p50_ms']:>10.0f}{result['p95_ms']:>10.0f}")
+    finally:
+        await pooled.aclose()
+        sync_client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub upstream latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.latency))
@@ -0,0 +1,270 @@
+"""
+Micro-benchmark: planned bug row normalizer vs. the per-row alias-chain
+implementation it replaced.
+
+    python -m backend.benchmarks.bench_normalizer --rows 50000
+"""
+import argparse
+import gc
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from backend.services.formatters import normalize_bug_rows
+
+# Columns of the bug table ("Bugs_file"-style names)
+COLUMNS = [
+    "Bug ID", "Summary", "Priority", "Status", "Assignee", "Changed", "Product", "Project",
+    "Component", "Description", "Comment", "Attachments", "Defect type", "Steps to Reproduce",
+    "Reporter", "Resolution", "Sprint details", "Automation Intent", "automation_owner",
+    "automation status", "Device type", "Browser tested", "Assignee Real Name", "Project Owner",
+    "Project Owner Name",
+]
+
+# Same table with snake_case column names, where the old alias chains miss most
+SNAKE_COLUMNS = [
+    "bug_id", "summary", "priority", "status", "assignee", "updated_at", "product", "project",
+    "component", "description", "comment", "attachments", "defect_type", "steps_to_reproduce",
+    "reporter", "resolution", "sprint_details", "automation_intent", "automation_owner",
+    "automation_status", "device_type", "browser_tested", "assignee_real_name", "project_owner",
+    "project_owner_name",
+]
+
+
+# Previous implementation, kept verbatim as the baseline
+def legacy_normalize_bug_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        bug_id = (
+            row.get("Bug ID")
+            or row.get("bug_id")
+            or row.get("id")
+            or row.get("bugid")
+        )
+
+        summary = (
+            row.get("Summary")
+            or row.get("summary")
+            or row.get("title")
+            or ""
+        )
+
+        priority = (
+            row.get("Priority")
+            or row.get("priority")
+            or row.get("severity")
+            or ""
+        )
+
+        status = row.get("Status") or row.get("status") or ""
+        assignee = (
+            row.get("Assignee")
+            or row.get("assignee")
+            or row.get("assignee_name")
+            or ""
+        )
+
+        changed = (
+            row.get("Changed")
+            or row.get("changed")
+            or row.get("updated_at")
+            or row.get("updated")
+            or ""
+        )
+
+        product = (
+            row.get("Product")
+            or row.get("product")
+            or row.get("Project")
+            or row.get("project")
+            or ""
+        )
+
+        # 🔹 Description: ONLY from DB "Description" column
+        description = row.get("Description") or row.get("description") or ""
+
+        # 🔹 Comment: ONLY from DB "Comment" column (raw text / JSON string)
+        comment_value = row.get("Comment") or row.get("comment") or ""
+
+        # 🔹 Comments array:
+        # DB design is still: "Comment" column => string / JSON string
+        # We expose normalized "Comments" array to the frontend.
+        comments: List[Dict[str, Any]] = []
+        if isinstance(comment_value, str) and comment_value.strip():
+            try:
+                parsed = json.loads(comment_value)
+                if isinstance(parsed, list):
+                    comments = parsed
+                else:
+                    comments = [
+                        {
+                            "text": str(comment_value),
+                            "user": "Unknown",
+                            "timestamp": changed,
+                        }
+                    ]
+            except Exception:
+                comments = [
+                    {
+                        "text": str(comment_value),
+                        "user": "Unknown",
+                        "timestamp": changed,
+                    }
+                ]
+        else:
+            comments = []
+
+        # 🔹 Attachments: from Attachments JSONB column, if present
+        raw_attachments = (
+            row.get("Attachments")
+            or row.get("attachments")
+            or []
+        )
+
+        if isinstance(raw_attachments, str):
+            try:
+                raw_attachments = json.loads(raw_attachments)
+            except Exception:
+                raw_attachments = []
+
+        if not isinstance(raw_attachments, list):
+            raw_attachments = []
+
+        attachments: List[Dict[str, Any]] = raw_attachments
+
+        # 🔹 Additional fields for complete bug data
+        component = row.get("Component") or row.get("component") or ""
+        defect_type = row.get("Defect type") or row.get("defect_type") or ""
+        steps_to_reproduce = row.get("Steps to Reproduce") or row.get("steps_to_reproduce") or ""
+        reporter = row.get("Reporter") or row.get("reporter") or ""
+        resolution = row.get("Resolution") or row.get("resolution") or ""
+        sprint_details = row.get("Sprint details") or row.get("sprint_details") or ""
+        automation_intent = row.get("Automation Intent") or row.get("automation_intent") or ""
+        automation_owner = row.get("automation_owner") or ""
+        automation_status = row.get("automation status") or row.get("automation_status") or ""
+        device_type = row.get("Device type") or row.get("device_type") or ""
+        browser_tested = row.get("Browser tested") or row.get("browser_tested") or ""
+        project_owner = row.get("Project Owner") or row.get("project_owner") or ""
+        project_owner_name = row.get("Project Owner Name") or row.get("project_owner_name") or ""
+        assignee_real_name = row.get("Assignee Real Name") or row.get("assignee_real_name") or ""
+
+        return {
+            "Bug ID": bug_id,
+            "Summary": summary,
+            "Priority": priority,
+            "Status": status,
+            "Assignee": assignee,
+            "Assignee Real Name": assignee_real_name,
+            "Changed": changed,
+            "Product": product,
+            "Component": component,
+            "Defect type": defect_type,
+            "Steps to Reproduce": steps_to_reproduce,
+            "Reporter": reporter,
+            "Resolution": resolution,
+            "Sprint details": sprint_details,
+            "Automation Intent": automation_intent,
+            "automation_owner": automation_owner,
+            "automation status": automation_status,
+            "Device type": device_type,
+            "Browser tested": browser_tested,
+            "Project Owner": project_owner,
+            "Project Owner Name": project_owner_name,
+            "Description": description,
+            "Comment": comment_value,  # raw DB column
+            "Comments": comments,      # normalized array
+            "Attachments": attachments,
+        }
+
+    except Exception:
+        # Fallback minimal shape if something unexpected happens
+        return {
+            "Bug ID": None,
+            "Summary": "",
+            "Priority": "",
+            "Status": "",
+            "Assignee": "",
+            "Assignee Real Name": "",
+            "Changed": "",
+            "Product": "",
+            "Component": "",
+            "Defect type": "",
+            "Steps to Reproduce": "",
+            "Reporter": "",
+            "Resolution": "",
+            "Sprint details": "",
+            "Automation Intent": "",
+            "automation_owner": "",
+            "automation status": "",
+            "Device type": "",
+            "Browser tested": "",
+            "Project Owner": "",
+            "Project Owner Name": "",
+            "Description": "",
+            "Comment": "",
+            "Comments": [],
+            "Attachments": [],
+        }
+
+
+
+def synthetic_rows(count: int, columns: List[str], seed: int = 7) -> List[Dict[str, Any]]:
+    bug_id, changed, comment, attachments = columns[0], columns[5], columns[10], columns[11]
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        row: Dict[str, Any] = {col: rng.choice(["", None, f"{col} {i}"]) for col in columns}
+        row[bug_id] = f"BUG-{i:05d}"
+        row[changed] = f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T10:00:00+00:00"
+        row[comment] = json.dumps([{"text": f"comment {n}", "user": "qa", "timestamp": row[changed]} for n in range(i % 4)])
+        row[attachments] = [{"filename": f"shot{n}.png", "url": "https://example.invalid/x"} for n in range(i % 3)]
+        rows.append(row)
+    return rows
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    # like timeit: keep the cyclic GC from scanning the 50k-row heap mid-run
+    timings = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return min(timings)
+
+
+def run(label: str, columns: List[str], count: int, repeat: int) -> None:
+    rows = synthetic_rows(count, columns)
+    legacy_fields = list(legacy_normalize_bug_row(rows[0]))
+    assert [legacy_normalize_bug_row(r) for r in rows[:1000]] == normalize_bug_rows(rows[:1000], legacy_fields)
+
+    # list responses: counts instead of decoded Comments / Attachments
+    list_fields = [f for f in legacy_fields if f not in ("Comment", "Comments", "Attachments")]
+    list_fields += ["comment_count", "attachment_count"]
+    cases = [
+        ("legacy per-row", lambda: [legacy_normalize_bug_row(r) for r in rows]),
+        ("planned dicts", lambda: normalize_bug_rows(rows, legacy_fields)),
+        ("list view (counts)", lambda: normalize_bug_rows(rows, list_fields)),
+        ("planned 5 fields", lambda: normalize_bug_rows(rows, ["Bug ID", "Summary", "Priority", "Status", "Assignee"])),
+    ]
+    baseline = None
+    print(f"{label}: {count} rows, best of {repeat}")
+    for name, fn in cases:
+        elapsed = best_of(fn, repeat)
+        baseline = baseline or elapsed
+        print(f"  {name:<20}{elapsed * 1000:>9.1f} ms{baseline / elapsed:>8.2f}x")
+
+
+def main(count: int, repeat: int) -> None:
+    run("Title Case columns", COLUMNS, count, repeat)
+    run("snake_case columns", SNAKE_COLUMNS, count, repeat)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
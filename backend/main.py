@@ -1,11 +1,18 @@
 # backend/main.py
 from fastapi import FastAPI, HTTPException, Request, Header, Query, File, UploadFile, Path, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from typing import Optional, List, Dict, Any, Union
 from backend.services.supabase_client import supabase, supabase_admin, verify_supabase_token
 from backend.services.supabase_client import MissingSupabaseClient
-from backend.services.formatters import normalize_control
+from backend.services.formatters import (
+    normalize_control,
+    normalize_bug_row,
+    normalize_bug_rows,
+    parse_bug_comments,
+    parse_bug_attachments,
+)
+from backend.services.blocking import run_blocking, execute as _execute, stats as blocking_pool_stats
 from datetime import datetime, timezone
 import re
 from uuid import uuid4
@@ -63,7 +70,7 @@ app.add_middleware(
 @app.get("/api/controls")
 async def get_controls():
     try:
-        resp = supabase.table("controls").select("*").execute()
+        resp = await _execute(supabase.table("controls").select("*"))
         data = resp.data or []
         formatted = [normalize_control(row) for row in data]
         return {"status": "success", "data": formatted}
@@ -76,14 +83,14 @@ async def get_role_modules(role_id: str):
     Retrieve modules associated with a specific role.
     """
     try:
-        resp = supabase.table("role_module_access").select("module_id").eq("role_id", role_id).execute()
+        resp = await _execute(supabase.table("role_module_access").select("module_id").eq("role_id", role_id))
         if hasattr(resp, "error") and getattr(resp, "error", None):
             raise HTTPException(status_code=400, detail=str(getattr(resp, "error")))
 
         items = getattr(resp, "data", []) or []
         module_ids = [item.get("module_id") for item in items if isinstance(item, dict) and item.get("module_id") is not None]
 
-        modules_resp = supabase.table("modules").select("module_name").in_("id", module_ids).execute()
+        modules_resp = await _execute(supabase.table("modules").select("module_name").in_("id", module_ids))
         if hasattr(modules_resp, "error") and getattr(modules_resp, "error", None):
             raise HTTPException(status_code=400, detail=str(getattr(modules_resp, "error")))
 
@@ -100,7 +107,7 @@ async def update_role_modules(role_id: str, module_names: List[str]):
     """
     try:
         # First, get module IDs from module names
-        modules_resp = supabase.table("modules").select("id, module_name").in_("module_name", module_names).execute()
+        modules_resp = await _execute(supabase.table("modules").select("id, module_name").in_("module_name", module_names))
         if hasattr(modules_resp, "error") and getattr(modules_resp, "error", None):
             raise HTTPException(status_code=400, detail=str(getattr(modules_resp, "error")))
         
@@ -114,7 +121,7 @@ async def update_role_modules(role_id: str, module_names: List[str]):
         module_ids_to_add = [module_name_to_id[name] for name in module_names if name in module_name_to_id]
 
         # Delete existing role_module_access entries for this role
-        delete_resp = supabase.table("role_module_access").delete().eq("role_id", role_id).execute()
+        delete_resp = await _execute(supabase.table("role_module_access").delete().eq("role_id", role_id))
         if hasattr(delete_resp, "error") and getattr(delete_resp, "error", None):
             raise HTTPException(status_code=400, detail=str(getattr(delete_resp, "error")))
 
@@ -126,7 +133,7 @@ async def update_role_modules(role_id: str, module_names: List[str]):
                 "created_at": datetime.now(timezone.utc).isoformat()
             } for module_id in module_ids_to_add]
             
-            insert_resp = supabase.table("role_module_access").insert(insert_data).execute()
+            insert_resp = await _execute(supabase.table("role_module_access").insert(insert_data))
             if hasattr(insert_resp, "error") and getattr(insert_resp, "error", None):
                 raise HTTPException(status_code=400, detail=str(getattr(insert_resp, "error")))
 
@@ -186,7 +193,7 @@ async def sync_sso_user(request: Request):
 
         # Check if user exists
         # Use limit(1) instead of single() to avoid crash if not found
-        resp = supabase.table("users").select("*").eq("email", email).limit(1).execute()
+        resp = await _execute(supabase.table("users").select("*").eq("email", email).limit(1))
         existing_user = resp.data[0] if resp.data else None
 
         now_iso = datetime.now(timezone.utc).isoformat()
@@ -206,7 +213,7 @@ async def sync_sso_user(request: Request):
             
             # If user was inactive, maybe reactivate? For now let's keep status as is unless it's new
             
-            upd_resp = supabase.table("users").update(update_data).eq("id", (existing_user["id"] if isinstance(existing_user, dict) else None)).execute()
+            upd_resp = await _execute(supabase.table("users").update(update_data).eq("id", (existing_user["id"] if isinstance(existing_user, dict) else None)))
             if hasattr(upd_resp, "error") and getattr(upd_resp, "error", None):
                  logger.error(f"Failed to update SSO user: {getattr(upd_resp, 'error', None)}")
             
@@ -227,7 +234,7 @@ async def sync_sso_user(request: Request):
                 "updated_at": now_iso
             }
             
-            ins_resp = supabase.table("users").insert(new_user).execute()
+            ins_resp = await _execute(supabase.table("users").insert(new_user))
             if hasattr(ins_resp, "error") and getattr(ins_resp, "error", None):
                 raise HTTPException(status_code=500, detail=str(getattr(ins_resp, "error")))
             
@@ -254,7 +261,7 @@ async def login(request: Request):
 
         # Query public.users table
         # Note: We select password field explicitly
-        resp = supabase.table("users").select("*").eq("email", email).single().execute()
+        resp = await _execute(supabase.table("users").select("*").eq("email", email).single())
         
         if not resp.data:
             raise HTTPException(status_code=401, detail="Invalid email or password")
@@ -271,7 +278,7 @@ async def login(request: Request):
 
         # Verify password (assuming plain text or simple comparison for now based on 'verify_password' util)
         # Ideally, stored_password should be hashed.
-        if not verify_password(password, stored_password):
+        if not await run_blocking(verify_password, password, stored_password):
              raise HTTPException(status_code=401, detail="Invalid email or password")
              
         # Generate Custom JWT
@@ -307,13 +314,12 @@ async def search_users(q: str = Query(default=""), Authorization: Optional[str]
         query = q.strip()
         if not query:
             return {"data": [], "error": None}
-        resp = (
+        resp = await _execute(
             supabase
             .table("users")
             .select("id,email")
             .ilike("email", f"%{query}%")
             .limit(10)
-            .execute()
         )
         if hasattr(resp, "error") and getattr(resp, "error", None):
             raise HTTPException(status_code=400, detail=str(getattr(resp, "error")))
@@ -359,7 +365,7 @@ async def get_roles():
         if isinstance(supabase, MissingSupabaseClient):
             return {"status": "success", "data": defaults, "total": len(defaults)}
         try:
-            resp = supabase.table("roles").select("*").execute()
+            resp = await _execute(supabase.table("roles").select("*"))
         except Exception:
             return {"status": "success", "data": defaults, "total": len(defaults)}
         if hasattr(resp, "error") and getattr(resp, "error", None):
@@ -367,8 +373,8 @@ async def get_roles():
         roles = getattr(resp, "data", []) or []
         if not roles:
             try:
-                supabase.table("roles").insert(defaults).execute()
-                resp2 = supabase.table("roles").select("*").execute()
+                await _execute(supabase.table("roles").insert(defaults))
+                resp2 = await _execute(supabase.table("roles").select("*"))
                 roles = getattr(resp2, "data", []) or defaults
             except Exception:
                 roles = defaults
@@ -396,7 +402,7 @@ async def get_modules():
         if isinstance(supabase, MissingSupabaseClient):
             return {"status": "success", "data": [{"id": None, "module_name": m} for m in default_modules], "total": len(default_modules)}
         try:
-            resp = supabase.table("modules").select("*").execute()
+            resp = await _execute(supabase.table("modules").select("*"))
         except Exception:
             return {"status": "success", "data": [{"id": None, "module_name": m} for m in default_modules], "total": len(default_modules)}
         if hasattr(resp, "error") and getattr(resp, "error", None):
@@ -405,11 +411,11 @@ async def get_modules():
         if not modules:
             now_iso = datetime.now(timezone.utc).isoformat()
             try:
-                supabase.table("modules").insert([
+                await _execute(supabase.table("modules").insert([
                     {"module_name": name, "created_at": now_iso, "updated_at": now_iso}
                     for name in default_modules
-                ]).execute()
-                resp2 = supabase.table("modules").select("*").execute()
+                ]))
+                resp2 = await _execute(supabase.table("modules").select("*"))
                 modules = getattr(resp2, "data", []) or [{"module_name": name} for name in default_modules]
             except Exception:
                 modules = [{"module_name": name} for name in default_modules]
@@ -434,7 +440,8 @@ def get_users(
     and sorting by various fields.
     """
     try:
-        query = supabase.table("users").select("*")
+        # count="exact" makes the same (filtered) query report its total
+        query = supabase.table("users").select("*", count="exact")
         
         # Apply filters
         if search:
@@ -487,9 +494,10 @@ def get_users(
                 
                 enhanced_users.append(user)
         
-        # Get total count for pagination
-        count_resp = supabase.table("users").select("id").execute()
-        total_count = len(getattr(count_resp, "data", []) or [])
+        # Total matching rows for pagination (from the count above)
+        total_count = getattr(resp, "count", None)
+        if total_count is None:
+            total_count = offset + len(rows)
         
         return {
             "status": "success",
@@ -509,19 +517,17 @@ def get_users(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/users/stats")
-def get_users_stats():
+async def get_users_stats():
     """Get user statistics for dashboard and analytics."""
     try:
         # Get total users
-        total_resp = supabase.table("users").select("id").execute()
-        total_users = len(getattr(total_resp, "data", []) or [])
+        total_users, _ = await _count_table("users")
         
         # Get active users
-        active_resp = supabase.table("users").select("id").eq("is_active", True).execute()
-        active_users = len(getattr(active_resp, "data", []) or [])
+        active_users, _ = await _count_table("users", {"is_active": "eq.true"})
         
         # Get users by role
-        roles_resp = supabase.table("users").select("role").execute()
+        roles_resp = await _execute(supabase.table("users").select("role"))
         roles_data = getattr(roles_resp, "data", []) or []
         
         role_counts = {}
@@ -531,7 +537,7 @@ def get_users_stats():
                 role_counts[role] = role_counts.get(role, 0) + 1
         
         # Get users by department
-        dept_resp = supabase.table("users").select("department").execute()
+        dept_resp = await _execute(supabase.table("users").select("department"))
         dept_data = getattr(dept_resp, "data", []) or []
         
         dept_counts = {}
@@ -541,8 +547,7 @@ def get_users_stats():
                 dept_counts[dept] = dept_counts.get(dept, 0) + 1
         
         # Get SSO vs Local users
-        sso_resp = supabase.table("users").select("sso_provider").not_.is_("sso_provider", "null").execute()
-        sso_users = len(getattr(sso_resp, "data", []) or [])
+        sso_users, _ = await _count_table("users", {"sso_provider": "not.is.null"})
         local_users = total_users - sso_users
         
         return {
@@ -580,9 +585,9 @@ async def update_user(user_id: str, request: Request):
         
         # Hash password if provided
         if "password" in payload and payload["password"]:
-            payload["password"] = get_password_hash(payload["password"])
+            payload["password"] = await run_blocking(get_password_hash, payload["password"])
         
-        resp = supabase.table("users").update(payload).eq("id", user_id).execute()
+        resp = await _execute(supabase.table("users").update(payload).eq("id", user_id))
         
         if hasattr(resp, "error") and getattr(resp, "error", None):
             error_msg = str(getattr(resp, "error"))
@@ -607,10 +612,10 @@ async def toggle_user_status(user_id: str, request: Request):
         payload = await request.json()
         is_active = payload.get("is_active", True)
         
-        resp = supabase.table("users").update({
+        resp = await _execute(supabase.table("users").update({
             "is_active": is_active,
             "updated_at": datetime.now(timezone.utc).isoformat()
-        }).eq("id", user_id).execute()
+        }).eq("id", user_id))
         
         if hasattr(resp, "error") and getattr(resp, "error", None):
             error_msg = str(getattr(resp, "error"))
@@ -638,12 +643,12 @@ async def delete_user(user_id: str):
     """Delete a user from the system."""
     try:
         # Check if user exists
-        user_resp = supabase.table("users").select("id").eq("id", user_id).single().execute()
+        user_resp = await _execute(supabase.table("users").select("id").eq("id", user_id).single())
         if not getattr(user_resp, "data", None):
             raise HTTPException(status_code=404, detail="User not found")
         
         # Delete the user
-        resp = supabase.table("users").delete().eq("id", user_id).execute()
+        resp = await _execute(supabase.table("users").delete().eq("id", user_id))
         
         if hasattr(resp, "error") and getattr(resp, "error", None):
             error_msg = str(getattr(resp, "error"))
@@ -683,7 +688,7 @@ async def invite_user(request: Request):
             raise HTTPException(status_code=400, detail="Invalid email format")
         
         # Check if user already exists
-        existing = supabase.table("users").select("id").eq("email", email).execute()
+        existing = await _execute(supabase.table("users").select("id").eq("email", email))
         if getattr(existing, "data", []):
             raise HTTPException(status_code=409, detail="User with this email already exists")
         
@@ -701,7 +706,7 @@ async def invite_user(request: Request):
             "username": email.split("@")[0]  # Generate username from email
         }
         
-        resp = supabase.table("users").insert(invitation_data).execute()
+        resp = await _execute(supabase.table("users").insert(invitation_data))
         
         if hasattr(resp, "error") and getattr(resp, "error", None):
             error_msg = str(getattr(resp, "error"))
@@ -749,11 +754,11 @@ async def create_user(request: Request):
             username = email.split("@")[0]  # Generate username from email if not provided
 
         # Prevent duplicates by email
-        existing = supabase.table("users").select("id").eq("email", email).execute()
+        existing = await _execute(supabase.table("users").select("id").eq("email", email))
         if (existing.data or []):
             raise HTTPException(status_code=409, detail="User with this email already exists")
 
-        hashed_password = get_password_hash(password) if password else None
+        hashed_password = await run_blocking(get_password_hash, password) if password else None
 
         now = datetime.now(timezone.utc).isoformat(timespec="seconds")
         to_insert = {
@@ -777,7 +782,7 @@ async def create_user(request: Request):
         # Only add sso_user_id if it's provided and not empty
         if payload.get("sso_user_id"):
             to_insert["sso_user_id"] = payload["sso_user_id"]
-        resp = supabase.table("users").insert(to_insert).execute()
+        resp = await _execute(supabase.table("users").insert(to_insert))
         if hasattr(resp, "error") and getattr(resp, "error", None):
             error_msg = str(getattr(resp, "error"))
             raise HTTPException(status_code=500, detail=error_msg)
@@ -792,31 +797,39 @@ async def create_user(request: Request):
 # 🪲 BUGS MODULE ENDPOINTS (USING SUPABASE REST)
 # ============================
 import os
+import io
+import csv
 import json
 import time
 import re
-from datetime import datetime, timezone
-from typing import Dict, Any, List
-
-try:
-    requests = __import__("requests")
-except Exception:
-    requests = None
-
-def _http_get(url: str, headers: Dict[str, str] | None = None, params: Dict[str, Any] | None = None, timeout: int | None = None):
-    if requests is None:
-        raise HTTPException(status_code=500, detail="HTTP client not available")
-    return requests.get(url, headers=headers, params=params, timeout=timeout)
-
-def _http_post(url: str, headers: Dict[str, str] | None = None, json: Dict[str, Any] | None = None, timeout: int | None = None):
-    if requests is None:
-        raise HTTPException(status_code=500, detail="HTTP client not available")
-    return requests.post(url, headers=headers, json=json, timeout=timeout)
-
-def _http_patch(url: str, headers: Dict[str, str] | None = None, params: Dict[str, Any] | None = None, json: Dict[str, Any] | None = None, timeout: int | None = None):
-    if requests is None:
-        raise HTTPException(status_code=500, detail="HTTP client not available")
-    return requests.patch(url, headers=headers, params=params, json=json, timeout=timeout)
+import base64
+import asyncio
+import hashlib
+import email.utils
+import numpy as np
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable, NamedTuple
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from backend.services.http_pool import rest_client
+from backend.services.cache import TTLCache, StaleWhileRevalidateCache
+from backend.services.indexes import DistinctValueIndex, RefreshingIndex, TimeRollup
+from backend.services.columnar import ColumnFrame, text_column
+from backend.services import transtracker_fields
+from backend.services.bug_ids import BugIdAllocator
+
+# All REST helpers share one keep-alive connection pool (see services/http_pool.py)
+async def _http_get(url: str, headers: Dict[str, str] | None = None, params: Dict[str, Any] | None = None, timeout: int | None = None):
+    return await rest_client.request("GET", url, headers=headers, params=params, timeout=timeout)
+
+async def _http_post(url: str, headers: Dict[str, str] | None = None, json: Dict[str, Any] | List[Dict[str, Any]] | None = None, timeout: int | None = None, params: Dict[str, Any] | None = None):
+    return await rest_client.request("POST", url, headers=headers, params=params, json=json, timeout=timeout)
+
+async def _http_head(url: str, headers: Dict[str, str] | None = None, params: Dict[str, Any] | None = None, timeout: int | None = None):
+    return await rest_client.request("HEAD", url, headers=headers, params=params, timeout=timeout)
+
+async def _http_patch(url: str, headers: Dict[str, str] | None = None, params: Dict[str, Any] | None = None, json: Dict[str, Any] | None = None, timeout: int | None = None):
+    return await rest_client.request("PATCH", url, headers=headers, params=params, json=json, timeout=timeout)
 from fastapi import HTTPException, Request, Path, File, UploadFile
 
 # Supabase config
@@ -832,11 +845,6 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
 # Supabase REST URL (PostgREST)
 SUPABASE_REST_URL = f"{SUPABASE_URL}/rest/v1"
 
-# 🔹 Supabase Python client (used only for Storage)
-from supabase import create_client, Client
-
-storage_client: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-
 # Candidate table names to try
 CANDIDATE_TABLES = ["bugs", "Bugs_file", "bugs_file"]
 
@@ -856,312 +864,613 @@ def _supabase_headers(extra: Dict[str, str] | None = None) -> Dict[str, str]:
     return base
 
 
-# ---------- NORMALIZER ----------
+# ---------- TABLE RESOLVER ----------
 
-def normalize_bug_row(row: Dict[str, Any]) -> Dict[str, Any]:
+# PostgREST / Postgres error codes meaning "that table or column is not there"
+_SCHEMA_ERROR_CODES = {"42P01", "42703", "PGRST200", "PGRST204", "PGRST205"}
+
+
+def _is_schema_error(resp) -> bool:
+    if resp.status_code == 404:
+        return True
     try:
-        bug_id = (
-            row.get("Bug ID")
-            or row.get("bug_id")
-            or row.get("id")
-            or row.get("bugid")
-        )
+        body = resp.json()
+    except Exception:
+        return False
+    return isinstance(body, dict) and body.get("code") in _SCHEMA_ERROR_CODES
 
-        summary = (
-            row.get("Summary")
-            or row.get("summary")
-            or row.get("title")
-            or ""
-        )
 
-        priority = (
-            row.get("Priority")
-            or row.get("priority")
-            or row.get("severity")
-            or ""
-        )
+class BugTableResolver:
+    """
+    Finds which of CANDIDATE_TABLES holds the bugs and memoizes it.
 
-        status = row.get("Status") or row.get("status") or ""
-        assignee = (
-            row.get("Assignee")
-            or row.get("assignee")
-            or row.get("assignee_name")
-            or ""
-        )
+    A non-empty table wins; if every reachable table is empty, the first
+    reachable one is used. The choice is only re-probed after invalidate().
+    """
 
-        changed = (
-            row.get("Changed")
-            or row.get("changed")
-            or row.get("updated_at")
-            or row.get("updated")
-            or ""
-        )
+    def __init__(self, candidates: List[str]):
+        self.candidates = list(candidates)
+        self._table: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self.resolved_at: Optional[str] = None
+        self.probe_count = 0
+        self.invalidation_count = 0
+        self.last_errors: List[str] = []
+
+    @property
+    def current(self) -> Optional[str]:
+        return self._table
+
+    async def get(self) -> str:
+        table = self._table
+        if table is not None:
+            return table
+        async with self._lock:
+            if self._table is None:
+                await self._probe()
+            return self._table
+
+    def invalidate(self) -> None:
+        if self._table is not None:
+            self.invalidation_count += 1
+        self._table = None
+
+    async def _probe(self) -> None:
+        errors = []
+        first_reachable = None
+        chosen = None
+        for name in self.candidates:
+            try:
+                resp = await _http_get(
+                    f"{SUPABASE_REST_URL}/{name}",
+                    headers=_supabase_headers(),
+                    params={"select": '"Bug ID"', "limit": "1"},
+                    timeout=10,
+                )
+            except Exception as e:
+                errors.append(f"{name}: {e}")
+                continue
+            if not resp.is_success:
+                errors.append(f"{name}: {resp.status_code} {resp.text}")
+                continue
+            if first_reachable is None:
+                first_reachable = name
+            if resp.json():
+                chosen = name
+                break
 
-        product = (
-            row.get("Product")
-            or row.get("product")
-            or row.get("Project")
-            or row.get("project")
-            or ""
-        )
+        self.probe_count += 1
+        self.last_errors = errors
+        chosen = chosen or first_reachable
+        if chosen is None:
+            raise HTTPException(
+                status_code=500,
+                detail=f"No bug table available. Tried -> {'; '.join(errors)}",
+            )
+        self._table = chosen
+        self.resolved_at = datetime.now(timezone.utc).isoformat()
+        logger.info("Resolved bug table: %s", chosen)
 
-        # 🔹 Description: ONLY from DB "Description" column
-        description = row.get("Description") or row.get("description") or ""
+    def diagnostics(self) -> Dict[str, Any]:
+        return {
+            "table": self._table,
+            "candidates": self.candidates,
+            "resolved_at": self.resolved_at,
+            "probe_count": self.probe_count,
+            "invalidation_count": self.invalidation_count,
+            "last_probe_errors": self.last_errors,
+        }
 
-        # 🔹 Comment: ONLY from DB "Comment" column (raw text / JSON string)
-        comment_value = row.get("Comment") or row.get("comment") or ""
 
-        # 🔹 Comments array:
-        # DB design is still: "Comment" column => string / JSON string
-        # We expose normalized "Comments" array to the frontend.
-        comments: List[Dict[str, Any]] = []
-        if isinstance(comment_value, str) and comment_value.strip():
-            try:
-                parsed = json.loads(comment_value)
-                if isinstance(parsed, list):
-                    comments = parsed
-                else:
-                    comments = [
-                        {
-                            "text": str(comment_value),
-                            "user": "Unknown",
-                            "timestamp": changed,
-                        }
-                    ]
-            except Exception:
-                comments = [
-                    {
-                        "text": str(comment_value),
-                        "user": "Unknown",
-                        "timestamp": changed,
-                    }
-                ]
-        else:
-            comments = []
+bug_tables = BugTableResolver(CANDIDATE_TABLES)
 
-        # 🔹 Attachments: from Attachments JSONB column, if present
-        raw_attachments = (
-            row.get("Attachments")
-            or row.get("attachments")
-            or []
+
+async def _bug_table_request(send: Callable[[str], Awaitable[Any]]):
+    """
+    Await `send(table_name)` against the resolved bug table. A 404 or schema
+    error drops the memoized table and retries once on a freshly probed one.
+    """
+    table = await bug_tables.get()
+    resp = await send(table)
+    if _is_schema_error(resp):
+        logger.warning("Bug table %s returned %s; re-probing", table, resp.status_code)
+        bug_tables.invalidate()
+        retry_table = await bug_tables.get()
+        if retry_table != table:
+            resp = await send(retry_table)
+    return resp
+
+
+# ---------- PAGINATION / FILTER HELPERS ----------
+
+BUG_LIST_DEFAULT_LIMIT = 50
+BUG_LIST_MAX_LIMIT = 500
+
+# Query param name -> DB column for server-side list filters
+BUG_FILTER_COLUMNS = {
+    "status": "Status",
+    "priority": "Priority",
+    "assignee": "Assignee",
+    "product": "Product",
+}
+
+# Canonical bug field -> DB columns it is read from (quoted where needed)
+BUG_FIELD_COLUMNS: Dict[str, List[str]] = {
+    "Bug ID": ['"Bug ID"'],
+    "Summary": ["Summary"],
+    "Priority": ["Priority"],
+    "Status": ["Status"],
+    "Assignee": ["Assignee"],
+    "Changed": ["Changed"],
+    "Product": ["Product", "Project"],
+    "Component": ["Component"],
+    "Description": ["Description"],
+    "Comment": ["Comment"],
+    "Comments": ["Comment"],
+    "Attachments": ["Attachments"],
+    "Defect type": ['"Defect type"'],
+    "Steps to Reproduce": ['"Steps to Reproduce"'],
+    "Reporter": ["Reporter"],
+    "Resolution": ["Resolution"],
+    "Sprint details": ['"Sprint details"'],
+    "Automation Intent": ['"Automation Intent"'],
+    "automation_owner": ["automation_owner"],
+    "automation status": ['"automation status"'],
+    "Device type": ['"Device type"'],
+    "Browser tested": ['"Browser tested"'],
+    "Assignee Real Name": ['"Assignee Real Name"'],
+    "Project Owner": ['"Project Owner"'],
+    "Project Owner Name": ['"Project Owner Name"'],
+    "comment_count": ["Comment"],
+    "attachment_count": ["Attachments"],
+}
+
+# Always returned by list queries: they make up the pagination cursor
+BUG_LIST_KEY_FIELDS = ["Bug ID", "Changed"]
+
+# `include=` value -> fields decoded only on request in list responses
+BUG_LIST_INCLUDES: Dict[str, List[str]] = {
+    "comments": ["Comment", "Comments"],
+    "attachments": ["Attachments"],
+}
+
+# List responses leave out every field read from the Comment / Attachments
+# columns, counts included: those columns are most of a row's bytes. Ask for
+# them with fields= or include= (the detail endpoint returns everything).
+BUG_LIST_DEFAULT_FIELDS = [
+    name for name, columns in BUG_FIELD_COLUMNS.items()
+    if not {"Comment", "Attachments"} & set(columns)
+]
+
+_BUG_FIELD_LOOKUP = {
+    alias: name
+    for name in BUG_FIELD_COLUMNS
+    for alias in (name.lower(), name.lower().replace(" ", "_"))
+}
+
+
+def _parse_bug_fields(raw: Optional[str], required: Optional[List[str]] = None) -> Optional[List[str]]:
+    """
+    Parse a `fields=` query value ("Summary,Status" or "summary,bug_id") into
+    canonical field names. None means all fields.
+    """
+    if raw is None or not raw.strip():
+        return None
+    fields: List[str] = list(required or [])
+    unknown = []
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name = _BUG_FIELD_LOOKUP.get(part.lower())
+        if name is None:
+            unknown.append(part)
+        elif name not in fields:
+            fields.append(name)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Valid fields: {', '.join(BUG_FIELD_COLUMNS)}",
+        )
+    return fields
+
+
+def _parse_bug_includes(raw: Optional[str]) -> List[str]:
+    """Parse `include=comments,attachments` into the fields it adds."""
+    fields: List[str] = []
+    if raw is None:
+        return fields
+    unknown = []
+    for part in raw.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        if part not in BUG_LIST_INCLUDES:
+            unknown.append(part)
+            continue
+        fields.extend(f for f in BUG_LIST_INCLUDES[part] if f not in fields)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include: {', '.join(unknown)}. Valid values: {', '.join(BUG_LIST_INCLUDES)}",
         )
+    return fields
 
-        if isinstance(raw_attachments, str):
-            try:
-                raw_attachments = json.loads(raw_attachments)
-            except Exception:
-                raw_attachments = []
-
-        if not isinstance(raw_attachments, list):
-            raw_attachments = []
-
-        attachments: List[Dict[str, Any]] = raw_attachments
-
-        # 🔹 Additional fields for complete bug data
-        component = row.get("Component") or row.get("component") or ""
-        defect_type = row.get("Defect type") or row.get("defect_type") or ""
-        steps_to_reproduce = row.get("Steps to Reproduce") or row.get("steps_to_reproduce") or ""
-        reporter = row.get("Reporter") or row.get("reporter") or ""
-        resolution = row.get("Resolution") or row.get("resolution") or ""
-        sprint_details = row.get("Sprint details") or row.get("sprint_details") or ""
-        automation_intent = row.get("Automation Intent") or row.get("automation_intent") or ""
-        automation_owner = row.get("automation_owner") or ""
-        automation_status = row.get("automation status") or row.get("automation_status") or ""
-        device_type = row.get("Device type") or row.get("device_type") or ""
-        browser_tested = row.get("Browser tested") or row.get("browser_tested") or ""
-        project_owner = row.get("Project Owner") or row.get("project_owner") or ""
-        project_owner_name = row.get("Project Owner Name") or row.get("project_owner_name") or ""
-        assignee_real_name = row.get("Assignee Real Name") or row.get("assignee_real_name") or ""
 
-        return {
-            "Bug ID": bug_id,
-            "Summary": summary,
-            "Priority": priority,
-            "Status": status,
-            "Assignee": assignee,
-            "Assignee Real Name": assignee_real_name,
-            "Changed": changed,
-            "Product": product,
-            "Component": component,
-            "Defect type": defect_type,
-            "Steps to Reproduce": steps_to_reproduce,
-            "Reporter": reporter,
-            "Resolution": resolution,
-            "Sprint details": sprint_details,
-            "Automation Intent": automation_intent,
-            "automation_owner": automation_owner,
-            "automation status": automation_status,
-            "Device type": device_type,
-            "Browser tested": browser_tested,
-            "Project Owner": project_owner,
-            "Project Owner Name": project_owner_name,
-            "Description": description,
-            "Comment": comment_value,  # raw DB column
-            "Comments": comments,      # normalized array
-            "Attachments": attachments,
-        }
+def _bug_select(fields: Optional[List[str]] = None) -> str:
+    """PostgREST `select=` projection for the given canonical fields."""
+    columns: List[str] = []
+    for name in fields or BUG_FIELD_COLUMNS:
+        for column in BUG_FIELD_COLUMNS[name]:
+            if column not in columns:
+                columns.append(column)
+    return ",".join(columns)
 
-    except Exception:
-        # Fallback minimal shape if something unexpected happens
-        return {
-            "Bug ID": None,
-            "Summary": "",
-            "Priority": "",
-            "Status": "",
-            "Assignee": "",
-            "Assignee Real Name": "",
-            "Changed": "",
-            "Product": "",
-            "Component": "",
-            "Defect type": "",
-            "Steps to Reproduce": "",
-            "Reporter": "",
-            "Resolution": "",
-            "Sprint details": "",
-            "Automation Intent": "",
-            "automation_owner": "",
-            "automation status": "",
-            "Device type": "",
-            "Browser tested": "",
-            "Project Owner": "",
-            "Project Owner Name": "",
-            "Description": "",
-            "Comment": "",
-            "Comments": [],
-            "Attachments": [],
-        }
 
+# Keyset order: newest first, "Bug ID" breaks ties between equal Changed values
+BUG_LIST_ORDER = 'Changed.desc.nullslast,"Bug ID".desc'
 
-# ---------- SELECT / INSERT HELPERS (REST) ----------
 
-def _select_bugs_with_fallback():
-    errors = []
-    empty_tables = []
-    for name in CANDIDATE_TABLES:
-        try:
-            params = {
-                "select": '"Bug ID",Summary,Priority,Status,Assignee,Changed,Product,Project,Component,Description,Comment,Attachments,"Defect type","Steps to Reproduce",Reporter,Resolution,"Sprint details","Automation Intent",automation_owner,"automation status","Device type","Browser tested","Assignee Real Name","Project Owner","Project Owner Name"',
-                "order": "Changed.desc",
-            }
-            resp = _http_get(
-                f"{SUPABASE_REST_URL}/{name}",
-                headers=_supabase_headers(),
-                params=params,
-                timeout=10,
-            )
+def _postgrest_quote(value: Any) -> str:
+    """
+    Quote a value for use inside a PostgREST logic tree (or=/and=) or in.() list.
+    """
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
 
-            if not resp.ok:
-                errors.append(f"{name}: {resp.status_code} {resp.text}")
-                continue
 
-            data = resp.json() or []
-            if not data:
-                empty_tables.append(name)
-                continue
+def _encode_bug_cursor(changed: Any, bug_id: Any) -> str:
+    raw = json.dumps([changed or None, bug_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
 
-            normalized = [normalize_bug_row(r) for r in data]
-            return {"status": "success", "data": normalized}
-        except Exception as e:
-            errors.append(f"{name}: {e}")
+
+def _decode_bug_cursor(cursor: str) -> Tuple[Any, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        changed, bug_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if bug_id is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return changed, bug_id
+
+
+def _bug_keyset_filter(changed: Any, bug_id: Any) -> str:
+    """
+    PostgREST `or=` filter selecting the rows that come after (changed, bug_id)
+    in BUG_LIST_ORDER. Rows without Changed sort last.
+    """
+    bid = _postgrest_quote(bug_id)
+    if changed in (None, ""):
+        return f'(and(Changed.is.null,"Bug ID".lt.{bid}))'
+    ch = _postgrest_quote(changed)
+    return f'(Changed.lt.{ch},and(Changed.eq.{ch},"Bug ID".lt.{bid}),Changed.is.null)'
+
+
+def _filter_params(filters: Dict[str, Any] | None, columns: Dict[str, str]) -> Dict[str, str]:
+    """
+    Map list filters ({"status": "OPEN", "priority": "High,Critical"}) to
+    PostgREST query params via `columns` (param -> DB column).
+    Comma-separated values become an in.() filter.
+    """
+    params: Dict[str, str] = {}
+    for key, value in (filters or {}).items():
+        column = columns.get(key)
+        if column is None or value is None or str(value).strip() == "":
             continue
+        values = [v.strip() for v in str(value).split(",") if v.strip()]
+        if len(values) == 1:
+            params[column] = f"eq.{values[0]}"
+        else:
+            params[column] = f"in.({','.join(_postgrest_quote(v) for v in values)})"
+    return params
+
+
+def _bug_filter_params(filters: Dict[str, Any] | None) -> Dict[str, str]:
+    return _filter_params(filters, BUG_FILTER_COLUMNS)
+
+
+# columns the list `search` matches (case-insensitive substring)
+BUG_SEARCH_COLUMNS = ["Summary", "Product", "Assignee", "Bug ID"]
 
-    if empty_tables:
-        return {"status": "success", "data": []}
 
-    raise HTTPException(
-        status_code=500,
-        detail=f"Failed to fetch bugs. Tried -> {'; '.join(map(str, errors))}",
+def _bug_search_filter(term: str) -> str:
+    """`and=` value matching `term` anywhere in BUG_SEARCH_COLUMNS."""
+    pattern = _postgrest_quote(f"*{term}*")
+    columns = ",".join(f'"{c}".ilike.{pattern}' if " " in c else f"{c}.ilike.{pattern}" for c in BUG_SEARCH_COLUMNS)
+    return f"(or({columns}))"
+
+
+# ---------- SELECT / INSERT HELPERS (REST) ----------
+
+async def _fetch_bug_page(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    fields: Optional[List[str]] = None,
+):
+    """Uncached read behind _select_bugs_with_fallback."""
+    filter_params = _bug_filter_params(filters)
+    after = _decode_bug_cursor(cursor) if cursor else None
+    params = {
+        "select": _bug_select(fields),
+        "order": BUG_LIST_ORDER,
+        **filter_params,
+    }
+    if after is not None:
+        params["or"] = _bug_keyset_filter(*after)
+    search = str((filters or {}).get("search") or "").strip()
+    if search:
+        # under and= so it doesn't clash with the cursor's or=
+        params["and"] = _bug_search_filter(search)
+    if limit is not None:
+        # one extra row tells us whether another page exists
+        params["limit"] = str(limit + 1)
+
+    resp = await _bug_table_request(
+        lambda name: _http_get(
+            f"{SUPABASE_REST_URL}/{name}",
+            headers=_supabase_headers(),
+            params=params,
+            timeout=10,
+        )
     )
+    if not resp.is_success:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch bugs from {bug_tables.current}: {resp.status_code} {resp.text}",
+        )
 
+    data = resp.json() or []
+    next_cursor = None
+    if limit is not None and len(data) > limit:
+        data = data[:limit]
+        last = data[-1]
+        next_cursor = _encode_bug_cursor(last.get("Changed"), last.get("Bug ID"))
 
-def _insert_bug_with_fallback(payload: Dict[str, Any]):
-    errors = []
-    for name in CANDIDATE_TABLES:
-        try:
-            headers = _supabase_headers({"Prefer": "return=representation"})
-            resp = _http_post(
-                f"{SUPABASE_REST_URL}/{name}",
-                headers=headers,
-                json=payload,
-                timeout=10,
-            )
-            if not resp.ok:
-                errors.append(f"{name}: {resp.status_code} {resp.text}")
-                continue
+    normalized = normalize_bug_rows(data, fields)
+    return {"status": "success", "data": normalized, "next_cursor": next_cursor}
 
-            inserted = resp.json() or []
-            normalized = [normalize_bug_row(r) for r in inserted]
-            return {"status": "success", "data": normalized}
 
-        except Exception as e:
-            errors.append(f"{name}: {e}")
-            continue
+# ---------- BUG LIST SNAPSHOT CACHE ----------
+
+BUG_LIST_CACHE_TTL = float(os.getenv("BUG_LIST_CACHE_TTL", "30"))
 
-    raise HTTPException(
-        status_code=500,
-        detail=f"Failed to insert bug into any candidate table. Errors -> {'; '.join(errors)}",
+
+class BugListSnapshot(NamedTuple):
+    result: Dict[str, Any]
+    etag: str
+    last_modified: Optional[str]
+
+
+# Normalized bug pages keyed by query; cleared on every bug write
+bug_list_cache = TTLCache(ttl=BUG_LIST_CACHE_TTL)
+
+BUG_STATS_CACHE_TTL = float(os.getenv("BUG_STATS_CACHE_TTL", "15"))
+
+# Aggregated bug counts (priority-stats); also cleared on every bug write
+bug_stats_cache = TTLCache(ttl=BUG_STATS_CACHE_TTL, max_entries=16)
+
+
+def _invalidate_bug_lists() -> None:
+    """Drop every cached view that spans many bugs."""
+    bug_list_cache.invalidate()
+    bug_stats_cache.invalidate()
+
+
+def _http_date(value: Any) -> Optional[str]:
+    """Format an ISO timestamp as an HTTP date (for Last-Modified)."""
+    try:
+        dt = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return email.utils.format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+async def _bug_list_snapshot(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    fields: Optional[List[str]] = None,
+) -> BugListSnapshot:
+    """
+    Cached page of bugs with its validators: ETag is a hash of the normalized
+    payload, Last-Modified the newest Changed on the page.
+    """
+    active_filters = tuple(sorted((k, str(v)) for k, v in (filters or {}).items() if v not in (None, "")))
+    key = (limit, cursor, active_filters, tuple(fields) if fields else None)
+    snapshot = bug_list_cache.get(key)
+    if snapshot is None:
+        result = await _fetch_bug_page(limit=limit, cursor=cursor, filters=filters, fields=fields)
+        body = json.dumps(result, sort_keys=True, default=str).encode("utf-8")
+        changed = [b["Changed"] for b in result["data"] if b.get("Changed")]
+        snapshot = BugListSnapshot(
+            result=result,
+            etag=f'"{hashlib.sha1(body).hexdigest()}"',
+            last_modified=_http_date(max(changed)) if changed else None,
+        )
+        bug_list_cache.set(key, snapshot)
+    return snapshot
+
+
+def _bug_list_fields(fields: Optional[List[str]] = None, include: Optional[List[str]] = None) -> List[str]:
+    """
+    Fields for a list query: the requested ones (or BUG_LIST_DEFAULT_FIELDS)
+    plus the cursor keys and anything pulled in by `include`.
+    """
+    selected = BUG_LIST_KEY_FIELDS + [f for f in fields or BUG_LIST_DEFAULT_FIELDS if f not in BUG_LIST_KEY_FIELDS]
+    return selected + [f for f in include or [] if f not in selected]
+
+
+async def _select_bugs_with_fallback(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    fields: Optional[List[str]] = None,
+    include: Optional[List[str]] = None,
+):
+    """
+    Fetch bugs ordered by (Changed, "Bug ID") descending.
+
+    With `limit`, returns a single page plus `next_cursor` (None on the last
+    page); pass it back as `cursor` to continue. `filters` is applied server-side
+    (see BUG_FILTER_COLUMNS). `fields` narrows the projection and the
+    normalized rows; Comments / Attachments are only decoded when listed in
+    `fields` or `include`. Results come from bug_list_cache when fresh.
+    """
+    fields = _bug_list_fields(fields, include)
+    return (await _bug_list_snapshot(limit=limit, cursor=cursor, filters=filters, fields=fields)).result
+
+
+async def _insert_bug_with_fallback(payload: Dict[str, Any]):
+    headers = _supabase_headers({"Prefer": "return=representation"})
+    resp = await _bug_table_request(
+        lambda name: _http_post(
+            f"{SUPABASE_REST_URL}/{name}",
+            headers=headers,
+            json=payload,
+            timeout=10,
+        )
+    )
+    if not resp.is_success:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to insert bug into {bug_tables.current}: {resp.status_code} {resp.text}",
+        )
+
+    _invalidate_bug_lists()
+    inserted = resp.json() or []
+    normalized = normalize_bug_rows(inserted)
+    return {"status": "success", "data": normalized}
+
+
+# ---------- BUG ID SEQUENCE ----------
+
+async def _reserve_bug_ids(count: int) -> int:
+    """Claim `count` Bug ID numbers via the reserve_bug_ids RPC; returns the first."""
+    resp = await _http_post(
+        f"{SUPABASE_REST_URL}/rpc/reserve_bug_ids",
+        headers=_supabase_headers(),
+        json={"p_count": count},
+        timeout=10,
     )
+    if resp.status_code == 404:
+        raise HTTPException(
+            status_code=500,
+            detail="Bug ID sequence is not installed; apply backend/sql/bug_ids.sql",
+        )
+    if not resp.is_success or resp.json() is None:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to reserve Bug IDs: {resp.status_code} {resp.text}",
+        )
+    return int(resp.json())
+
+
+# Per-worker allocator; most IDs come from the in-memory block
+bug_ids = BugIdAllocator(_reserve_bug_ids)
+
+
+def _needs_bug_id(payload: Any) -> bool:
+    bug_id = payload.get("Bug ID") if isinstance(payload, dict) else "-"
+    return bug_id is None or (isinstance(bug_id, str) and not bug_id.strip())
 
 
 # ---------- CREATE BUG ----------
 
+def _prepare_new_bug(payload: Dict[str, Any], allocated: bool = False) -> Dict[str, Any]:
+    """
+    Validate a new bug payload and fill in the creation defaults. `allocated`
+    says the "Bug ID" came from the sequence; a client-supplied one must not
+    look like it. Raises HTTPException(400) when it cannot be inserted.
+    """
+    payload = dict(payload)
+
+    # 1. Keep an explicit Bug ID from the client (e.g. "LEGACY-17")
+    bug_id = payload.get("Bug ID")
+
+    if not isinstance(bug_id, str) or not bug_id.strip():
+        raise HTTPException(
+            status_code=400,
+            detail='"Bug ID" must be a non-empty string; leave it out to have one allocated.',
+        )
+
+    bug_id = bug_id.strip()
+    if not allocated and bug_ids.owns(bug_id):
+        # the sequence would hand this number out again later
+        raise HTTPException(
+            status_code=400,
+            detail=f'"Bug ID" {bug_id} is reserved for the Bug ID sequence; leave "Bug ID" out to have one allocated.',
+        )
+    payload["Bug ID"] = bug_id
+
+    # 2. Map Comments (array) -> Comment (JSON string) for DB storage
+    if "Comments" in payload and isinstance(payload["Comments"], list):
+        payload["Comment"] = json.dumps(payload["Comments"])
+        payload.pop("Comments", None)
+
+    # 3. Default values (do NOT override Description or Comment if provided)
+    defaults = {
+        "Defect type": "Functional",
+        "Summary": "",
+        "Priority": "Medium",
+        "Product": "",
+        "Component": "",
+        "Assignee": "",
+        "Status": "OPEN",
+        "Resolution": "Unresolved",
+        "Changed": _bug_changed_now(),
+        "Sprint details": "",
+        "Reporter": "",
+        "Automation Intent": "No",
+        "automation_owner": "",
+        "Assignee Real Name": payload.get("Assignee", ""),
+        "automation status": "Pending",
+        "Device type": "Web",
+        "Browser tested": "",
+    }
+    for k, v in defaults.items():
+        if payload.get(k) is None or payload.get(k) == "":
+            payload[k] = v
+
+    # 4. Validate required keys exist
+    required = list(defaults.keys()) + ["Bug ID"]
+    missing = [f for f in required if f not in payload]
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Missing fields: {', '.join(missing)}",
+        )
+    return payload
+
+
 @app.post("/api/bugs")
 async def create_bug(request: Request):
+    """
+    Create a bug. Leave out "Bug ID" to have the server allocate the next one
+    from the Bug ID sequence; an explicit ID is accepted unless it is in the
+    sequence's "BUG-<n>" format.
+    """
     try:
         payload: Dict[str, Any] = await request.json()
 
-        # 1. Keep Bug ID from frontend (e.g. "BUG-001")
-        bug_id = payload.get("Bug ID")
-
-        if not isinstance(bug_id, str) or not bug_id.strip():
-            raise HTTPException(
-                status_code=400,
-                detail='"Bug ID" is required and must be a non-empty string like "BUG-001".',
-            )
-
-        bug_id = bug_id.strip()
-        payload["Bug ID"] = bug_id
-
-        # 2. Map Comments (array) -> Comment (JSON string) for DB storage
-        if "Comments" in payload and isinstance(payload["Comments"], list):
-            payload["Comment"] = json.dumps(payload["Comments"])
-            payload.pop("Comments", None)
-
-        # 3. Default values (do NOT override Description or Comment if provided)
-        defaults = {
-            "Defect type": "Functional",
-            "Summary": "",
-            "Priority": "Medium",
-            "Product": "",
-            "Component": "",
-            "Assignee": "",
-            "Status": "OPEN",
-            "Resolution": "Unresolved",
-            "Changed": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
-            "Sprint details": "",
-            "Reporter": "",
-            "Automation Intent": "No",
-            "automation_owner": "",
-            "Assignee Real Name": payload.get("Assignee", ""),
-            "automation status": "Pending",
-            "Device type": "Web",
-            "Browser tested": "",
-        }
-        for k, v in defaults.items():
-            if payload.get(k) is None or payload.get(k) == "":
-                payload[k] = v
-
-        # 4. Validate required keys exist
-        required = list(defaults.keys()) + ["Bug ID"]
-        missing = [f for f in required if f not in payload]
-        if missing:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Missing fields: {', '.join(missing)}",
-            )
+        allocated = _needs_bug_id(payload)
+        if allocated:
+            payload["Bug ID"] = await bug_ids.next_id()
 
         # 5. Insert
-        result = _insert_bug_with_fallback(payload)
+        result = await _insert_bug_with_fallback(_prepare_new_bug(payload, allocated=allocated))
 
         return result
 
@@ -1171,100 +1480,575 @@ async def create_bug(request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# ---------- LIST BUGS ----------
+# ---------- BULK CREATE / UPDATE ----------
 
-@app.get("/api/bugs")
-async def get_bugs():
-    try:
-        result = _select_bugs_with_fallback()
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+BUG_BULK_MAX_ITEMS = int(os.getenv("BUG_BULK_MAX_ITEMS", "5000"))
+BUG_BULK_CHUNK_SIZE = max(1, int(os.getenv("BUG_BULK_CHUNK_SIZE", "500")))
 
-# ---------- AGENT CHAT ENDPOINT (MOCK) ----------
-# ---------- AGENT CHAT ENDPOINT (MOCK) ----------
-@app.post("/api/agent/chat")
-async def agent_chat(request: Request):
+
+def _bulk_error(index: int, bug_id: Any, error: Any) -> Dict[str, Any]:
+    detail = error.detail if isinstance(error, HTTPException) else str(error)
+    return {"index": index, "Bug ID": bug_id, "status": "error", "error": detail}
+
+
+def _bulk_response(results: List[Dict[str, Any]], ok_status: str) -> Dict[str, Any]:
+    results.sort(key=lambda r: r["index"])
+    succeeded = sum(1 for r in results if r["status"] == ok_status)
+    return {
+        "status": "success" if succeeded == len(results) else "partial",
+        "data": {"total": len(results), ok_status: succeeded, "failed": len(results) - succeeded, "results": results},
+    }
+
+
+def _chunks(items: List[Any], size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def _post_bug_rows(rows: List[Dict[str, Any]], prefer: str, params: Optional[Dict[str, str]] = None):
     """
-    Simple endpoint to handle agent chat messages.
-    Processes natural language commands to interact with the bug tracker.
+    Multi-row POST to the bug table. `columns=` lists the union of keys so rows
+    may omit columns (they get the column default, see Prefer: missing=default).
     """
-    try:
-        # 1. Authenticate User
-        auth_header = request.headers.get("Authorization")
-        user_info = verify_supabase_token(auth_header)
-        current_user_email = ""
-        current_user_name = ""
+    columns: List[str] = []
+    for row in rows:
+        columns.extend(k for k in row if k not in columns)
+    query = {"columns": ",".join(f'"{c}"' if not c.isidentifier() else c for c in columns), **(params or {})}
+    headers = _supabase_headers({"Prefer": f"return=minimal,missing=default,{prefer}".rstrip(",")})
+    return await _bug_table_request(
+        lambda name: _http_post(
+            f"{SUPABASE_REST_URL}/{name}",
+            headers=headers,
+            json=rows,
+            params=query,
+            timeout=30,
+        )
+    )
 
-        if user_info and "user" in user_info:
-            current_user_email = (user_info["user"].get("email") or "").lower()
-            user_id = user_info["user"].get("id")
-            if user_id:
-                try:
-                    u_resp = supabase.table("users").select("full_name").eq("id", user_id).single().execute()
-                    if getattr(u_resp, "data", None) and isinstance(u_resp.data, dict):
-                        _fn = u_resp.data.get("full_name")
-                        current_user_name = str(_fn or "").lower()
-                except:
-                    pass
 
-        payload = await request.json()
-        message = (payload.get("message") or "").lower().strip()
-        
-        reply = ""
-        
-        # Check for "assigned to me"
-        is_assigned_query = ("assigned" in message and "me" in message) or ("my" in message and ("bugs" in message or "tasks" in message))
-        
-        if is_assigned_query:
-            if not current_user_email:
-                 reply = "I cannot identify you. Please login to see your assigned items."
+async def _insert_bugs_bulk(payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Create many bugs with the same defaulting and Bug ID rules as create_bug,
+    in chunks of BUG_BULK_CHUNK_SIZE rows per insert. A chunk the DB rejects
+    (e.g. one duplicate "Bug ID") is retried row by row so each item gets its
+    own result.
+    """
+    results: List[Dict[str, Any]] = []
+    pending: List[Tuple[int, Dict[str, Any]]] = []
+    seen: set = set()
+
+    # bugs without an ID get theirs from the sequence in one reservation
+    missing = [i for i, p in enumerate(payloads) if isinstance(p, dict) and _needs_bug_id(p)]
+    allocated = set(missing)
+    if missing:
+        payloads = list(payloads)
+        for index, new_id in zip(missing, await bug_ids.next_ids(len(missing))):
+            payloads[index] = {**payloads[index], "Bug ID": new_id}
+
+    for index, payload in enumerate(payloads):
+        try:
+            if not isinstance(payload, dict):
+                raise HTTPException(status_code=400, detail="Each bug must be a JSON object")
+            row = _prepare_new_bug(payload, allocated=index in allocated)
+            if row["Bug ID"] in seen:
+                raise HTTPException(status_code=400, detail=f'Duplicate "Bug ID" {row["Bug ID"]} in request')
+            seen.add(row["Bug ID"])
+            pending.append((index, row))
+        except HTTPException as e:
+            results.append(_bulk_error(index, payload.get("Bug ID") if isinstance(payload, dict) else None, e))
+
+    for chunk in _chunks(pending, BUG_BULK_CHUNK_SIZE):
+        resp = await _post_bug_rows([row for _, row in chunk], prefer="")
+        if resp.is_success:
+            for index, row in chunk:
+                results.append({"index": index, "Bug ID": row["Bug ID"], "status": "created"})
+            continue
+        if len(chunk) == 1:
+            index, row = chunk[0]
+            results.append(_bulk_error(index, row["Bug ID"], f"{resp.status_code} {resp.text}"))
+            continue
+        for index, row in chunk:
+            single = await _post_bug_rows([row], prefer="")
+            if single.is_success:
+                results.append({"index": index, "Bug ID": row["Bug ID"], "status": "created"})
             else:
-                 # Fetch Bugs
-                 bug_result = _select_bugs_with_fallback()
-                 all_bugs = bug_result.get("data", [])
-                 
-                 # Fetch Tasks
-                 try:
-                     task_resp = supabase.table("tasks").select("*").execute()
-                     all_tasks = getattr(task_resp, "data", []) or []
-                 except:
-                     all_tasks = []
+                results.append(_bulk_error(index, row["Bug ID"], f"{single.status_code} {single.text}"))
 
-                 my_items = []
-                 # Filter Bugs
-                 for b in all_bugs:
-                     assignee = (b.get("Assignee") or "").lower()
-                     assignee_real = (b.get("Assignee Real Name") or "").lower()
-                     if current_user_email in assignee or (current_user_name and current_user_name in assignee_real) or (current_user_name and current_user_name in assignee):
-                         my_items.append(f"🐛 {b.get('Bug ID')}: {b.get('Summary')} ({b.get('Status')})")
-                 
-                 # Filter Tasks
-                 for t in all_tasks:
-                     assigned_to = (t.get("assigned_to") or "").lower()
-                     if current_user_email in assigned_to:
-                          my_items.append(f"📋 {t.get('task_name')} ({t.get('task_status')})")
+    if any(r["status"] == "created" for r in results):
+        _invalidate_bug_lists()
+    return _bulk_response(results, "created")
 
-                 count = len(my_items)
-                 if count == 0:
-                     reply = f"You have no items assigned to you, {current_user_name or current_user_email}."
-                 else:
-                     top_items = my_items[:10]
-                     item_list_str = "\n".join(top_items)
-                     reply = f"You have {count} items assigned to you:\n\n{item_list_str}"
-                     if count > 10:
-                         reply += f"\n\n...and {count - 10} more."
 
-        # 2. Tasks Module (Comprehensive)
-        elif "task" in message:
-            # --- CREATE TASK ---
-            if "create" in message or "add" in message or "new" in message:
-                # "Create a new task with title “Demo Task” and priority Medium"
-                # Simple parsing: assume title is after "title" or just everything after "task"
-                try:
-                    title = ""
-                    priority = "medium"
-                    
+def _bug_changed_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _bug_update_row(payload: Dict[str, Any], changed: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Columns to write for a bug update: a Comments list goes to the Comment
+    JSON column, and "Changed" is always stamped here (never taken from the
+    client) so the update shows up in the change feed.
+    """
+    row = dict(payload)
+    if isinstance(row.get("Comments"), list):
+        row["Comment"] = json.dumps(row.pop("Comments"))
+    row["Changed"] = changed or _bug_changed_now()
+    return row
+
+
+async def _patch_bugs(bug_ids: List[str], values: Dict[str, Any]):
+    """One PATCH setting `values` on every listed bug; returns the updated "Bug ID"s."""
+    params = {
+        "Bug ID": f"in.({','.join(_postgrest_quote(b) for b in bug_ids)})",
+        "select": '"Bug ID"',
+    }
+    headers = _supabase_headers({"Prefer": "return=representation"})
+    return await _bug_table_request(
+        lambda name: _http_patch(
+            f"{SUPABASE_REST_URL}/{name}",
+            headers=headers,
+            params=params,
+            json=values,
+            timeout=30,
+        )
+    )
+
+
+async def _bulk_update_bugs_rpc(rows: List[Dict[str, Any]]) -> Optional[set]:
+    """
+    Apply one chunk of partial bugs with the bug_bulk_update RPC
+    (backend/sql/bug_bulk_update.sql) in a single request; returns the
+    updated "Bug ID"s, or None if the RPC is not installed.
+    """
+    resp = await _http_post(
+        f"{SUPABASE_REST_URL}/rpc/bug_bulk_update",
+        headers=_supabase_headers(),
+        json={"p_table": await bug_tables.get(), "p_rows": rows},
+        timeout=60,
+    )
+    if resp.status_code == 404:
+        return None
+    if not resp.is_success:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to update bugs in {bug_tables.current}: {resp.status_code} {resp.text}",
+        )
+    return {str(row.get("bug_id")) for row in resp.json() or []}
+
+
+async def _update_bugs_bulk(payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Apply partial updates to many bugs, keyed by "Bug ID". Each chunk of
+    BUG_BULK_CHUNK_SIZE items is one bug_bulk_update RPC call, whatever
+    columns the items set; ids it did not update fail like the single PUT's
+    404. Only existing rows are touched, so a bug deleted meanwhile is never
+    recreated. Until the RPC is installed, bugs are PATCHed one at a time.
+    """
+    results: List[Dict[str, Any]] = []
+    pending: List[Tuple[int, Dict[str, Any]]] = []
+    seen: set = set()
+    for index, payload in enumerate(payloads):
+        bug_id = payload.get("Bug ID") if isinstance(payload, dict) else None
+        if not isinstance(bug_id, str) or not bug_id.strip():
+            results.append(_bulk_error(index, bug_id, '"Bug ID" is required on every item'))
+            continue
+        bug_id = bug_id.strip()
+        if bug_id in seen:
+            results.append(_bulk_error(index, bug_id, f'Duplicate "Bug ID" {bug_id} in request'))
+            continue
+        if not any(k != "Bug ID" for k in payload):
+            results.append(_bulk_error(index, bug_id, "No fields to update"))
+            continue
+        seen.add(bug_id)
+        pending.append((index, {**payload, "Bug ID": bug_id}))
+
+    def record(index: int, bug_id: str, updated: bool) -> None:
+        if updated:
+            _invalidate_bug(bug_id)
+            results.append({"index": index, "Bug ID": bug_id, "status": "updated"})
+        else:
+            results.append(_bulk_error(index, bug_id, "Bug not found"))
+
+    async def patch_each(chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+        for index, row in chunk:
+            try:
+                resp = await _patch_bugs([row["Bug ID"]], {k: v for k, v in row.items() if k != "Bug ID"})
+            except Exception as e:
+                results.append(_bulk_error(index, row["Bug ID"], e))
+                continue
+            if not resp.is_success:
+                results.append(_bulk_error(index, row["Bug ID"], f"{resp.status_code} {resp.text}"))
+            else:
+                record(index, row["Bug ID"], bool(resp.json()))
+
+    # one "Changed" stamp for the whole request
+    changed = _bug_changed_now()
+    rpc_missing = False
+    for chunk in _chunks(pending, BUG_BULK_CHUNK_SIZE):
+        chunk = [
+            (index, {"Bug ID": row["Bug ID"], **_bug_update_row({k: v for k, v in row.items() if k != "Bug ID"}, changed)})
+            for index, row in chunk
+        ]
+        if rpc_missing:
+            await patch_each(chunk)
+            continue
+        try:
+            updated = await _bulk_update_bugs_rpc([row for _, row in chunk])
+        except Exception as e:
+            results.extend(_bulk_error(index, row["Bug ID"], e) for index, row in chunk)
+            continue
+        if updated is None:
+            logger.warning("RPC bug_bulk_update is missing; apply backend/sql/bug_bulk_update.sql")
+            rpc_missing = True
+            await patch_each(chunk)
+            continue
+        for index, row in chunk:
+            record(index, row["Bug ID"], row["Bug ID"] in updated)
+
+    return _bulk_response(results, "updated")
+
+
+async def _bulk_payloads(request: Request) -> List[Dict[str, Any]]:
+    body = await request.json()
+    items = body.get("bugs") if isinstance(body, dict) else body
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail='Expected a non-empty array of bugs (or {"bugs": [...]})')
+    if len(items) > BUG_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BUG_BULK_MAX_ITEMS} bugs per request")
+    return items
+
+
+@app.post("/api/bugs/bulk")
+async def create_bugs_bulk(request: Request):
+    """
+    Create up to BUG_BULK_MAX_ITEMS bugs. Body: an array of bug objects or
+    {"bugs": [...]}. Returns one result per item, in request order.
+    """
+    try:
+        return await _insert_bugs_bulk(await _bulk_payloads(request))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.patch("/api/bugs/bulk")
+async def update_bugs_bulk(request: Request):
+    """
+    Update up to BUG_BULK_MAX_ITEMS bugs. Each item needs "Bug ID" plus the
+    fields to change. Returns one result per item, in request order.
+    """
+    try:
+        return await _update_bugs_bulk(await _bulk_payloads(request))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ---------- LIST BUGS ----------
+
+@app.get("/api/bugs")
+async def get_bugs(
+    request: Request,
+    limit: int = Query(BUG_LIST_DEFAULT_LIMIT, ge=1, le=BUG_LIST_MAX_LIMIT),
+    cursor: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    priority: Optional[str] = Query(None),
+    assignee: Optional[str] = Query(None),
+    product: Optional[str] = Query(None),
+    search: Optional[str] = Query(None, description="Text to find in Summary, Product, Assignee or Bug ID"),
+    fields: Optional[str] = Query(None, description='Comma-separated bug fields, e.g. "Summary,Status"'),
+    include: Optional[str] = Query(None, description='Decode extra fields, e.g. "comments,attachments"'),
+):
+    """
+    One page of bugs, newest first. Follow `next_cursor` for the next page.
+    Filters accept a single value or a comma-separated list; `search` is a
+    case-insensitive substring match. `fields` limits
+    the returned columns ("Bug ID" and "Changed" are always included).
+    Comments / Attachments are left out by default; `include=comments,attachments`
+    adds them decoded and `fields=comment_count,attachment_count` adds counts.
+    Sends ETag / Last-Modified and answers a matching If-None-Match with 304.
+    """
+    try:
+        filters = {"status": status, "priority": priority, "assignee": assignee, "product": product, "search": search}
+        field_list = _bug_list_fields(_parse_bug_fields(fields), _parse_bug_includes(include))
+        snapshot = await _bug_list_snapshot(limit=limit, cursor=cursor, filters=filters, fields=field_list)
+        headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+        if snapshot.last_modified:
+            headers["Last-Modified"] = snapshot.last_modified
+        if _etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(snapshot.result, headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ---------- BUG CHANGE FEED ----------
+
+BUG_CHANGES_DEFAULT_LIMIT = 500
+BUG_CHANGES_MAX_LIMIT = 2000
+
+# Oldest first, so a watermark only ever moves forward
+BUG_CHANGES_ORDER = 'Changed.asc.nullsfirst,"Bug ID".asc'
+
+
+class BugWatermark(NamedTuple):
+    changed: Any = None
+    bug_id: Any = None
+    deleted_at: Any = None
+    tombstone_id: Any = None
+    # a plain timestamp is inclusive; a watermark resumes right after (changed, bug_id)
+    inclusive: bool = False
+
+
+def _encode_bug_watermark(mark: BugWatermark) -> str:
+    raw = json.dumps(
+        {"c": mark.changed, "b": mark.bug_id, "d": mark.deleted_at, "t": mark.tombstone_id},
+        separators=(",", ":"),
+    )
+    return "w." + base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_bug_watermark(since: str) -> BugWatermark:
+    """`since` is a watermark from a previous response or an ISO timestamp."""
+    if since.startswith("w."):
+        try:
+            padded = since[2:] + "=" * (-len(since[2:]) % 4)
+            raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            # the tombstone id goes into a filter unquoted, so it must be an integer
+            tombstone_id = raw.get("t")
+            if tombstone_id is not None:
+                tombstone_id = int(tombstone_id)
+            return BugWatermark(raw.get("c"), raw.get("b"), raw.get("d"), tombstone_id)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid watermark")
+    try:
+        datetime.fromisoformat(since.strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since must be an ISO timestamp or a watermark")
+    return BugWatermark(since.strip(), None, since.strip(), None, inclusive=True)
+
+
+def _bug_changes_filter(mark: BugWatermark) -> Dict[str, str]:
+    """PostgREST params selecting rows after `mark` in BUG_CHANGES_ORDER."""
+    if mark.inclusive:
+        return {"Changed": f"gte.{mark.changed}"}
+    if mark.bug_id is None:
+        return {}
+    bid = _postgrest_quote(mark.bug_id)
+    if mark.changed in (None, ""):
+        return {"or": f'(and(Changed.is.null,"Bug ID".gt.{bid}),Changed.not.is.null)'}
+    ch = _postgrest_quote(mark.changed)
+    return {"or": f'(Changed.gt.{ch},and(Changed.eq.{ch},"Bug ID".gt.{bid}))'}
+
+
+def _tombstone_filter(mark: BugWatermark) -> Dict[str, str]:
+    """PostgREST params selecting tombstones after `mark` in (deleted_at, id) order."""
+    if mark.deleted_at is None:
+        return {}
+    if mark.tombstone_id is None:
+        return {"deleted_at": f"gt.{mark.deleted_at}"}
+    at = _postgrest_quote(mark.deleted_at)
+    return {"or": f"(deleted_at.gt.{at},and(deleted_at.eq.{at},id.gt.{mark.tombstone_id}))"}
+
+
+async def _bug_tombstones(mark: BugWatermark, limit: int) -> Optional[List[Dict[str, Any]]]:
+    """Deletions recorded after `mark` (oldest first); None if the table is missing."""
+    params = {
+        "select": "id,bug_id,deleted_at",
+        "order": "deleted_at.asc,id.asc",
+        "limit": str(limit),
+        **_tombstone_filter(mark),
+    }
+    resp = await _http_get(
+        f"{SUPABASE_REST_URL}/bug_tombstones",
+        headers=_supabase_headers(),
+        params=params,
+        timeout=10,
+    )
+    if _is_schema_error(resp):
+        logger.warning("bug_tombstones is missing; apply backend/sql/bug_changes.sql")
+        return None
+    if not resp.is_success:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch bug tombstones: {resp.status_code} {resp.text}",
+        )
+    return resp.json() or []
+
+
+async def _latest_tombstone() -> BugWatermark:
+    resp = await _http_get(
+        f"{SUPABASE_REST_URL}/bug_tombstones",
+        headers=_supabase_headers(),
+        params={"select": "id,deleted_at", "order": "deleted_at.desc,id.desc", "limit": "1"},
+        timeout=10,
+    )
+    rows = resp.json() if resp.is_success else None
+    if not rows:
+        return BugWatermark()
+    return BugWatermark(deleted_at=rows[0]["deleted_at"], tombstone_id=rows[0]["id"])
+
+
+@app.get("/api/bugs/changes")
+async def get_bug_changes(
+    since: Optional[str] = Query(None, description="Watermark from a previous call, or an ISO timestamp"),
+    limit: int = Query(BUG_CHANGES_DEFAULT_LIMIT, ge=1, le=BUG_CHANGES_MAX_LIMIT),
+    fields: Optional[str] = Query(None, description='Comma-separated bug fields, e.g. "Summary,Status"'),
+    include: Optional[str] = Query(None, description='Decode extra fields, e.g. "comments,attachments"'),
+):
+    """
+    Bugs created or modified after `since`, oldest first, plus tombstones for
+    bugs deleted since then. Pass the returned `watermark` as `since` on the
+    next call; keep calling while `has_more` is true. Without `since` the feed
+    starts from the beginning (a full initial sync).
+    """
+    try:
+        field_list = _bug_list_fields(_parse_bug_fields(fields), _parse_bug_includes(include))
+        if since:
+            mark = _decode_bug_watermark(since)
+        else:
+            # initial sync: only deletions after it started matter
+            mark = await _latest_tombstone()
+
+        params = {
+            "select": _bug_select(field_list),
+            "order": BUG_CHANGES_ORDER,
+            "limit": str(limit + 1),
+            **_bug_changes_filter(mark),
+        }
+        resp = await _bug_table_request(
+            lambda name: _http_get(
+                f"{SUPABASE_REST_URL}/{name}",
+                headers=_supabase_headers(),
+                params=params,
+                timeout=30,
+            )
+        )
+        if not resp.is_success:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to fetch bugs from {bug_tables.current}: {resp.status_code} {resp.text}",
+            )
+        rows = resp.json() or []
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        tombstones = await _bug_tombstones(mark, limit + 1)
+        if tombstones is not None and len(tombstones) > limit:
+            has_more = True
+            tombstones = tombstones[:limit]
+
+        last = rows[-1] if rows else None
+        next_mark = BugWatermark(
+            changed=last.get("Changed") if last else mark.changed,
+            bug_id=last.get("Bug ID") if last else mark.bug_id,
+            deleted_at=tombstones[-1]["deleted_at"] if tombstones else mark.deleted_at,
+            tombstone_id=tombstones[-1]["id"] if tombstones else mark.tombstone_id,
+        )
+        if last is None and mark.inclusive:
+            # nothing newer yet: keep the timestamp, but as an exclusive watermark
+            next_mark = next_mark._replace(bug_id="")
+
+        return {
+            "status": "success",
+            "data": normalize_bug_rows(rows, field_list),
+            "deleted": [{"Bug ID": t.get("bug_id"), "deleted_at": t.get("deleted_at")} for t in tombstones or []],
+            "tombstones_available": tombstones is not None,
+            "watermark": _encode_bug_watermark(next_mark),
+            "has_more": has_more,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ---------- AGENT CHAT ENDPOINT (MOCK) ----------
+# ---------- AGENT CHAT ENDPOINT (MOCK) ----------
+@app.post("/api/agent/chat")
+async def agent_chat(request: Request):
+    """
+    Simple endpoint to handle agent chat messages.
+    Processes natural language commands to interact with the bug tracker.
+    """
+    try:
+        # 1. Authenticate User
+        auth_header = request.headers.get("Authorization")
+        user_info = verify_supabase_token(auth_header)
+        current_user_email = ""
+        current_user_name = ""
+
+        if user_info and "user" in user_info:
+            current_user_email = (user_info["user"].get("email") or "").lower()
+            user_id = user_info["user"].get("id")
+            if user_id:
+                try:
+                    u_resp = await _execute(supabase.table("users").select("full_name").eq("id", user_id).single())
+                    if getattr(u_resp, "data", None) and isinstance(u_resp.data, dict):
+                        _fn = u_resp.data.get("full_name")
+                        current_user_name = str(_fn or "").lower()
+                except:
+                    pass
+
+        payload = await request.json()
+        message = (payload.get("message") or "").lower().strip()
+        
+        reply = ""
+        
+        # Check for "assigned to me"
+        is_assigned_query = ("assigned" in message and "me" in message) or ("my" in message and ("bugs" in message or "tasks" in message))
+        
+        if is_assigned_query:
+            if not current_user_email:
+                 reply = "I cannot identify you. Please login to see your assigned items."
+            else:
+                 # Fetch Bugs
+                 bug_result = await _select_bugs_with_fallback()
+                 all_bugs = bug_result.get("data", [])
+                 
+                 # Fetch Tasks
+                 try:
+                     task_resp = await _execute(supabase.table("tasks").select("*"))
+                     all_tasks = getattr(task_resp, "data", []) or []
+                 except:
+                     all_tasks = []
+
+                 my_items = []
+                 # Filter Bugs
+                 for b in all_bugs:
+                     assignee = (b.get("Assignee") or "").lower()
+                     assignee_real = (b.get("Assignee Real Name") or "").lower()
+                     if current_user_email in assignee or (current_user_name and current_user_name in assignee_real) or (current_user_name and current_user_name in assignee):
+                         my_items.append(f"🐛 {b.get('Bug ID')}: {b.get('Summary')} ({b.get('Status')})")
+                 
+                 # Filter Tasks
+                 for t in all_tasks:
+                     assigned_to = (t.get("assigned_to") or "").lower()
+                     if current_user_email in assigned_to:
+                          my_items.append(f"📋 {t.get('task_name')} ({t.get('task_status')})")
+
+                 count = len(my_items)
+                 if count == 0:
+                     reply = f"You have no items assigned to you, {current_user_name or current_user_email}."
+                 else:
+                     top_items = my_items[:10]
+                     item_list_str = "\n".join(top_items)
+                     reply = f"You have {count} items assigned to you:\n\n{item_list_str}"
+                     if count > 10:
+                         reply += f"\n\n...and {count - 10} more."
+
+        # 2. Tasks Module (Comprehensive)
+        elif "task" in message:
+            # --- CREATE TASK ---
+            if "create" in message or "add" in message or "new" in message:
+                # "Create a new task with title “Demo Task” and priority Medium"
+                # Simple parsing: assume title is after "title" or just everything after "task"
+                try:
+                    title = ""
+                    priority = "medium"
+                    
                     # Extract priority
                     if "high" in message: priority = "high"
                     elif "low" in message: priority = "low"
@@ -1298,7 +2082,7 @@ async def agent_chat(request: Request):
                             "task_note": f"Created via AI Agent by {assigned_to}",
                             "created_at": now_iso
                         }
-                        r = supabase.table("tasks").insert(payload).execute()
+                        r = await _execute(supabase.table("tasks").insert(payload))
                         if getattr(r, "error", None):
                             reply = f"Error creating task: {getattr(r, 'error', None)}"
                         else:
@@ -1323,7 +2107,7 @@ async def agent_chat(request: Request):
                     if id_match:
                         serial_idx = int(id_match.group(1))
                         # Fetch all to find the serial
-                        all_tasks_resp = supabase.table("tasks").select("id, task_name, created_at").order("created_at", desc=False).execute() # Ascending to match serial 1..N
+                        all_tasks_resp = await _execute(supabase.table("tasks").select("id, task_name, created_at").order("created_at", desc=False)) # Ascending to match serial 1..N
                         all_tasks = getattr(all_tasks_resp, "data", []) or []
                         
                         # In frontend: TasksList.jsx -> uses ALL fetch then map. 
@@ -1334,7 +2118,7 @@ async def agent_chat(request: Request):
                         # So, Task 001 is the NEWEST task.
                         
                         # Let's match backend default sort
-                        all_tasks_resp = supabase.table("tasks").select("id").order("created_at", desc=True).execute()
+                        all_tasks_resp = await _execute(supabase.table("tasks").select("id").order("created_at", desc=True))
                         all_tasks = getattr(all_tasks_resp, "data", []) or []
                         
                         if 0 < serial_idx <= len(all_tasks):
@@ -1360,7 +2144,7 @@ async def agent_chat(request: Request):
                         if not updates:
                             reply = "What would you like to update? (status or priority)"
                         else:
-                            supabase.table("tasks").update(updates).eq("id", target_id).execute()
+                            await _execute(supabase.table("tasks").update(updates).eq("id", target_id))
                             reply = "✅ Updated task."
 
                 except Exception as e:
@@ -1373,12 +2157,12 @@ async def agent_chat(request: Request):
                     id_match = re.search(r"task\s+(\d+)", message)
                     if id_match:
                         serial_idx = int(id_match.group(1))
-                        all_tasks_resp = supabase.table("tasks").select("id").order("created_at", desc=True).execute()
+                        all_tasks_resp = await _execute(supabase.table("tasks").select("id").order("created_at", desc=True))
                         all_tasks = getattr(all_tasks_resp, "data", []) or []
                         
                         if 0 < serial_idx <= len(all_tasks):
                             target_id = all_tasks[serial_idx - 1]["id"]
-                            supabase.table("tasks").delete().eq("id", target_id).execute()
+                            await _execute(supabase.table("tasks").delete().eq("id", target_id))
                             reply = f"🗑️ Deleted Task {serial_idx}."
                         else:
                             reply = f"Task {serial_idx} not found."
@@ -1396,7 +2180,7 @@ async def agent_chat(request: Request):
                      elif "doing" in message or "progress" in message: query = query.eq("task_status", "in-progress")
                      elif "done" in message or "completed" in message: query = query.eq("task_status", "done")
                      
-                     resp = query.execute()
+                     resp = await _execute(query)
                      data = getattr(resp, "data", []) or []
                      
                      if not data:
@@ -1417,7 +2201,7 @@ async def agent_chat(request: Request):
                  # "Show tasks by priority in bar chart"
                  # We will generate a text-based bar chart
                  try:
-                     resp = supabase.table("tasks").select("task_status, task_priority, assigned_to, created_at").execute()
+                     resp = await _execute(supabase.table("tasks").select("task_status, task_priority, assigned_to, created_at"))
                      data = getattr(resp, "data", []) or []
                      
                      if "priority" in message:
@@ -1489,7 +2273,7 @@ async def agent_chat(request: Request):
                             pass 
                     
                     # Execute
-                    resp = query.execute()
+                    resp = await _execute(query)
                     requests = getattr(resp, "data", []) or []
                     
                     # Post-processing filters
@@ -1577,22 +2361,21 @@ async def agent_chat(request: Request):
 
         # ... (rest of the file)
         elif any(x in message for x in ["list bugs", "show bugs", "all bugs", "list all bugs"]):
-             result = _select_bugs_with_fallback()
+             # Show top 5 recent bugs (single page)
+             result = await _select_bugs_with_fallback(limit=5, fields=["Summary", "Status"])
              data = result.get("data", [])
              if not data:
                  reply = "There are no bugs in the system currently."
              else:
-                 # Show top 5 recent bugs
-                 params = data[:5]
-                 reply = f"Here are the {min(len(data), 5)} most recent bugs:\n"
-                 for b in params:
+                 reply = f"Here are the {len(data)} most recent bugs:\n"
+                 for b in data:
                      status = b.get('Status') or "Unknown"
                      summary = b.get('Summary') or "No Summary"
                      bid = b.get('Bug ID') or "?"
                      reply += f"\n• {bid}: {summary} ({status})"
                  
-                 if len(data) > 5:
-                     reply += f"\n\n...and {len(data) - 5} more."
+                 if result.get("next_cursor"):
+                     reply += "\n\n...and more."
         
         # 3. Bug Details
         # Matched if user asks for details OR just provides a Bug ID (e.g. "BUG-001")
@@ -1601,7 +2384,7 @@ async def agent_chat(request: Request):
             match = re.search(r"(bug-\d+|\d{3,})", message)
             if match:
                 bug_id = match.group(1).upper() # Ensure uppercase for DB (BUG-133)
-                bug = _get_bug_by_id(bug_id)
+                bug = await _get_bug_by_id(bug_id)
                 if bug:
                      reply = f"Details for {bug_id}:\n"
                      reply += f"Summary: {bug.get('Summary')}\n"
@@ -1630,18 +2413,16 @@ async def agent_chat(request: Request):
                      break
              
              if summary:
-                 import random
-                 new_id = f"BUG-{random.randint(1000, 9999)}"
-                 
-                 payload_new = {
-                     "Bug ID": new_id,
-                     "Summary": summary,
-                     "Description": f"Created via AI Agent from message: {summary}",
-                     "Priority": "Medium",
-                     "Status": "OPEN"
-                 }
                  try:
-                     _insert_bug_with_fallback(payload_new)
+                     new_id = await bug_ids.next_id()
+                     payload_new = {
+                         "Bug ID": new_id,
+                         "Summary": summary,
+                         "Description": f"Created via AI Agent from message: {summary}",
+                         "Priority": "Medium",
+                         "Status": "OPEN"
+                     }
+                     await _insert_bug_with_fallback(payload_new)
                      reply = f"I've created a new bug for you:\n\nID: {new_id}\nSummary: {summary}"
                  except Exception as e:
                     reply = f"Failed to create bug: {str(e)}"
@@ -1653,7 +2434,7 @@ async def agent_chat(request: Request):
             if any(x in message for x in ["list", "show all", "get all"]):
                 # List Users
                 try:
-                    resp = supabase.table("users").select("full_name, email, role, is_active").limit(5).execute()
+                    resp = await _execute(supabase.table("users").select("full_name, email, role, is_active").limit(5))
                     users = getattr(resp, "data", []) or []
                     if not users:
                         reply = "No users found in the system."
@@ -1664,8 +2445,9 @@ async def agent_chat(request: Request):
                              reply += f"\n{status_icon} {u.get('full_name')} ({u.get('role')}) - {u.get('email')}"
                         
                         # Get total count
-                        count_resp = supabase.table("users").select("id").execute()
-                        total = len(getattr(count_resp, "data", []) or users)
+                        total, count_err = await _count_table("users")
+                        if count_err:
+                            total = len(users)
                         if total > 5:
                             reply += f"\n\n...and {total - 5} more."
                 except Exception as e:
@@ -1686,7 +2468,7 @@ async def agent_chat(request: Request):
                      reply = "Who are you looking for? (e.g., 'find user john')"
                 else:
                     try:
-                        resp = supabase.table("users").select("*").or_(f"full_name.ilike.%{search_term}%,email.ilike.%{search_term}%").limit(3).execute()
+                        resp = await _execute(supabase.table("users").select("*").or_(f"full_name.ilike.%{search_term}%,email.ilike.%{search_term}%").limit(3))
                         users = getattr(resp, "data", []) or []
                         if not users:
                             reply = f"I couldn't find any user matching '{search_term}'."
@@ -1708,7 +2490,7 @@ async def agent_chat(request: Request):
              if any(x in message for x in ["list", "show", "recent"]):
                  try:
                      # Fetch recent releases
-                     resp = supabase.table("transtrackers").select("applicationtype, buildnumber, buildreceiveddate, signoffstatus").order("buildreceiveddate", desc=True).limit(5).execute()
+                     resp = await _execute(supabase.table("transtrackers").select("applicationtype, buildnumber, buildreceiveddate, signoffstatus").order("buildreceiveddate", desc=True).limit(5))
                      releases = getattr(resp, "data", []) or []
                      
                      if not releases:
@@ -1732,7 +2514,7 @@ async def agent_chat(request: Request):
         elif "testing" in message and "request" in message:
              if any(x in message for x in ["list", "show", "recent"]):
                  try:
-                     resp = supabase.table("testing_requests").select("product_project_name, build_version, sprint, created_at").order("created_at", desc=True).limit(5).execute()
+                     resp = await _execute(supabase.table("testing_requests").select("product_project_name, build_version, sprint, created_at").order("created_at", desc=True).limit(5))
                      requests = getattr(resp, "data", []) or []
                      
                      if not requests:
@@ -1755,9 +2537,11 @@ async def agent_chat(request: Request):
         # 8. Status/Count
         elif "count" in message or "how many" in message:
              # Basic bug count
-             result = _select_bugs_with_fallback()
-             count = len(result.get("data", []))
-             reply = f"There are currently {count} bugs in the system."
+             count, count_err = await _count_table(None)
+             if count_err:
+                 reply = f"I couldn't count the bugs right now ({count_err})."
+             else:
+                 reply = f"There are currently {count} bugs in the system."
 
         # 9. Help / Greeting
         elif any(x in message for x in ["hi", "hello", "help", "hey"]):
@@ -1784,81 +2568,167 @@ async def agent_chat(request: Request):
 
 
 
-@app.get("/api/priority-stats")
-async def get_priority_stats():
+# ---------- BUG STATS ----------
+
+def _priority_bucket(value: Any) -> str:
+    """Map a raw Priority to high / medium / low (same rules as the Dashboard)."""
+    p = str(value or "").strip().lower()
+    if p in ("critical", "crit", "high", "p0", "p1"):
+        return "high"
+    if p in ("medium", "med", "p2"):
+        return "medium"
+    if p in ("low", "minor", "p3", "p4"):
+        return "low"
+    if "high" in p:
+        return "high"
+    if "med" in p:
+        return "medium"
+    return "low"
+
+
+async def _bug_group_counts() -> List[Dict[str, Any]]:
     """
-    Returns count of bugs by priority: { high, medium, low }
+    (priority, status, count) rows grouped in Postgres by the
+    bug_priority_status_counts RPC (backend/sql/bug_stats.sql). Until it is
+    installed, falls back to fetching just the two columns.
     """
-    try:
-        result = _select_bugs_with_fallback()
-        bugs = result.get("data", [])
+    resp = await _http_post(
+        f"{SUPABASE_REST_URL}/rpc/bug_priority_status_counts",
+        headers=_supabase_headers(),
+        json={"p_table": await bug_tables.get()},
+        timeout=10,
+    )
+    if resp.is_success:
+        return resp.json() or []
+    if resp.status_code != 404:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to aggregate bugs: {resp.status_code} {resp.text}",
+        )
+
+    logger.warning("RPC bug_priority_status_counts is missing; apply backend/sql/bug_stats.sql")
+    resp = await _bug_table_request(
+        lambda name: _http_get(
+            f"{SUPABASE_REST_URL}/{name}",
+            headers=_supabase_headers(),
+            params={"select": "Priority,Status"},
+            timeout=10,
+        )
+    )
+    if not resp.is_success:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch bugs from {bug_tables.current}: {resp.status_code} {resp.text}",
+        )
+    groups: Dict[Tuple[Any, Any], int] = {}
+    for row in resp.json() or []:
+        key = (row.get("Priority"), row.get("Status"))
+        groups[key] = groups.get(key, 0) + 1
+    return [{"priority": p, "status": st, "count": n} for (p, st), n in groups.items()]
 
+
+async def _bug_stats() -> Dict[str, Any]:
+    stats = bug_stats_cache.get("priority_status")
+    if stats is None:
         counts = {"high": 0, "medium": 0, "low": 0}
+        by_priority: Dict[str, int] = {}
+        by_status: Dict[str, int] = {}
+        total = 0
+        for row in await _bug_group_counts():
+            n = int(row.get("count") or 0)
+            total += n
+            counts[_priority_bucket(row.get("priority"))] += n
+            priority = row.get("priority") or "Unknown"
+            status = row.get("status") or "Unknown"
+            by_priority[priority] = by_priority.get(priority, 0) + n
+            by_status[status] = by_status.get(status, 0) + n
+        stats = {**counts, "total": total, "by_priority": by_priority, "by_status": by_status}
+        bug_stats_cache.set("priority_status", stats)
+    return stats
 
-        for b in bugs:
-            p = str(b.get("Priority", "")).lower()
-            if p in ["critical", "high", "p0", "p1"]:
-                counts["high"] += 1
-            elif p in ["medium", "med", "p2"]:
-                counts["medium"] += 1
-            else:
-                counts["low"] += 1
 
-        return {"status": "success", "data": counts}
+@app.get("/api/priority-stats")
+async def get_priority_stats():
+    """
+    Returns count of bugs by priority: { high, medium, low }, plus the raw
+    per-priority and per-status counts. Computed in Postgres and cached for
+    BUG_STATS_CACHE_TTL seconds.
+    """
+    try:
+        return {"status": "success", "data": await _bug_stats()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # ---------- GET BUG DETAILS ----------
 
-def _get_bug_by_id(bug_id: str):
-    bug_data = None
+BUG_DETAIL_CACHE_SIZE = int(os.getenv("BUG_DETAIL_CACHE_SIZE", "512"))
+BUG_DETAIL_CACHE_TTL = float(os.getenv("BUG_DETAIL_CACHE_TTL", "30"))
 
-    for name in CANDIDATE_TABLES:
-        try:
-            params = {
-                "select": "*",
-                "Bug ID": f"eq.{bug_id}",
-            }
-            resp = _http_get(
-                f"{SUPABASE_REST_URL}/{name}",
-                headers=_supabase_headers(),
-                params=params,
-                timeout=10,
-            )
+# Raw bug rows keyed by their stored "Bug ID". API writes drop the entry at
+# once; the TTL bounds staleness after writes that go straight to Supabase.
+bug_detail_cache = TTLCache(ttl=BUG_DETAIL_CACHE_TTL, max_entries=BUG_DETAIL_CACHE_SIZE)
 
-            if resp.ok and resp.json():
-                bug_data = resp.json()[0]
-                break
 
-            # if bug_id is numeric, try int
-            if bug_id.isdigit():
-                params = {
-                    "select": "*",
-                    "Bug ID": f"eq.{int(bug_id)}",
-                }
-                resp = _http_get(
+def _bug_id_forms(bug_id: str) -> List[str]:
+    # if bug_id is numeric, also try the int form ("007" -> 7)
+    id_forms = [bug_id]
+    if bug_id.isdigit() and str(int(bug_id)) != bug_id:
+        id_forms.append(str(int(bug_id)))
+    return id_forms
+
+
+def _invalidate_bug(bug_id: Any) -> None:
+    """Drop cached copies of one bug after a write."""
+    _invalidate_bug_lists()
+    bug_detail_cache.invalidate(str(bug_id or "").strip())
+
+
+async def _get_bug_by_id(bug_id: str, fields: Optional[List[str]] = None):
+    """
+    One bug, normalized. The string and integer forms of the id are matched
+    in a single request (exact string match wins), and the raw row is kept in
+    bug_detail_cache under its stored "Bug ID", so any `fields` projection of
+    that id is served from it. Other spellings ("007" for "7") always refetch.
+    """
+    bug_id = bug_id.strip()
+    bug_data = bug_detail_cache.get(bug_id)
+
+    if bug_data is None:
+        id_forms = _bug_id_forms(bug_id)
+        params = {"select": "*"}
+        if len(id_forms) == 1:
+            params["Bug ID"] = f"eq.{bug_id}"
+        else:
+            params["or"] = "(" + ",".join(f'"Bug ID".eq.{_postgrest_quote(f)}' for f in id_forms) + ")"
+        try:
+            resp = await _bug_table_request(
+                lambda name: _http_get(
                     f"{SUPABASE_REST_URL}/{name}",
                     headers=_supabase_headers(),
                     params=params,
                     timeout=10,
                 )
-                if resp.ok and resp.json():
-                    bug_data = resp.json()[0]
-                    break
-        except Exception:
-            continue
-
-    if not bug_data:
-        return None
+            )
+        except Exception as e:
+            logger.warning("Bug lookup for %s failed: %s", bug_id, e)
+            return None
+        rows = resp.json() if resp.is_success else None
+        if not rows:
+            return None
+        bug_data = next((r for r in rows if str(r.get("Bug ID")) == bug_id), rows[0])
+        bug_detail_cache.set(str(bug_data.get("Bug ID") or bug_id).strip(), bug_data)
 
-    return normalize_bug_row(bug_data)
+    return normalize_bug_row(bug_data, fields)
 
 
 @app.get("/api/bugs/{bug_id}")
-async def get_bug_details(bug_id: str = Path(...)):
+async def get_bug_details(
+    bug_id: str = Path(...),
+    fields: Optional[str] = Query(None, description='Comma-separated bug fields, e.g. "Summary,Status"'),
+):
     try:
-        normalized = _get_bug_by_id(bug_id)
+        normalized = await _get_bug_by_id(bug_id, fields=_parse_bug_fields(fields, required=["Bug ID"]))
         if not normalized:
             raise HTTPException(status_code=404, detail="Bug not found")
 
@@ -1872,176 +2742,156 @@ async def get_bug_details(bug_id: str = Path(...)):
 
 # ---------- UPLOAD ATTACHMENTS ----------
 
-@app.post("/api/bugs/{bug_id}/attachments")
-async def upload_bug_attachments(
-    bug_id: str,
-    files: List[UploadFile] = File(...),
-):
-    bucket = "bug-attachments"
-    uploaded: List[Dict[str, Any]] = []
-
-    
+ATTACHMENT_BUCKET = "bug-attachments"
+ATTACHMENT_UPLOAD_CONCURRENCY = max(1, int(os.getenv("ATTACHMENT_UPLOAD_CONCURRENCY", "4")))
+ATTACHMENT_UPLOAD_CHUNK_SIZE = max(64 * 1024, int(os.getenv("ATTACHMENT_UPLOAD_CHUNK_SIZE", str(1024 * 1024))))
+SUPABASE_STORAGE_URL = f"{SUPABASE_URL}/storage/v1"
 
-    # optional: check if bucket exists
-    try:
-        buckets = storage_client.storage.list_buckets()
-        _ = [b.name for b in buckets] if buckets else []
-    except Exception:
-        pass
 
-    try:
-        for file in files:
-            contents = await file.read()
+def _attachment_public_url(bucket: str, path: str) -> str:
+    # same URL storage.get_public_url() builds, without the round trip
+    return f"{SUPABASE_STORAGE_URL}/object/public/{bucket}/{path}"
 
-            original_name = file.filename or "file"
-            name_no_spaces = original_name.replace(" ", "_")
-            safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", name_no_spaces)
 
-            timestamp_ms = int(time.time() * 1000)
-            final_filename = f"{bug_id}_{timestamp_ms}_{safe_name}"
-            path = f"bug-attachments/{final_filename}"
+async def _stream_upload_file(file: UploadFile):
+    """Yield the upload in ATTACHMENT_UPLOAD_CHUNK_SIZE pieces instead of one buffer."""
+    await file.seek(0)
+    while True:
+        chunk = await file.read(ATTACHMENT_UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
 
-            resp = storage_client.storage.from_(bucket).upload(
-                path,
-                contents,
-                {"content-type": file.content_type or "application/octet-stream"},
-            )
 
-            error = None
-            _err = getattr(resp, "error", None)
-            if _err:
-                error = _err
-            elif isinstance(resp, dict) and "error" in resp and resp["error"]:
-                error = resp["error"]
-            elif isinstance(resp, dict) and "statusCode" in resp and str(
-                resp["statusCode"]
-            ).startswith("4"):
-                error = resp
-
-            if error:
-                uploaded.append({"filename": file.filename, "error": str(error)})
-                continue
+async def _upload_attachment(bucket: str, path: str, file: UploadFile) -> Dict[str, Any]:
+    """
+    Stream one file into Storage. A 2xx response is trusted as proof the
+    object exists, so there is no list/verify or public-URL round trip.
+    """
+    headers = _supabase_headers({
+        "Content-Type": file.content_type or "application/octet-stream",
+        "cache-control": "max-age=3600",
+        "x-upsert": "false",
+    })
+    if file.size is not None:
+        headers["Content-Length"] = str(file.size)
+    started = time.perf_counter()
+    resp = await rest_client.request(
+        "POST",
+        f"{SUPABASE_STORAGE_URL}/object/{bucket}/{path}",
+        headers=headers,
+        content=_stream_upload_file(file),
+        timeout=120,
+    )
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    if not resp.is_success:
+        return {"filename": file.filename, "error": resp.text or str(resp.status_code), "elapsed_ms": elapsed_ms}
+    return {
+        "filename": path.rsplit("/", 1)[-1],
+        "url": _attachment_public_url(bucket, path),
+        "path": path,
+        "size": file.size,
+        "elapsed_ms": elapsed_ms,
+    }
 
-            # verify upload
-            try:
-                folder_to_list = "bug-attachments"
-                search_name = final_filename
 
-                list_resp = storage_client.storage.from_(bucket).list(
-                    folder_to_list,
-                    {"search": search_name},
-                )
-                found = False
-                if list_resp:
-                    for f in list_resp:
-                        if f.get("name") == search_name:
-                            found = True
-                            break
-
-                if not found:
-                    uploaded.append(
-                        {
-                            "filename": file.filename,
-                            "error": "Upload verification failed (file not found)",
-                        }
-                    )
-                    continue
+def _is_storage_denied(error: str) -> bool:
+    text = error.lower()
+    return "row-level security policy" in text or "unauthorized" in text
 
-            except Exception:
-                pass
 
-            public = storage_client.storage.from_(bucket).get_public_url(path)
+async def _delete_attachments(bucket: str, paths: List[str]) -> None:
+    """Best-effort removal of objects uploaded by a request that then failed."""
+    try:
+        resp = await rest_client.request(
+            "DELETE",
+            f"{SUPABASE_STORAGE_URL}/object/{bucket}",
+            headers=_supabase_headers(),
+            json={"prefixes": paths},
+            timeout=30,
+        )
+        if not resp.is_success:
+            logger.warning("Could not remove %d orphaned attachments: %s %s", len(paths), resp.status_code, resp.text)
+    except Exception as e:
+        logger.warning("Could not remove %d orphaned attachments: %s", len(paths), e)
 
-            if isinstance(public, dict):
-                url = (
-                    public.get("publicURL")
-                    or public.get("publicUrl")
-                    or public.get("public_url")
-                    or public.get("signedURL")
-                    or public.get("signedUrl")
-                )
-            elif isinstance(public, str):
-                url = public
-            else:
-                url = (
-                    getattr(public, "public_url", None)
-                    or getattr(public, "publicUrl", None)
-                    or getattr(public, "url", None)
-                )
 
-            uploaded.append(
-                {
-                    "filename": final_filename,
-                    "url": url,
-                    "path": path,
-                }
-            )
+@app.post("/api/bugs/{bug_id}/attachments")
+async def upload_bug_attachments(
+    bug_id: str,
+    files: List[UploadFile] = File(...),
+):
+    """
+    Upload files to the bug-attachments bucket, at most
+    ATTACHMENT_UPLOAD_CONCURRENCY at a time, and append them to the bug's
+    Attachments. Each file entry reports its own elapsed_ms. When Storage
+    refuses an upload (RLS), files not yet started are skipped and those
+    already stored are deleted before the 403.
+    """
+    bucket = ATTACHMENT_BUCKET
+    started = time.perf_counter()
 
-        # 🧩 Persist uploaded attachments into the bug row in DB (via REST)
-        successful_files = [f for f in uploaded if not f.get("error") and f.get("url")]
+    try:
+        slots = asyncio.Semaphore(ATTACHMENT_UPLOAD_CONCURRENCY)
+        timestamp_ms = int(time.time() * 1000)
+        paths: List[str] = []
+        for file in files:
+            original_name = file.filename or "file"
+            name_no_spaces = original_name.replace(" ", "_")
+            safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", name_no_spaces)
 
-        if successful_files:
+            final_filename = f"{bug_id}_{timestamp_ms}_{safe_name}"
+            if f"bug-attachments/{final_filename}" in paths:
+                # files are uploaded together, so equal names need telling apart
+                final_filename = f"{bug_id}_{timestamp_ms}_{len(paths)}_{safe_name}"
+            paths.append(f"bug-attachments/{final_filename}")
 
-            existing_attachments: List[Dict[str, Any]] = []
-            table_found = None
+        denied: List[str] = []
 
-            # 1) Find the bug row in one of the candidate tables
-            for name in CANDIDATE_TABLES:
+        async def upload_one(file: UploadFile, path: str) -> Dict[str, Any]:
+            async with slots:
+                if denied:
+                    return {"filename": file.filename, "error": "skipped"}
                 try:
-                    params = {
-                        "select": "Attachments",
-                        "Bug ID": f"eq.{bug_id}",
-                    }
-                    resp = _http_get(
-                        f"{SUPABASE_REST_URL}/{name}",
-                        headers=_supabase_headers(),
-                        params=params,
-                        timeout=10,
-                    )
-                    if resp.ok and resp.json():
-                        table_found = name
-                        row = resp.json()[0]
-
-                        raw_att = row.get("Attachments") or row.get("attachments") or []
-                        if isinstance(raw_att, str):
-                            try:
-                                raw_att = json.loads(raw_att)
-                            except Exception:
-                                raw_att = []
-
-                        if not isinstance(raw_att, list):
-                            raw_att = []
-
-                        existing_attachments = raw_att
-                        break
-                except Exception:
-                    continue
+                    result = await _upload_attachment(bucket, path, file)
+                except Exception as e:
+                    result = {"filename": file.filename, "error": str(e)}
+                if result.get("error") and _is_storage_denied(result["error"]):
+                    denied.append(result["error"])
+                return result
 
-            if table_found:
-                new_attachments = existing_attachments + successful_files
+        uploaded: List[Dict[str, Any]] = list(
+            await asyncio.gather(*(upload_one(file, path) for file, path in zip(files, paths)))
+        )
 
-                try:
-                    params = {"Bug ID": f"eq.{bug_id}"}
-                    headers = _supabase_headers({"Prefer": "return=representation"})
-                    upd = _http_patch(
-                        f"{SUPABASE_REST_URL}/{table_found}",
-                        headers=headers,
-                        params=params,
-                        json={"Attachments": new_attachments},
-                        timeout=10,
-                    )
-
-                    if not upd.ok:
-                        print("Attachment DB update error:", upd.status_code, upd.text)
-                except Exception as e:
-                    print("Attachment DB update exception:", e)
+        if denied:
+            stored = [f["path"] for f in uploaded if not f.get("error") and f.get("path")]
+            if stored:
+                await _delete_attachments(bucket, stored)
+            raise Exception(denied[0])
 
-        return {"status": "success", "files": uploaded}
+        # 🧩 Persist uploaded attachments into the bug row in DB (via REST)
+        successful_files = [
+            {"filename": f["filename"], "url": f["url"], "path": f["path"]}
+            for f in uploaded if not f.get("error") and f.get("url")
+        ]
+
+        if successful_files:
+            try:
+                await _append_bug_history("Attachments", bug_id, successful_files)
+            except Exception as e:
+                print("Attachment DB update exception:", e)
+
+        return {
+            "status": "success",
+            "files": uploaded,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
 
     except Exception as e:
         error_msg = str(e)
 
-        if "row-level security policy" in error_msg.lower() or "unauthorized" in error_msg.lower():
+        if _is_storage_denied(error_msg):
             detail_msg = (
                 "Upload failed due to Supabase Security Policies (RLS). "
                 "SOLUTION: Add 'SUPABASE_SERVICE_ROLE_KEY' to your backend .env file "
@@ -2053,47 +2903,161 @@ async def upload_bug_attachments(
         raise HTTPException(status_code=500, detail=f"Upload failed: {error_msg}")
 
 
-# ---------- UPDATE BUG ----------
+# ---------- APPEND COMMENTS / ATTACHMENTS ----------
+
+# Column -> RPC doing an atomic JSON append (see backend/sql/bug_append.sql)
+BUG_APPEND_RPCS = {
+    "Comment": "append_bug_comments",
+    "Attachments": "append_bug_attachments",
+}
+
+
+async def _append_bug_history_fallback(column: str, bug_id: str, items: List[Dict[str, Any]], changed: str) -> Optional[int]:
+    """Read-modify-write used until the append RPCs are installed (not atomic)."""
+    params = {"select": f'"{column}","Changed"', "Bug ID": f"eq.{bug_id}"}
+    resp = await _bug_table_request(
+        lambda name: _http_get(
+            f"{SUPABASE_REST_URL}/{name}",
+            headers=_supabase_headers(),
+            params=params,
+            timeout=10,
+        )
+    )
+    if not resp.is_success or not resp.json():
+        return None
+    row = resp.json()[0]
+    if column == "Comment":
+        merged = parse_bug_comments(row.get("Comment"), row.get("Changed")) + items
+        value: Any = json.dumps(merged)
+    else:
+        merged = parse_bug_attachments(row.get("Attachments")) + items
+        value = merged
+    upd = await _http_patch(
+        f"{SUPABASE_REST_URL}/{bug_tables.current}",
+        headers=_supabase_headers(),
+        params={"Bug ID": f"eq.{bug_id}"},
+        json={column: value, "Changed": changed},
+        timeout=10,
+    )
+    if not upd.is_success:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to update bug in {bug_tables.current}: {upd.status_code} {upd.text}",
+        )
+    return len(merged)
+
 
-def _update_bug_with_fallback(bug_id: str, payload: Dict[str, Any]):
+async def _append_bug_history(column: str, bug_id: str, items: List[Dict[str, Any]]) -> Optional[int]:
     """
-    Try to update the bug in several possible tables using Supabase REST.
+    Append `items` to a bug's Comment or Attachments array in one atomic RPC
+    call and bump Changed. Returns the new entry count, or None when the bug
+    does not exist.
     """
-    errors = []
+    changed = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+    resp = await _http_post(
+        f"{SUPABASE_REST_URL}/rpc/{BUG_APPEND_RPCS[column]}",
+        headers=_supabase_headers(),
+        json={"p_table": await bug_tables.get(), "p_bug_id": bug_id, "p_items": items, "p_changed": changed},
+        timeout=10,
+    )
+    if resp.is_success:
+        count = resp.json()
+    elif resp.status_code == 404:
+        logger.warning("RPC %s is missing; apply backend/sql/bug_append.sql", BUG_APPEND_RPCS[column])
+        count = await _append_bug_history_fallback(column, bug_id, items, changed)
+    else:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to append to bug {bug_id}: {resp.status_code} {resp.text}",
+        )
+    if count is not None:
+        _invalidate_bug(bug_id)
+    return count
 
-    # Map Comments array -> Comment JSON string for DB
-    if "Comments" in payload and isinstance(payload["Comments"], list):
-        payload["Comment"] = json.dumps(payload["Comments"])
-        payload.pop("Comments", None)
 
-    for name in CANDIDATE_TABLES:
-        try:
-            params = {"Bug ID": f"eq.{bug_id}"}
-            headers = _supabase_headers({"Prefer": "return=representation"})
-            resp = _http_patch(
-                f"{SUPABASE_REST_URL}/{name}",
-                headers=headers,
-                params=params,
-                json=payload,
-                timeout=10,
-            )
+@app.post("/api/bugs/{bug_id}/comments")
+async def append_bug_comments(bug_id: str, request: Request):
+    """
+    Append comments to a bug without rewriting its history. Body is one
+    comment ({"text": "...", "user": "..."}) or {"comments": [...]}.
+    """
+    try:
+        payload = await request.json()
+        raw_comments = payload.get("comments") if isinstance(payload, dict) and "comments" in payload else [payload]
+        if not isinstance(raw_comments, list) or not raw_comments:
+            raise HTTPException(status_code=400, detail="Expected a comment or a non-empty comments array")
 
-            if not resp.ok:
-                errors.append(f"{name}: {resp.status_code} {resp.text}")
-                continue
+        now = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        comments: List[Dict[str, Any]] = []
+        for c in raw_comments:
+            text = c.get("text") if isinstance(c, dict) else None
+            if not isinstance(text, str) or not text.strip():
+                raise HTTPException(status_code=400, detail='Every comment needs a non-empty "text"')
+            comments.append({**c, "user": c.get("user") or "Unknown", "timestamp": c.get("timestamp") or now})
+
+        count = await _append_bug_history("Comment", bug_id, comments)
+        if count is None:
+            raise HTTPException(status_code=404, detail="Bug not found")
+        return {"status": "success", "data": {"Bug ID": bug_id, "comment_count": count, "added": comments}}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-            data = resp.json() or []
-            if data:
-                return {"status": "success", "data": data}
 
-        except Exception as e:
-            errors.append(f"{name}: {e}")
-            continue
+@app.post("/api/bugs/{bug_id}/attachments/append")
+async def append_bug_attachments(bug_id: str, request: Request):
+    """
+    Record already-uploaded files on a bug. Body: {"attachments": [{"filename",
+    "url", "path"}, ...]}. Uploads through /attachments are appended the same way.
+    """
+    try:
+        payload = await request.json()
+        attachments = payload.get("attachments") if isinstance(payload, dict) else None
+        if not isinstance(attachments, list) or not attachments:
+            raise HTTPException(status_code=400, detail="Expected a non-empty attachments array")
+        if not all(isinstance(a, dict) and a.get("url") for a in attachments):
+            raise HTTPException(status_code=400, detail='Every attachment needs a "url"')
+
+        count = await _append_bug_history("Attachments", bug_id, attachments)
+        if count is None:
+            raise HTTPException(status_code=404, detail="Bug not found")
+        return {"status": "success", "data": {"Bug ID": bug_id, "attachment_count": count}}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ---------- UPDATE BUG ----------
 
-    raise HTTPException(
-        status_code=500,
-        detail=f"Failed to update bug in any candidate table. Errors: {'; '.join(errors)}",
+async def _update_bug_with_fallback(bug_id: str, payload: Dict[str, Any]):
+    """
+    Update the bug in the resolved bug table using Supabase REST.
+    """
+    payload = _bug_update_row(payload)
+    params = {"Bug ID": f"eq.{bug_id}"}
+    headers = _supabase_headers({"Prefer": "return=representation"})
+    resp = await _bug_table_request(
+        lambda name: _http_patch(
+            f"{SUPABASE_REST_URL}/{name}",
+            headers=headers,
+            params=params,
+            json=payload,
+            timeout=10,
+        )
     )
+    if not resp.is_success:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to update bug in {bug_tables.current}: {resp.status_code} {resp.text}",
+        )
+
+    _invalidate_bug(bug_id)
+    data = resp.json() or []
+    if not data:
+        raise HTTPException(status_code=404, detail="Bug not found")
+    return {"status": "success", "data": data}
 
 
 @app.put("/api/bugs/{bug_id}")
@@ -2102,7 +3066,7 @@ async def update_bug(bug_id: str, request: Request):
         payload: Dict[str, Any] = await request.json()
         payload["Bug ID"] = bug_id
 
-        result = _update_bug_with_fallback(bug_id, payload)
+        result = await _update_bug_with_fallback(bug_id, payload)
         return result
     except HTTPException:
         raise
@@ -2162,257 +3126,724 @@ class TranstrackerEntry(BaseModel):
     timesavedpercent: Optional[float] = None
 
 
+# In-memory transtracker indexes: open bugs per product per day/week/month/
+# year (/api/transtracker/bar) and distinct filter values with counts
+# (/api/transtracker/filters). Built from one scan, kept current by the API's
+# writes, and rebuilt every TRANSTRACKER_INDEX_TTL seconds to pick up rows
+# written straight to Supabase.
+TRANSTRACKER_INDEX_TTL = float(os.getenv("TRANSTRACKER_INDEX_TTL", os.getenv("TRANSTRACKER_ROLLUP_TTL", "600")))
+TRANSTRACKER_INDEX_SELECT = (
+    "id,buildreceiveddate,totalopenbugs,productsegregated,projects_products,applicationtype,productowner,spoc"
+)
+
+# filter param -> list name in the /api/transtracker/filters payload
+TRANSTRACKER_FACET_LISTS = {
+    "applicationtype": "application_types",
+    "product": "products",
+    "owner": "owners",
+    "spoc": "spocs",
+}
+
+
+class TranstrackerIndexes(NamedTuple):
+    rollup: TimeRollup
+    facets: DistinctValueIndex
+
+    @classmethod
+    def empty(cls) -> "TranstrackerIndexes":
+        return cls(TimeRollup(), DistinctValueIndex(TRANSTRACKER_FACET_LISTS))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"rollup": self.rollup.stats(), "facets": self.facets.stats()}
+
+
+def _transtracker_product(row: Dict[str, Any]) -> str:
+    return str(row.get("productsegregated") or row.get("projects_products") or "").strip()
+
+
+def _index_transtracker_row(indexes: TranstrackerIndexes, row: Dict[str, Any]) -> None:
+    row_id = row.get("id")
+    indexes.facets.add(row_id, {
+        "applicationtype": row.get("applicationtype"),
+        "product": _transtracker_product(row),
+        "owner": row.get("productowner"),
+        "spoc": row.get("spoc"),
+    })
+    raw_date = row.get("buildreceiveddate")
+    try:
+        dt = raw_date if isinstance(raw_date, datetime) else _parse_iso_datetime(str(raw_date))
+    except (TypeError, ValueError):
+        indexes.rollup.discard(row_id)
+        return
+    try:
+        open_bugs = int(float(row.get("totalopenbugs") or 0))
+    except (TypeError, ValueError):
+        open_bugs = 0
+    indexes.rollup.add(row_id, dt, open_bugs, _transtracker_product(row))
+
+
+def _unindex_transtracker_row(indexes: TranstrackerIndexes, row_id: Any) -> None:
+    indexes.rollup.discard(row_id)
+    indexes.facets.discard(row_id)
+
+
+async def _load_transtracker_indexes(indexes: TranstrackerIndexes) -> None:
+    source = EXPORT_SOURCES["transtrackers"]
+    params = {"order": source.order, "limit": str(EXPORT_PAGE_SIZE), "select": TRANSTRACKER_INDEX_SELECT}
+    async for page in _export_pages(source, params):
+        for row in page:
+            _index_transtracker_row(indexes, row)
+
+
+transtracker_indexes: "RefreshingIndex[TranstrackerIndexes]" = RefreshingIndex(
+    TranstrackerIndexes.empty, _load_transtracker_indexes, ttl=TRANSTRACKER_INDEX_TTL
+)
+
+
+async def _with_derived_transtracker_fields(entry_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """`payload` plus the derived fields recomputed from the stored row with `payload` applied."""
+    resp = await _http_get(
+        f"{SUPABASE_REST_URL}/transtrackers",
+        headers=_supabase_headers(),
+        params={"id": f"eq.{entry_id}", "select": ",".join(transtracker_fields.SOURCE_FIELDS)},
+        timeout=10,
+    )
+    if not resp.is_success:
+        raise HTTPException(status_code=500, detail=f"Failed to read transtracker {entry_id}: {resp.status_code} {resp.text}")
+    current = resp.json() or []
+    if not current:
+        raise HTTPException(status_code=404, detail=f"Transtracker entry {entry_id} not found")
+    merged = transtracker_fields.derive_fields([{**current[0], **payload}])[0]
+    return {**payload, **{k: merged[k] for k in transtracker_fields.DERIVED_FIELDS if k in merged}}
+
+
 @app.post("/api/transtracker")
 async def create_transtracker(entry: TranstrackerEntry):
     """Create a new transtracker entry."""
     try:
-        data_dict = entry.model_dump()
-        resp = supabase.table("transtrackers").insert(data_dict).execute()
+        data_dict = transtracker_fields.derive_fields([entry.model_dump()])[0]
+        resp = await _execute(supabase.table("transtrackers").insert(data_dict))
         if hasattr(resp, "error") and getattr(resp, "error", None):
             error_msg = str(getattr(resp, "error"))
             raise HTTPException(status_code=400, detail=error_msg)
-        return {"status": "success", "data": getattr(resp, "data", [])}
+        rows = getattr(resp, "data", []) or []
+        for row in rows:
+            transtracker_indexes.apply(lambda indexes: _index_transtracker_row(indexes, row))
+        _invalidate_transtracker_analytics()
+        return {"status": "success", "data": rows}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/transtracker/all")
-async def get_all_transtrackers():
-    """Get all transtracker entries."""
+
+@app.patch("/api/transtracker/{entry_id}")
+async def update_transtracker(entry_id: int, request: Request):
+    """Update fields of a transtracker entry."""
     try:
-        resp = supabase.table("transtrackers").select("*").execute()
+        payload: Dict[str, Any] = await request.json()
+        unknown = [k for k in payload if k not in TranstrackerEntry.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown transtracker fields: {', '.join(unknown)}")
+        if any(k in payload for k in transtracker_fields.SOURCE_FIELDS + transtracker_fields.DERIVED_FIELDS):
+            payload = await _with_derived_transtracker_fields(entry_id, payload)
+        resp = await _execute(supabase.table("transtrackers").update(payload).eq("id", entry_id))
         if hasattr(resp, "error") and getattr(resp, "error", None):
-            error_msg = str(getattr(resp, "error"))
-            raise HTTPException(status_code=400, detail=error_msg)
-        return {"status": "success", "data": getattr(resp, "data", [])}
+            raise HTTPException(status_code=400, detail=str(getattr(resp, "error")))
+        rows = getattr(resp, "data", []) or []
+        if not rows:
+            raise HTTPException(status_code=404, detail=f"Transtracker entry {entry_id} not found")
+        for row in rows:
+            transtracker_indexes.apply(lambda indexes: _index_transtracker_row(indexes, row))
+        _invalidate_transtracker_analytics()
+        return {"status": "success", "data": rows}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/transtracker/filters")
-async def get_transtracker_filters():
-    """Get distinct filter options for transtracker dashboard."""
+@app.delete("/api/transtracker/{entry_id}")
+async def delete_transtracker(entry_id: int):
+    """Delete a transtracker entry."""
     try:
-        resp = supabase.table("transtrackers").select(
-            "applicationtype, productsegregated, projects_products, productowner, spoc"
-        ).execute()
-        
+        resp = await _execute(supabase.table("transtrackers").delete().eq("id", entry_id))
         if hasattr(resp, "error") and getattr(resp, "error", None):
-             raise HTTPException(status_code=400, detail=str(getattr(resp, "error")))
-             
-        data = getattr(resp, "data", []) or []
-        
-        app_set = set()
-        product_set = set()
-        owner_set = set()
-        spoc_set = set()
-        
-        for r in data:
-            # Application Type
-            app_val = str(r.get("applicationtype") or "").strip()
-            if app_val: app_set.add(app_val)
-            
-            # Product
-            prod_val = str(r.get("productsegregated") or r.get("projects_products") or "").strip()
-            if prod_val: product_set.add(prod_val)
-            
-            # Owner
-            owner_val = str(r.get("productowner") or "").strip()
-            if owner_val: owner_set.add(owner_val)
-            
-            # SPOC
-            spoc_val = str(r.get("spoc") or "").strip()
-            if spoc_val: spoc_set.add(spoc_val)
-            
-        return {
-            "status": "success",
-            "data": {
-                "application_types": sorted(list(app_set)),
-                "products": sorted(list(product_set)),
-                "owners": sorted(list(owner_set)),
-                "spocs": sorted(list(spoc_set))
-            }
-        }
+            raise HTTPException(status_code=400, detail=str(getattr(resp, "error")))
+        rows = getattr(resp, "data", []) or []
+        if not rows:
+            raise HTTPException(status_code=404, detail=f"Transtracker entry {entry_id} not found")
+        transtracker_indexes.apply(lambda indexes: _unindex_transtracker_row(indexes, entry_id))
+        _invalidate_transtracker_analytics()
+        return {"status": "success", "data": rows}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# DASHBOARD ENDPOINTS #
-    
-# 
-import logging
-from typing import Optional, Tuple
+# ---------- TRANSTRACKER IMPORT ----------
+
+TRANSTRACKER_IMPORT_MAX_ROWS = int(os.getenv("TRANSTRACKER_IMPORT_MAX_ROWS", "20000"))
+TRANSTRACKER_IMPORT_CHUNK_SIZE = max(1, int(os.getenv("TRANSTRACKER_IMPORT_CHUNK_SIZE", "500")))
+
+_transtracker_entries = TypeAdapter(List[TranstrackerEntry])
+
+
+def _import_rows_from_csv(text: str) -> List[Dict[str, Any]]:
+    """CSV with a header row of TranstrackerEntry field names; blank cells are null."""
+    reader = csv.DictReader(io.StringIO(text.lstrip("\ufeff")))
+    rows = []
+    for record in reader:
+        rows.append({
+            (key or "").strip(): (value.strip() or None) if isinstance(value, str) else value
+            for key, value in record.items()
+            if key
+        })
+    return rows
+
+
+async def _import_rows(request: Request, format: Optional[str]) -> List[Dict[str, Any]]:
+    """Rows from a JSON array ({"entries": [...]} also works), a CSV body or a multipart `file`."""
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        upload = (await request.form()).get("file")
+        if upload is None or not hasattr(upload, "read"):
+            raise HTTPException(status_code=400, detail='Multipart imports need a "file" field')
+        raw = await upload.read()
+        name = (upload.filename or "").lower()
+        format = format or ("json" if name.endswith(".json") else "csv")
+    else:
+        raw = await request.body()
+        format = format or ("csv" if "csv" in content_type else "json")
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import files must be UTF-8")
+
+    if format == "csv":
+        rows = _import_rows_from_csv(text)
+    else:
+        try:
+            body = json.loads(text)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+        rows = body.get("entries") if isinstance(body, dict) else body
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail='Expected a JSON array of entries (or {"entries": [...]})')
+    if not rows:
+        raise HTTPException(status_code=400, detail="Nothing to import")
+    if len(rows) > TRANSTRACKER_IMPORT_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {TRANSTRACKER_IMPORT_MAX_ROWS} rows per import")
+    return rows
 
-logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
-def _extract_count_from_resp(resp) -> Tuple[int, Optional[str]]:
+def _validate_import_rows(rows: List[Any]) -> Tuple[List[Tuple[int, TranstrackerEntry]], List[Dict[str, Any]]]:
     """
-    Robustly extract a count from various Supabase client responses.
-    Returns (count, optional_error_message).
+    Validate every row in one TypeAdapter pass. When some rows fail, their
+    errors are grouped per row and the remaining rows are validated again as
+    one batch. Returns ([(index, entry)], [error results]).
     """
     try:
-        if resp is None:
-            logger.debug("Supabase response is None")
-            return 0, "no response"
-
-        # dict-like
-        if isinstance(resp, dict):
-            if resp.get("error"):
-                return 0, str(resp.get("error"))
-            if resp.get("count") is not None:
-                count_val = resp.get("count")
-                return int(count_val) if count_val is not None else 0, None
-            if resp.get("data") is not None:
-                data_val = resp.get("data")
-                return len(data_val) if data_val else 0, None
-
-        # object with attributes (APIResponse etc.)
-        data_attr = getattr(resp, "data", None)
-        count_attr = getattr(resp, "count", None)
-        error_attr = getattr(resp, "error", None)
-
-        if error_attr:
-            return 0, str(error_attr)
-        if count_attr is not None:
-            try:
-                return int(count_attr), None
-            except Exception:
-                pass
-        if data_attr is not None:
-            try:
-                return len(data_attr or []), None
-            except Exception:
-                try:
-                    return len(list(data_attr)), None
-                except Exception:
-                    pass
+        return list(enumerate(_transtracker_entries.validate_python(rows))), []
+    except ValidationError as e:
+        problems: Dict[int, List[str]] = {}
+        for err in e.errors(include_url=False, include_input=False):
+            loc = err.get("loc") or ()
+            index = loc[0] if loc and isinstance(loc[0], int) else -1
+            field = ".".join(str(part) for part in loc[1:]) or "row"
+            problems.setdefault(index, []).append(f"{field}: {err.get('msg')}")
+    if -1 in problems:
+        raise HTTPException(status_code=400, detail="; ".join(problems[-1]))
+    errors = [
+        {"index": index, "status": "error", "error": "; ".join(messages)}
+        for index, messages in problems.items()
+    ]
+    good = [i for i in range(len(rows)) if i not in problems]
+    entries = _transtracker_entries.validate_python([rows[i] for i in good]) if good else []
+    return list(zip(good, entries)), errors
+
+
+async def _post_transtracker_rows(rows: List[Dict[str, Any]]):
+    """Multi-row insert; returns the inserted rows' indexed columns."""
+    columns = list(rows[0])
+    return await _http_post(
+        f"{SUPABASE_REST_URL}/transtrackers",
+        headers=_supabase_headers({"Prefer": "return=representation,missing=default"}),
+        json=rows,
+        params={
+            "columns": ",".join(f'"{c}"' if not c.isidentifier() else c for c in columns),
+            "select": TRANSTRACKER_INDEX_SELECT,
+        },
+        timeout=60,
+    )
 
-        # tuple/list (some clients return (data, error))
-        if isinstance(resp, (list, tuple)):
-            if len(resp) >= 1 and isinstance(resp[0], (list, tuple)):
-                return len(resp[0]), None
-            return len(resp), None
 
-        # last resort: inspect __dict__ / vars
-        try:
-            d = getattr(resp, "__dict__", None) or dict(vars(resp))
-            if isinstance(d, dict):
-                if d.get("error"):
-                    return 0, str(d.get("error"))
-                if d.get("data") is not None:
-                    return len(d.get("data") or []), None
-        except Exception:
-            pass
+async def _insert_transtracker_entries(entries: List[Tuple[int, TranstrackerEntry]]) -> List[Dict[str, Any]]:
+    """
+    Insert validated entries TRANSTRACKER_IMPORT_CHUNK_SIZE rows per request.
+    A chunk the DB rejects is retried row by row so each row gets its own result.
+    If a request fails outright (timeout, connection error) the import stops
+    there: rows created so far keep their results and every row not yet
+    confirmed gets an error, since the request in flight may or may not have
+    been stored.
+    """
+    results: List[Dict[str, Any]] = []
 
-        logger.debug("Unknown response shape when extracting count: %r", resp)
-        return 0, None
+    def created(index: int, row: Dict[str, Any]) -> None:
+        transtracker_indexes.apply(lambda indexes: _index_transtracker_row(indexes, row))
+        results.append({"index": index, "id": row.get("id"), "status": "created"})
 
+    try:
+        for chunk in _chunks(entries, TRANSTRACKER_IMPORT_CHUNK_SIZE):
+            rows = transtracker_fields.derive_fields([entry.model_dump() for _, entry in chunk])
+            resp = await _post_transtracker_rows(rows)
+            if resp.is_success:
+                for (index, _), row in zip(chunk, resp.json() or []):
+                    created(index, row)
+                continue
+            for (index, _), row in zip(chunk, rows):
+                single = resp if len(chunk) == 1 else await _post_transtracker_rows([row])
+                if single.is_success:
+                    created(index, (single.json() or [{}])[0])
+                else:
+                    results.append({"index": index, "status": "error", "error": f"{single.status_code} {single.text}"})
     except Exception as e:
-        logger.exception("Exception extracting count: %s", e)
-        return 0, str(e)
+        logger.error("Transtracker import stopped after %d rows: %s", len(results), e)
+        reported = {r["index"] for r in results}
+        results.extend(
+            {"index": index, "status": "error", "error": f"Import stopped before this row was confirmed: {e}"}
+            for index, _ in entries
+            if index not in reported
+        )
+    if any(r["status"] == "created" for r in results):
+        _invalidate_transtracker_analytics()
+    return results
 
 
-def _count_table(table_name: str, select_col: str = '"id"') -> Tuple[int, Optional[str]]:
+@app.post("/api/transtracker/import")
+async def import_transtrackers(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|json)$", description="Defaults from the Content-Type or file name"),
+    dry_run: bool = Query(False, description="Validate only; insert nothing"),
+):
     """
-    Robust count for a Supabase table.
-    Attempts:
-      - select(select_col, count="exact")
-      - fallback to select('"Bug ID"', count="exact") for likely Bug sheet
-      - fallback to select("id", count="exact")
+    Import up to TRANSTRACKER_IMPORT_MAX_ROWS transtracker entries from a JSON
+    array, a CSV body (header row of field names) or a multipart `file`.
+    Every row is validated against TranstrackerEntry up front; valid rows get
+    their calendar and time-saved fields derived and are inserted in chunks.
+    Returns one result per row, in input order, plus timings and throughput
+    (rows per second).
+    """
+    try:
+        started = time.perf_counter()
+        rows = await _import_rows(request, format)
+        parsed = time.perf_counter()
+        entries, results = _validate_import_rows(rows)
+        validated = time.perf_counter()
+        if dry_run:
+            results.extend({"index": index, "status": "valid"} for index, _ in entries)
+        else:
+            results.extend(await _insert_transtracker_entries(entries))
+        finished = time.perf_counter()
+
+        response = _bulk_response(results, "valid" if dry_run else "created")
+        elapsed = finished - started
+        response["data"]["timings_ms"] = {
+            "parse": round((parsed - started) * 1000, 1),
+            "validate": round((validated - parsed) * 1000, 1),
+            "insert": round((finished - validated) * 1000, 1),
+            "total": round(elapsed * 1000, 1),
+        }
+        response["data"]["rows_per_second"] = round(len(rows) / elapsed, 1) if elapsed > 0 else None
+        return response
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ---------- TRANSTRACKER DERIVED FIELDS BACKFILL ----------
+
+TRANSTRACKER_BACKFILL_SELECT = ",".join(("id",) + transtracker_fields.SOURCE_FIELDS + transtracker_fields.DERIVED_FIELDS)
+
+# state of the one backfill run per process; see /api/transtracker/derived/backfill
+_derived_backfill: Dict[str, Any] = {"state": "idle"}
+_derived_backfill_task: Optional[asyncio.Future] = None
 
-      - fallback to fetching data and len(data)
 
-    Returns (count, error_message)
+def _derived_changes(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """{id, derived fields} for the rows whose stored derived values are out of date."""
+    stored = [{k: row.get(k) for k in transtracker_fields.DERIVED_FIELDS} for row in rows]
+    derived = transtracker_fields.derive_fields([dict(row) for row in rows])
+    changes = []
+    for row, before, after in zip(rows, stored, derived):
+        update = {k: after.get(k) for k in transtracker_fields.DERIVED_FIELDS}
+        if update != before:
+            changes.append({"id": row["id"], **update})
+    return changes
+
+
+async def _write_derived_changes(changes: List[Dict[str, Any]]) -> Optional[int]:
     """
-    try:
-        logger.info("Querying table=%s select_col=%s", table_name, select_col)
-
-        # Primary attempt
-        try_cols = [select_col]
-        # if user used "*", try explicit columns likely present
-        if select_col == "*" or select_col == '"*"':
-            try_cols.extend(['"Bug ID"', '"id"', "id"])
-
-        # also add some sensible fallbacks
-        if '"Bug ID"' not in try_cols:
-            try_cols.append('"Bug ID"')
-        if '"id"' not in try_cols:
-            try_cols.append('"id"')
-        if "id" not in try_cols:
-            try_cols.append("id")
-
-        last_err = None
-        for col in try_cols:
+    Apply {id, derived fields} rows with the update_transtracker_derived RPC
+    (backend/sql/transtracker_derived.sql) in one request; returns the number
+    of rows updated, or None if the RPC is not installed.
+    """
+    resp = await _http_post(
+        f"{SUPABASE_REST_URL}/rpc/update_transtracker_derived",
+        headers=_supabase_headers(),
+        json={"p_rows": changes},
+        timeout=60,
+    )
+    if resp.status_code == 404:
+        return None
+    if not resp.is_success:
+        raise HTTPException(status_code=500, detail=f"{resp.status_code} {resp.text}")
+    return int(resp.json() or 0)
+
+
+async def _patch_derived_changes(changes: List[Dict[str, Any]]) -> int:
+    """Fallback for _write_derived_changes: one PATCH per row, in sequence."""
+    for change in changes:
+        resp = await _http_patch(
+            f"{SUPABASE_REST_URL}/transtrackers",
+            headers=_supabase_headers({"Prefer": "return=minimal"}),
+            params={"id": f"eq.{change['id']}"},
+            json={k: v for k, v in change.items() if k != "id"},
+            timeout=60,
+        )
+        if not resp.is_success:
+            raise HTTPException(status_code=500, detail=f"{resp.status_code} {resp.text}")
+    return len(changes)
+
+
+async def _backfill_derived_fields(progress: Dict[str, Any]) -> None:
+    """
+    Walk transtrackers in id order a page at a time, derive the fields for the
+    whole page at once and write back only the rows that changed, one
+    update_transtracker_derived call per TRANSTRACKER_IMPORT_CHUNK_SIZE rows.
+    A rejected chunk is counted as failed and the run carries on.
+    """
+    source = EXPORT_SOURCES["transtrackers"]
+    params = {"order": source.order, "limit": str(EXPORT_PAGE_SIZE), "select": TRANSTRACKER_BACKFILL_SELECT}
+    started = time.perf_counter()
+    rpc_missing = False
+    async for page in _export_pages(source, params):
+        progress["scanned"] += len(page)
+        progress["last_id"] = page[-1].get("id")
+        for chunk in _chunks(_derived_changes(page), TRANSTRACKER_IMPORT_CHUNK_SIZE):
             try:
-                logger.debug("Attempting select(%s, count='exact') on %s", col, table_name)
-                # Use keyword arguments to avoid type issues
-                resp = supabase.table(table_name).select(col).execute()
-                cnt, err = _extract_count_from_resp(resp)
-                if err:
-                    last_err = f"col={col} error={err}"
-                    logger.warning("Count attempt failed for %s.%s: %s", table_name, col, err)
-                    # try next fallback
-                    continue
-                logger.info("Count success for %s (col=%s): %d", table_name, col, cnt)
-                return cnt, None
-            except Exception as inner:
-                last_err = str(inner)
-                logger.exception("Exception while querying %s with column %s: %s", table_name, col, inner)
-                continue
+                updated = None if rpc_missing else await _write_derived_changes(chunk)
+                if updated is None:
+                    if not rpc_missing:
+                        logger.warning("RPC update_transtracker_derived is missing; apply backend/sql/transtracker_derived.sql")
+                        rpc_missing = True
+                    updated = await _patch_derived_changes(chunk)
+                progress["updated"] += updated
+            except Exception as e:
+                progress["failed"] += len(chunk)
+                progress["last_error"] = getattr(e, "detail", None) or str(e)
+        elapsed = time.perf_counter() - started
+        progress["elapsed_ms"] = round(elapsed * 1000, 1)
+        progress["rows_per_second"] = round(progress["scanned"] / elapsed, 1) if elapsed > 0 else None
+    if progress["updated"]:
+        transtracker_indexes.invalidate()
+        _invalidate_transtracker_analytics()
+
+
+def _derived_backfill_done(task: asyncio.Future) -> None:
+    if task.cancelled():
+        _derived_backfill["state"] = "cancelled"
+    elif task.exception() is not None:
+        exc = task.exception()
+        _derived_backfill.update(state="failed", error=getattr(exc, "detail", None) or str(exc))
+        logger.error("Transtracker derived-field backfill failed: %s", _derived_backfill["error"])
+    else:
+        _derived_backfill["state"] = "finished"
+    _derived_backfill["finished_at"] = datetime.now(timezone.utc).isoformat()
+
+
+@app.post("/api/transtracker/derived/backfill", status_code=202)
+async def start_derived_backfill():
+    """
+    Start recomputing the calendar and time-saved fields of every existing
+    transtracker row in the background. Poll GET on the same path for progress;
+    starting while a run is in progress returns 409.
+    """
+    global _derived_backfill, _derived_backfill_task
+    if _derived_backfill_task is not None and not _derived_backfill_task.done():
+        raise HTTPException(status_code=409, detail="A backfill is already running")
+    _derived_backfill = {
+        "state": "running",
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "scanned": 0,
+        "updated": 0,
+        "failed": 0,
+        "last_id": None,
+    }
+    _derived_backfill_task = asyncio.ensure_future(_backfill_derived_fields(_derived_backfill))
+    _derived_backfill_task.add_done_callback(_derived_backfill_done)
+    return {"status": "success", "data": _derived_backfill}
+
+
+@app.get("/api/transtracker/derived/backfill")
+async def get_derived_backfill():
+    """Progress of the current or last derived-field backfill."""
+    return {"status": "success", "data": _derived_backfill}
 
-        # Final fallback: try selecting some rows and count them
-        try:
-            logger.debug("Final fallback: select all rows (limit 1000) from %s", table_name)
-            resp2 = supabase.table(table_name).select("*").limit(1000).execute()
-            cnt2, err2 = _extract_count_from_resp(resp2)
-            if err2:
-                logger.warning("Final fallback also returned error: %s", err2)
-                return 0, last_err or err2
-            logger.info("Final fallback counted %d rows for %s", cnt2, table_name)
-            return cnt2, None
-        except Exception as final_exc:
-            logger.exception("Final fallback exception for %s: %s", table_name, final_exc)
-            return 0, last_err or str(final_exc)
 
+TRANSTRACKER_LIST_DEFAULT_LIMIT = 100
+TRANSTRACKER_LIST_MAX_LIMIT = 1000
+
+
+def _parse_transtracker_fields(raw: Optional[str]) -> Optional[List[str]]:
+    """`fields=` value to a column list ("id" first, always); None means all columns."""
+    if raw is None or not raw.strip():
+        return None
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    # the table's columns are the lower-cased model fields (e.g. totalttestcases)
+    columns = {name.lower() for name in TranstrackerEntry.model_fields}
+    unknown = [f for f in fields if f != "id" and f.lower() not in columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown transtracker fields: {', '.join(unknown)}")
+    return ["id"] + [f for f in dict.fromkeys(f.lower() for f in fields) if f != "id"]
+
+
+def _encode_transtracker_cursor(row_id: Any) -> str:
+    raw = json.dumps([row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_transtracker_cursor(cursor: str) -> Any:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        (row_id,) = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if row_id is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return row_id
+
+
+@app.get("/api/transtracker/all")
+async def get_all_transtrackers(
+    limit: int = Query(TRANSTRACKER_LIST_DEFAULT_LIMIT, ge=1, le=TRANSTRACKER_LIST_MAX_LIMIT),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description='Comma-separated columns, e.g. "applicationtype,buildnumber"'),
+    applicationtype: Optional[str] = Query(None),
+    product: Optional[str] = Query(None),
+    owner: Optional[str] = Query(None),
+    spoc: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None, description="Builds received on or after (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="Builds received on or before (YYYY-MM-DD)"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
+    """
+    Get transtracker entries in id order, one page at a time: follow
+    `next_cursor` for the next page. Filters accept a single value or a
+    comma-separated list; `fields` limits the returned columns ("id" is always
+    included). format=ndjson streams every matching row from `cursor` on, one
+    JSON object per line, reading EXPORT_PAGE_SIZE rows at a time; a stream
+    that fails partway ends with an {"error": ...} line.
+    """
+    try:
+        source = EXPORT_SOURCES["transtrackers"]
+        given = {"applicationtype": applicationtype, "product": product, "owner": owner, "spoc": spoc}
+        field_list = _parse_transtracker_fields(fields)
+        params: Dict[str, str] = {
+            "select": ",".join(field_list) if field_list else "*",
+            "order": source.order,
+            **_filter_params(given, source.filters),
+            **_date_range_params(source.date_column, date_from, date_to),
+        }
+        if cursor:
+            params["id"] = f"gt.{_decode_transtracker_cursor(cursor)}"
+
+        if format == "ndjson":
+            params["limit"] = str(EXPORT_PAGE_SIZE)
+            # the first page is read up front so upstream errors still get a proper status
+            first_page = await _export_page(source, params)
+
+            async def body():
+                try:
+                    async for page in _export_pages(source, params, first_page):
+                        yield _ndjson_text(page)
+                except Exception as e:
+                    # headers are already sent; end the stream with an error line
+                    logger.error("Transtracker stream aborted: %s", e)
+                    yield _stream_error_text(format, e)
+
+            return StreamingResponse(body(), media_type="application/x-ndjson")
+
+        # one extra row tells us whether another page exists
+        params["limit"] = str(limit + 1)
+        data = await _export_page(source, params)
+        next_cursor = None
+        if len(data) > limit:
+            data = data[:limit]
+            next_cursor = _encode_transtracker_cursor(data[-1].get("id"))
+        return {"status": "success", "data": data, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _transtracker_filter_options(
+    selected: Optional[Dict[str, List[str]]] = None,
+    columns: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Sorted option lists plus per-value row counts, keyed by list name."""
+    facets = (await transtracker_indexes.get()).facets.facets(selected)
+    columns = columns or list(TRANSTRACKER_FACET_LISTS)
+    data: Dict[str, Any] = {TRANSTRACKER_FACET_LISTS[c]: list(facets[c]) for c in columns}
+    data["counts"] = {TRANSTRACKER_FACET_LISTS[c]: facets[c] for c in columns}
+    return data
+
+
+@app.get("/api/transtracker/filters")
+async def get_transtracker_filters(
+    request: Request,
+    column: Optional[str] = Query(None, description="Return one list: applicationtype, product, owner or spoc"),
+    applicationtype: Optional[str] = Query(None),
+    product: Optional[str] = Query(None),
+    owner: Optional[str] = Query(None),
+    spoc: Optional[str] = Query(None),
+):
+    """
+    Get distinct filter options for transtracker dashboard, with row counts,
+    from the in-memory index. Passing filter values (comma-separated) narrows
+    the other lists to matching rows, e.g. ?applicationtype=Web gives the
+    products for that application type. Sends an ETag and answers a matching
+    If-None-Match with 304.
+    """
+    if column is not None and column not in TRANSTRACKER_FACET_LISTS:
+        raise HTTPException(status_code=400, detail=f"column must be one of: {', '.join(TRANSTRACKER_FACET_LISTS)}")
+    given = {"applicationtype": applicationtype, "product": product, "owner": owner, "spoc": spoc}
+    selected = {k: [v.strip() for v in value.split(",") if v.strip()] for k, value in given.items() if value}
+    try:
+        data = await _transtracker_filter_options(selected, [column] if column else None)
+    except Exception as e:
+        logger.exception("Building the transtracker indexes failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    result = {"status": "success", "data": data}
+    body = json.dumps(result, sort_keys=True).encode("utf-8")
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(result, headers=headers)
+
+
+# DASHBOARD ENDPOINTS #
+    
+# 
+import logging
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# count= methods PostgREST understands; "planned"/"estimated" read the planner's
+# row estimate instead of scanning, for very large tables
+COUNT_METHODS = ("exact", "planned", "estimated")
+TABLE_COUNT_METHOD = os.getenv("TABLE_COUNT_METHOD", "exact")
+if TABLE_COUNT_METHOD not in COUNT_METHODS:
+    TABLE_COUNT_METHOD = "exact"
+
+
+def _count_from_content_range(value: Optional[str]) -> Optional[int]:
+    """Total from a PostgREST Content-Range header ("0-24/1234" or "*/1234")."""
+    total = (value or "").rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+
+async def _count_table(
+    table_name: Optional[str],
+    params: Optional[Dict[str, str]] = None,
+    method: str = TABLE_COUNT_METHOD,
+) -> Tuple[int, Optional[str]]:
+    """
+    Row count for a table (None: the resolved bug table) from a HEAD request
+    with Prefer: count=<method>. Only the Content-Range header comes back, so
+    nothing is transferred per row and the PostgREST max-rows cap does not
+    apply. `params` are PostgREST filters. Returns (count, error_message).
+    """
+    headers = _supabase_headers({"Prefer": f"count={method}"})
+
+    def send(name: str):
+        return _http_head(f"{SUPABASE_REST_URL}/{name}", headers=headers, params=params, timeout=10)
+
+    try:
+        resp = await (_bug_table_request(send) if table_name is None else send(table_name))
     except Exception as e:
-        logger.exception("Unexpected error in _count_table for %s: %s", table_name, e)
+        logger.exception("Count request failed for %s: %s", table_name or "bugs", e)
         return 0, str(e)
+    count = _count_from_content_range(resp.headers.get("content-range"))
+    if not resp.is_success or count is None:
+        err = f"{resp.status_code} {resp.headers.get('content-range') or ''}".strip()
+        logger.warning("Count failed for %s: %s", table_name or bug_tables.current, err)
+        return 0, err
+    return count, None
+
+
+# Dashboard counts: fetched concurrently, each bounded by COUNTS_TIMEOUT, and
+# served from cache for COUNTS_CACHE_TTL seconds, then stale for up to
+# COUNTS_STALE_TTL more while one background refresh runs
+COUNTS_TIMEOUT = float(os.getenv("COUNTS_TIMEOUT", "3"))
+COUNTS_CACHE_TTL = float(os.getenv("COUNTS_CACHE_TTL", "30"))
+COUNTS_STALE_TTL = float(os.getenv("COUNTS_STALE_TTL", "300"))
+counts_cache = StaleWhileRevalidateCache(ttl=COUNTS_CACHE_TTL, stale_ttl=COUNTS_STALE_TTL, max_entries=8)
+
+# tried in order until one exists; the first that answers is remembered
+TRANSTRACKER_COUNT_TABLES = ("transtrackers", "transtracker", "transactions")
+_transtracker_count_table: Optional[str] = None
+
+
+async def _count_transtrackers(method: str) -> Tuple[int, Optional[str]]:
+    global _transtracker_count_table
+    if _transtracker_count_table:
+        return await _count_table(_transtracker_count_table, method=method)
+    err = None
+    for name in TRANSTRACKER_COUNT_TABLES:
+        total, err = await _count_table(name, method=method)
+        if not err:
+            _transtracker_count_table = name
+            return total, None
+    return 0, err
+
+
+async def _bounded_count(label: str, pending: Awaitable[Tuple[int, Optional[str]]]) -> Optional[int]:
+    """Await one count within COUNTS_TIMEOUT; None when it failed or timed out."""
+    try:
+        total, err = await asyncio.wait_for(pending, COUNTS_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Count for %s timed out after %ss", label, COUNTS_TIMEOUT)
+        return None
+    return None if err else total
+
+
+async def _load_counts(method: str) -> Dict[str, int]:
+    labels = ("total_bugs", "users", "transactions")
+    results = await asyncio.gather(
+        _bounded_count("bugs", _count_table(None, method=method)),
+        _bounded_count("users", _count_table("users", method=method)),
+        _bounded_count("transtrackers", _count_transtrackers(method)),
+    )
+    # a count that failed keeps its last known value rather than dropping to 0
+    previous = counts_cache.peek(method) or {}
+    return {
+        label: total if total is not None else previous.get(label, 0)
+        for label, total in zip(labels, results)
+    }
 
 
 @app.get("/api/counts")
-def get_counts():
+async def get_counts(count: str = Query(TABLE_COUNT_METHOD, pattern="^(exact|planned|estimated)$")):
     """Returns counts of bugs, users, and transactions for dashboard."""
     try:
-        logger.info("Handling /api/counts")
-
-        # For Bugs_file we prefer the native column name if present ("Bug ID")
-        total_bugs, err_bugs = _count_table("bugs", select_col='"Bug ID"')
-        # if still 0 and there was an error, try wildcard with count
-        if total_bugs == 0 and err_bugs:
-            logger.info("Retrying bugs with '*' because first attempt returned 0 and error=%s", err_bugs)
-            total_bugs, err_bugs = _count_table("bugs", select_col="*")
-
-        total_users, err_users = _count_table("users", select_col='"id"')
-        # transaction/transtracker fallbacks
-        transaction_tracker, err_trans = _count_table("transtrackers", select_col='"id"')
-        if transaction_tracker == 0:
-            alt_count, _ = _count_table("transtracker", select_col='"id"')
-            if alt_count:
-                transaction_tracker = alt_count
-            else:
-                alt_count2, _ = _count_table("transactions", select_col='"id"')
-                transaction_tracker = alt_count2
-
-        response = {
-            "status": "success",
-            "data": {
-                "total_bugs": total_bugs,
-                "users": total_users,
-                "transactions": transaction_tracker,
-            },
-        }
-        logger.info("/api/counts -> %s", response)
-        return response
+        data = await counts_cache.get(count, lambda: _load_counts(count))
+        return {"status": "success", "data": data}
     except Exception as e:
         msg = f"Error in /api/counts: {e}"
         logger.exception(msg)
@@ -2423,26 +3854,6 @@ def get_counts():
 from fastapi import APIRouter
 router = APIRouter()
 
-def _get_rows_from_resp(resp) -> List[Dict[str, Any]]:
-    """Safely extract rows from different supabase response shapes."""
-    if resp is None:
-        return []
-    # object with .data
-    rows = getattr(resp, "data", None)
-    if rows is not None:
-        return rows or []
-    # dict-like
-    try:
-        if isinstance(resp, dict):
-            return resp.get("data", []) or []
-        get = getattr(resp, "get", None)
-        if callable(get):
-            return resp.get("data", []) or []
-    except Exception:
-        pass
-    return []
-
-
 def _parse_iso_datetime(s: str) -> datetime:
     """Parse ISO-ish datetime strings robustly (handle trailing Z)."""
     if s is None:
@@ -2456,108 +3867,83 @@ def _parse_iso_datetime(s: str) -> datetime:
     return datetime.fromisoformat(s)
 
 
+def _parse_date_param(value: Optional[str], name: str):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be YYYY-MM-DD")
+
+
 # ---------- endpoint ----------
 @router.get("/transtracker/bar")
-async def get_transtracker_bar(group_by: str = Query("day", regex="^(day|week|month|year)$")):
+async def get_transtracker_bar(
+    group_by: str = Query("day", regex="^(day|week|month|year)$"),
+    product: Optional[str] = Query(None, description="Comma-separated products"),
+    date_from: Optional[str] = Query(None, description="Builds received on or after (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="Builds received on or before (YYYY-MM-DD)"),
+):
     """
     Returns:
       { "status": "success", "data": [ { "date": "<label>", "value": <int> }, ... ] }
-    On error returns HTTP 500 with a short, user-friendly message (no internal details).
+    Labels are YYYY-MM-DD, YYYY-Www (ISO week), YYYY-MM or YYYY. Values are
+    total open bugs read from the in-memory rollup, so the cost does not grow
+    with history. On error returns HTTP 500 with a short, user-friendly
+    message (no internal details).
     """
-    # 1) call supabase safely
+    start = _parse_date_param(date_from, "date_from")
+    end = _parse_date_param(date_to, "date_to")
+    products = [p.strip() for p in product.split(",") if p.strip()] if product else None
     try:
-        resp = supabase.table("transtrackers").select("buildreceiveddate, totalopenbugs").order("buildreceiveddate", desc=False).execute()
+        rollup = (await transtracker_indexes.get()).rollup
     except Exception:
         # log full exception but return safe message to client
-        logger.exception("Supabase query failed during execute()")
-        raise HTTPException(status_code=500, detail="Unable to fetch transtracker data")
-
-    # 2) guard against supabase returning an error object/shape
-    try:
-        err_obj = None
-        # some supabase clients return an object with `.error`
-        if hasattr(resp, "error"):
-            err_obj = getattr(resp, "error", None)
-        elif isinstance(resp, dict) and "error" in resp:
-            err_obj = resp.get("error")
-        if err_obj:
-            logger.error("Supabase returned an error object: %r", err_obj)
-            raise HTTPException(status_code=500, detail="Unable to fetch transtracker data")
-    except HTTPException:
-        # re-raise our safe HTTPException
-        raise
-    except Exception:
-        logger.exception("Unexpected supabase response shape")
+        logger.exception("Building the transtracker indexes failed")
         raise HTTPException(status_code=500, detail="Unable to fetch transtracker data")
-
-    # 3) extract rows safely
-    rows = _get_rows_from_resp(resp)
-    if not rows:
-        return {"status": "success", "data": []}
-
-    # 4) aggregate into buckets
-    agg: Dict[str, Tuple[int, datetime]] = {}
-
-    for r in rows:
-        # row may be dict-like or attribute object
-        if isinstance(r, dict):
-            raw_date = r.get("buildreceiveddate")
-            raw_val = r.get("totalopenbugs")
-        else:
-            raw_date = getattr(r, "buildreceiveddate", None)
-            raw_val = getattr(r, "totalopenbugs", None)
-
-        if not raw_date:
-            continue
-
-        try:
-            dt = raw_date if isinstance(raw_date, datetime) else _parse_iso_datetime(str(raw_date))
-        except Exception as ex:
-            logger.debug("Skipping row with bad date %r : %s", raw_date, ex)
-            continue
-
-        # safe numeric conversion
-        try:
-            val = int(float(raw_val)) if raw_val not in (None, "") else 0
-        except Exception:
-            val = 0
-
-        # key label and sort-date per group_by
-        if group_by == "month":
-            label = dt.strftime("%Y-%m")
-            sort_dt = datetime(dt.year, dt.month, 1)
-        elif group_by == "week":
-            iso = dt.isocalendar()  # (iso_year, iso_week, iso_weekday)
-            label = f"{iso[0]}-W{iso[1]:02d}"
-            # first day (Monday) of the ISO week for sorting
-            try:
-                sort_dt = datetime.fromisocalendar(iso[0], iso[1], 1)
-            except Exception:
-                # fallback: use dt itself
-                sort_dt = dt
-        elif group_by == "year":
-            label = str(dt.year)
-            sort_dt = datetime(dt.year, 1, 1)
-        else:  # day
-            label = dt.strftime("%Y-%m-%d")
-            sort_dt = datetime(dt.year, dt.month, dt.day)
-
-        if label in agg:
-            current_sum, existing_sort = agg[label]
-            agg[label] = (current_sum + val, min(existing_sort, sort_dt))
-        else:
-            agg[label] = (val, sort_dt)
-
-    # 5) prepare sorted result
-    sorted_items = sorted(agg.items(), key=lambda kv: kv[1][1])
-    result = [{"date": k, "value": int(v[0])} for k, v in sorted_items]
-
-    return {"status": "success", "data": result}
+    return {"status": "success", "data": rollup.series(group_by, products, start, end)}
 
 
 # include router under /api
 app.include_router(router, prefix="/api")
 
+@app.on_event("startup")
+async def _warm_bug_table():
+    # probe the bug table up front so the first request doesn't pay for it
+    try:
+        await bug_tables.get()
+    except Exception as e:
+        logger.warning("Bug table probe at startup failed: %s", e)
+
+
+@app.on_event("shutdown")
+async def _close_rest_client():
+    await rest_client.aclose()
+
+
+@app.get("/api/diagnostics")
+async def get_diagnostics():
+    """Runtime diagnostics for the data layer."""
+    return {
+        "status": "success",
+        "data": {
+            "bug_table": bug_tables.diagnostics(),
+            "http_pool": rest_client.stats(),
+            "blocking_pool": blocking_pool_stats(),
+            "bug_list_cache": bug_list_cache.stats(),
+            "bug_detail_cache": bug_detail_cache.stats(),
+            "bug_stats_cache": bug_stats_cache.stats(),
+            "counts_cache": counts_cache.stats(),
+            "dashboard_cache": dashboard_cache.stats(),
+            "transtracker_indexes": transtracker_indexes.stats(),
+            "transtracker_analytics": {
+                "columns": transtracker_columns_cache.stats(),
+                "results": transtracker_analytics_cache.stats(),
+            },
+            "bug_ids": bug_ids.stats(),
+        },
+    }
+
 # optional: root health check
 @app.get("/")
 async def root():
@@ -2608,7 +3994,7 @@ async def create_task(request: Request):
                 "task_note": note_val,
                 "created_at": now_iso
             }
-            resp1 = supabase.table("tasks").insert(base).execute()
+            resp1 = await _execute(supabase.table("tasks").insert(base))
             error = getattr(resp1, "error", None)
             if error:
                 print(f"[ERROR] Supabase insert error: {error}")
@@ -2617,7 +4003,7 @@ async def create_task(request: Request):
             inserted_rows = getattr(resp1, "data", []) or []
             if not inserted_rows:
                  # Fallback: if data is empty, maybe try to fetch it
-                 final = supabase.table("tasks").select("*").eq("id", new_id).execute()
+                 final = await _execute(supabase.table("tasks").select("*").eq("id", new_id))
                  inserted_rows = getattr(final, "data", []) or []
                  
             if not inserted_rows:
@@ -2661,6 +4047,696 @@ def delete_task_by_query(task_name: str = Query(...), task_status: Optional[str]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
  
+# ---------- EXPORT ----------
+
+EXPORT_PAGE_SIZE = max(1, int(os.getenv("EXPORT_PAGE_SIZE", "1000")))
+
+# Query param -> DB column for task / transtracker filters
+TASK_FILTER_COLUMNS = {
+    "status": "task_status",
+    "priority": "task_priority",
+    "assignee": "assigned_to",
+}
+
+TRANSTRACKER_FILTER_COLUMNS = {
+    "applicationtype": "applicationtype",
+    "product": "productsegregated",
+    "owner": "productowner",
+    "spoc": "spoc",
+}
+
+
+def _desc_keyset_filter(column: str, value: Any, id_column: str, id_value: Any) -> str:
+    """`or=` filter for the rows after (value, id_value) in `column.desc,id_column.desc` order."""
+    v, i = _postgrest_quote(value), _postgrest_quote(id_value)
+    return f"({column}.lt.{v},and({column}.eq.{v},{id_column}.lt.{i}))"
+
+
+class ExportSource(NamedTuple):
+    table: Optional[str]                                    # None: the resolved bug table
+    order: str
+    after: Callable[[Dict[str, Any]], Dict[str, str]]      # last row -> keyset params
+    filters: Dict[str, str]
+    date_column: Optional[str] = None
+
+
+EXPORT_SOURCES: Dict[str, ExportSource] = {
+    "bugs": ExportSource(
+        table=None,
+        order=BUG_LIST_ORDER,
+        after=lambda row: {"or": _bug_keyset_filter(row.get("Changed"), row.get("Bug ID"))},
+        filters=BUG_FILTER_COLUMNS,
+    ),
+    "tasks": ExportSource(
+        table="tasks",
+        order="created_at.desc,id.desc",
+        after=lambda row: {"or": _desc_keyset_filter("created_at", row.get("created_at"), "id", row.get("id"))},
+        filters=TASK_FILTER_COLUMNS,
+        date_column="created_at",
+    ),
+    "transtrackers": ExportSource(
+        table="transtrackers",
+        order="id.asc",
+        after=lambda row: {"id": f"gt.{row.get('id')}"},
+        filters=TRANSTRACKER_FILTER_COLUMNS,
+        date_column="buildreceiveddate",
+    ),
+}
+
+
+async def _export_page(source: ExportSource, params: Dict[str, str]):
+    if source.table is None:
+        resp = await _bug_table_request(
+            lambda name: _http_get(f"{SUPABASE_REST_URL}/{name}", headers=_supabase_headers(), params=params, timeout=30)
+        )
+    else:
+        resp = await _http_get(f"{SUPABASE_REST_URL}/{source.table}", headers=_supabase_headers(), params=params, timeout=30)
+    if not resp.is_success:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to read {source.table or bug_tables.current}: {resp.status_code} {resp.text}",
+        )
+    return resp.json() or []
+
+
+def _date_range_params(column: Optional[str], date_from: Optional[str], date_to: Optional[str]) -> Dict[str, str]:
+    """
+    Inclusive `and=` bounds on `column`; empty when neither bound is given. A
+    bare YYYY-MM-DD upper bound covers that whole day on timestamp columns.
+    """
+    bounds = []
+    if date_from:
+        bounds.append(f"{column}.gte.{_postgrest_quote(date_from)}")
+    if date_to:
+        try:
+            next_day = (datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+            bounds.append(f"{column}.lt.{next_day}")
+        except ValueError:
+            bounds.append(f"{column}.lte.{_postgrest_quote(date_to)}")
+    return {"and": f"({','.join(bounds)})"} if bounds else {}
+
+
+async def _export_pages(source: ExportSource, params: Dict[str, str], first_page: Optional[List[Dict[str, Any]]] = None):
+    """Yield successive non-empty pages of `source`, following its keyset cursor."""
+    page = await _export_page(source, params) if first_page is None else first_page
+    while page:
+        yield page
+        if len(page) < EXPORT_PAGE_SIZE:
+            return
+        page = await _export_page(source, {**params, **source.after(page[-1])})
+
+
+def _csv_text(rows: List[Dict[str, Any]], columns: List[str], header: bool) -> str:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=columns, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    for row in rows:
+        writer.writerow({k: json.dumps(v, default=str) if isinstance(v, (list, dict)) else v for k, v in row.items()})
+    return buf.getvalue()
+
+
+def _ndjson_text(rows: List[Dict[str, Any]]) -> str:
+    return "".join(json.dumps(row, default=str) + "\n" for row in rows)
+
+
+def _stream_error_text(format: str, error: Exception) -> str:
+    """
+    Last line of a stream that failed after its headers went out: an
+    {"error": ...} object for NDJSON, a "# error: ..." trailer for CSV.
+    Without it a truncated stream looks like a complete one.
+    """
+    message = getattr(error, "detail", None) or str(error) or type(error).__name__
+    if format == "ndjson":
+        return json.dumps({"error": str(message)}) + "\n"
+    return "# error: " + " ".join(str(message).split()) + "\n"
+
+
+@app.get("/api/export/{entity}")
+async def export_entity(
+    entity: str = Path(..., description="bugs, tasks or transtrackers"),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    status: Optional[str] = Query(None),
+    priority: Optional[str] = Query(None),
+    assignee: Optional[str] = Query(None),
+    product: Optional[str] = Query(None),
+    applicationtype: Optional[str] = Query(None),
+    owner: Optional[str] = Query(None),
+    spoc: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None, description="Inclusive lower bound on the entity's date column"),
+    date_to: Optional[str] = Query(None, description="Inclusive upper bound on the entity's date column"),
+    fields: Optional[str] = Query(None, description="bugs only: comma-separated bug fields"),
+    include: Optional[str] = Query(None, description='bugs only: e.g. "comments,attachments"'),
+):
+    """
+    Stream a whole table as CSV or NDJSON. Rows are read EXPORT_PAGE_SIZE at a
+    time with a keyset cursor and written out page by page, so memory stays
+    flat however large the table is. Filters match the list endpoints. If a
+    later page fails, the stream ends with an {"error": ...} line (NDJSON) or
+    a "# error: ..." line (CSV).
+    """
+    source = EXPORT_SOURCES.get(entity)
+    if source is None:
+        raise HTTPException(status_code=404, detail=f"Unknown export entity: {entity}. Valid: {', '.join(EXPORT_SOURCES)}")
+
+    given = {
+        "status": status, "priority": priority, "assignee": assignee, "product": product,
+        "applicationtype": applicationtype, "owner": owner, "spoc": spoc,
+    }
+    unsupported = [k for k, v in given.items() if v not in (None, "") and k not in source.filters]
+    if (date_from or date_to) and not source.date_column:
+        unsupported.append("date_from/date_to")
+    if unsupported:
+        raise HTTPException(status_code=400, detail=f"Filters not supported for {entity}: {', '.join(unsupported)}")
+
+    params: Dict[str, str] = {
+        "order": source.order,
+        "limit": str(EXPORT_PAGE_SIZE),
+        **_filter_params(given, source.filters),
+        **_date_range_params(source.date_column, date_from, date_to),
+    }
+
+    field_list: Optional[List[str]] = None
+    if source.table is None:
+        field_list = _bug_list_fields(_parse_bug_fields(fields), _parse_bug_includes(include))
+        params["select"] = _bug_select(field_list)
+
+    # the first page is read up front so upstream errors still get a proper status
+    first_page = await _export_page(source, params)
+
+    async def body():
+        columns: Optional[List[str]] = None
+        try:
+            async for page in _export_pages(source, params, first_page):
+                rows = normalize_bug_rows(page, field_list) if field_list else page
+                if format == "ndjson":
+                    yield _ndjson_text(rows)
+                    continue
+                header = columns is None
+                if header:
+                    columns = list(field_list or rows[0].keys())
+                yield _csv_text(rows, columns, header)
+        except Exception as e:
+            # headers are already sent; end the stream with an error line
+            logger.error("Export of %s aborted: %s", entity, e)
+            yield _stream_error_text(format, e)
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{entity}-{stamp}.{format}"'},
+    )
+
+
+# ---------- DASHBOARD SUMMARY ----------
+
+# Every dashboard aggregate in one response. The sections are computed
+# concurrently, each within DASHBOARD_SECTION_TIMEOUT, and the payload is
+# memoized per filter combination: fresh for DASHBOARD_CACHE_TTL seconds, then
+# served stale for up to DASHBOARD_STALE_TTL more while it refreshes.
+DASHBOARD_SECTION_TIMEOUT = float(os.getenv("DASHBOARD_SECTION_TIMEOUT", "10"))
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "60"))
+DASHBOARD_STALE_TTL = float(os.getenv("DASHBOARD_STALE_TTL", "300"))
+dashboard_cache = StaleWhileRevalidateCache(ttl=DASHBOARD_CACHE_TTL, stale_ttl=DASHBOARD_STALE_TTL, max_entries=64)
+
+DASHBOARD_BUG_FIELDS = ["Bug ID", "Changed", "Assignee", "Product", "Component"]
+DASHBOARD_BUG_STATUS_ORDER = ("Open", "In Progress", "Resolved")
+DASHBOARD_TRANSTRACKER_SELECT = (
+    "id,buildreceiveddate,buildreceivedtime,testreportsentdate,totalopenbugs,"
+    "productsegregated,projects_products,applicationtype,signoffstatus"
+)
+
+
+def _named_counts(counts: Dict[str, int], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """[{"name", "value"}], largest first."""
+    ranked = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)
+    return [{"name": k, "value": v} for k, v in ranked[:limit]]
+
+
+def _dated_counts(counts: Dict[str, int]) -> List[Dict[str, Any]]:
+    return [{"date": k, "value": counts[k]} for k in sorted(counts)]
+
+
+def _bump(counts: Dict[str, int], key: str, n: int = 1) -> None:
+    counts[key] = counts.get(key, 0) + n
+
+
+def _dashboard_bug_status(raw: Any) -> str:
+    s = str(raw or "").strip().lower()
+    if not s or any(w in s for w in ("new", "open", "reopen")):
+        return "Open"
+    if any(w in s for w in ("in progress", "dev in progress", "assigned")):
+        return "In Progress"
+    if any(w in s for w in ("fixed", "resolved", "verified", "qa")):
+        return "Resolved"
+    return "Open"
+
+
+_SIGNOFF_NO_GO = re.compile(r"\b(no go|nogo|not|rejected)\b")
+_SIGNOFF_CONDITIONAL = re.compile(r"\bconditional")
+_SIGNOFF_APPROVED = re.compile(r"\b(go|signed off|signoff|approved)\b")
+
+
+def _dashboard_signoff(raw: Any) -> str:
+    """
+    Bucket a free-text sign-off status. Negatives win over "conditional",
+    which wins over approvals, so "NO-GO", "Not signed off" and
+    "Conditional Go" never count as signed off; "go" only matches as a word.
+    """
+    s = " ".join(re.sub(r"[-_]", " ", str(raw or "")).lower().split())
+    if not s:
+        return "Pending"
+    if _SIGNOFF_NO_GO.search(s):
+        return "No Go"
+    if _SIGNOFF_CONDITIONAL.search(s):
+        return "Conditional Go"
+    if _SIGNOFF_APPROVED.search(s):
+        return "Signed Off"
+    return "Pending"
+
+
+def _dashboard_date(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return _parse_iso_datetime(str(value))
+    except ValueError:
+        return None
+
+
+def _dashboard_bucket(dt: datetime, group_by: str) -> str:
+    """Chart key: the day, the Monday of its week, or the 1st of its month."""
+    if group_by == "week":
+        dt = dt - timedelta(days=dt.weekday())
+    elif group_by == "month":
+        dt = dt.replace(day=1)
+    return dt.strftime("%Y-%m-%d")
+
+
+def _user_display_name(user: Dict[str, Any]) -> str:
+    email = user.get("email") or ""
+    return user.get("full_name") or (email.split("@")[0] if email else "") or str(user.get("id"))
+
+
+async def _dashboard_users() -> Dict[str, Any]:
+    resp = await _http_get(
+        f"{SUPABASE_REST_URL}/users",
+        headers=_supabase_headers(),
+        params={"select": "id,full_name,email,role"},
+        timeout=15,
+    )
+    if not resp.is_success:
+        raise HTTPException(status_code=500, detail=f"Failed to read users: {resp.status_code} {resp.text}")
+    names: Dict[str, str] = {}
+    by_role: Dict[str, int] = {}
+    for user in resp.json() or []:
+        if user.get("id"):
+            names[str(user["id"])] = _user_display_name(user)
+        _bump(by_role, str(user.get("role") or "").strip() or "Unknown")
+    return {"names": names, "by_role": by_role}
+
+
+async def _dashboard_bugs() -> Dict[str, Any]:
+    """
+    Assignee and project tallies over the whole bug table, grouped in Postgres
+    by the bug_assignee_project_counts RPC (backend/sql/bug_stats.sql). Until
+    it is installed, falls back to reading the table page by page.
+    """
+    by_assignee: Dict[str, int] = {}
+    by_project: Dict[str, int] = {}
+    resp = await _http_post(
+        f"{SUPABASE_REST_URL}/rpc/bug_assignee_project_counts",
+        headers=_supabase_headers(),
+        json={"p_table": await bug_tables.get()},
+        timeout=DASHBOARD_SECTION_TIMEOUT,
+    )
+    if resp.is_success:
+        for group in resp.json() or []:
+            count = int(group.get("count") or 0)
+            assignee = str(group.get("assignee") or "").strip()
+            if assignee:
+                _bump(by_assignee, assignee, count)
+            _bump(by_project, str(group.get("project") or "").strip() or "Unknown", count)
+        return {"by_assignee": by_assignee, "by_project": by_project}
+    if resp.status_code != 404:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to aggregate bugs: {resp.status_code} {resp.text}",
+        )
+
+    logger.warning("RPC bug_assignee_project_counts is missing; apply backend/sql/bug_stats.sql")
+    source = EXPORT_SOURCES["bugs"]
+    params = {"order": source.order, "limit": str(EXPORT_PAGE_SIZE), "select": _bug_select(DASHBOARD_BUG_FIELDS)}
+    async for page in _export_pages(source, params):
+        for row in normalize_bug_rows(page, DASHBOARD_BUG_FIELDS):
+            assignee = str(row.get("Assignee") or "").strip()
+            if assignee:
+                _bump(by_assignee, assignee)
+            _bump(by_project, str(row.get("Product") or row.get("Component") or "").strip() or "Unknown")
+    return {"by_assignee": by_assignee, "by_project": by_project}
+
+
+async def _dashboard_tasks(date_from: Optional[str], date_to: Optional[str]) -> Dict[str, Any]:
+    source = EXPORT_SOURCES["tasks"]
+    params = {
+        "order": source.order,
+        "limit": str(EXPORT_PAGE_SIZE),
+        "select": "id,task_status,assigned_to,created_at",
+        **_date_range_params(source.date_column, date_from, date_to),
+    }
+    by_status: Dict[str, int] = {}
+    by_assignee: Dict[str, int] = {}
+    by_date: Dict[str, int] = {}
+    async for page in _export_pages(source, params):
+        for task in page:
+            status = str(task.get("task_status") or "todo")
+            _bump(by_status, status[:1].upper() + status[1:])
+            _bump(by_assignee, str(task.get("assigned_to") or "Unassigned"))
+            if task.get("created_at"):
+                _bump(by_date, str(task["created_at"])[:10])
+    total, _ = await _count_table("tasks")
+    return {"total": total, "by_status": by_status, "by_assignee": by_assignee, "by_date": by_date}
+
+
+async def _dashboard_transtracker(filters: Dict[str, Any], date_from: Optional[str], date_to: Optional[str], group_by: str) -> Dict[str, Any]:
+    source = EXPORT_SOURCES["transtrackers"]
+    params = {
+        "order": source.order,
+        "limit": str(EXPORT_PAGE_SIZE),
+        "select": DASHBOARD_TRANSTRACKER_SELECT,
+        **_filter_params(filters, source.filters),
+        **_date_range_params(source.date_column, date_from, date_to),
+    }
+    total = 0
+    open_by_date: Dict[str, int] = {}
+    open_by_product: Dict[str, int] = {}
+    application_types: Dict[str, int] = {}
+    signoff: Dict[str, int] = {}
+    report_days = 0.0
+    reported = 0
+    async for page in _export_pages(source, params):
+        for row in page:
+            total += 1
+            try:
+                open_bugs = int(float(row.get("totalopenbugs") or 0))
+            except (TypeError, ValueError):
+                open_bugs = 0
+            received = _dashboard_date(row.get("buildreceiveddate")) or _dashboard_date(row.get("buildreceivedtime"))
+            reported_at = _dashboard_date(row.get("testreportsentdate"))
+            dt = received or reported_at
+            if dt:
+                _bump(open_by_date, _dashboard_bucket(dt, group_by), open_bugs)
+            _bump(open_by_product, str(row.get("productsegregated") or row.get("projects_products") or "Unknown"), open_bugs)
+            _bump(application_types, str(row.get("applicationtype") or "Unknown"))
+            _bump(signoff, _dashboard_signoff(row.get("signoffstatus")))
+            if received and reported_at:
+                try:
+                    days = (reported_at - received).total_seconds() / 86400
+                except TypeError:
+                    # one side is timezone-aware, the other naive
+                    days = (reported_at.replace(tzinfo=None) - received.replace(tzinfo=None)).total_seconds() / 86400
+                if days >= 0:
+                    report_days += days
+                    reported += 1
+    return {
+        "total": total,
+        "open_by_date": _dated_counts(open_by_date),
+        "open_by_product": _named_counts(open_by_product),
+        "application_types": _named_counts(application_types),
+        "signoff": [{"name": k, "value": v} for k, v in signoff.items()],
+        "build_to_report": {
+            "avg_days": round(report_days / reported, 1) if reported else 0,
+            "completed": reported,
+            "total": total,
+            "completion_rate": round(reported * 100 / total) if total else 0,
+        },
+    }
+
+
+async def _dashboard_section(name: str, pending: Awaitable[Any]) -> Any:
+    """Await one section within DASHBOARD_SECTION_TIMEOUT; None when it failed."""
+    try:
+        return await asyncio.wait_for(pending, DASHBOARD_SECTION_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Dashboard section %s timed out after %ss", name, DASHBOARD_SECTION_TIMEOUT)
+    except Exception as e:
+        logger.warning("Dashboard section %s failed: %s", name, e)
+    return None
+
+
+async def _load_dashboard_summary(
+    filters: Dict[str, Any],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    group_by: str,
+    task_date_from: Optional[str],
+    task_date_to: Optional[str],
+) -> Dict[str, Any]:
+    pending = {
+        "counts": counts_cache.get(TABLE_COUNT_METHOD, lambda: _load_counts(TABLE_COUNT_METHOD)),
+        "bug_stats": _bug_stats(),
+        "bugs": _dashboard_bugs(),
+        "users": _dashboard_users(),
+        "tasks": _dashboard_tasks(task_date_from, task_date_to),
+        "transtracker": _dashboard_transtracker(filters, date_from, date_to, group_by),
+        "filters": _transtracker_filter_options(),
+    }
+    results = dict(zip(pending, await asyncio.gather(*(
+        _dashboard_section(name, coro) for name, coro in pending.items()
+    ))))
+    errors = [name for name, value in results.items() if value is None]
+
+    # assignees are stored as user ids; show names where we know them
+    names = (results["users"] or {}).get("names", {})
+
+    def by_name(counts: Dict[str, int]) -> Dict[str, int]:
+        named: Dict[str, int] = {}
+        for key, n in counts.items():
+            _bump(named, names.get(key) or names.get(key.lower()) or key, n)
+        return named
+
+    bug_stats, bugs, tasks = results["bug_stats"], results["bugs"], results["tasks"]
+    bug_status: Dict[str, int] = {}
+    for status, n in (bug_stats or {}).get("by_status", {}).items():
+        _bump(bug_status, _dashboard_bug_status(status), n)
+
+    return {
+        "counts": results["counts"],
+        "priority": {k: bug_stats[k] for k in ("high", "medium", "low", "total")} if bug_stats else None,
+        "bugs": {
+            "by_status": sorted(
+                _named_counts(bug_status),
+                key=lambda d: DASHBOARD_BUG_STATUS_ORDER.index(d["name"]),
+            ),
+            "by_assignee": _named_counts(by_name(bugs["by_assignee"]), 5) if bugs else [],
+            "by_project": _named_counts(bugs["by_project"], 6) if bugs else [],
+        },
+        "users": {"by_role": _named_counts(results["users"]["by_role"])} if results["users"] else None,
+        "tasks": {
+            "total": tasks["total"],
+            "by_status": _named_counts(tasks["by_status"]),
+            "by_assignee": _named_counts(by_name(tasks["by_assignee"]), 5),
+            "by_date": _dated_counts(tasks["by_date"]),
+        } if tasks else None,
+        "transtracker": results["transtracker"],
+        "filters": results["filters"],
+        "errors": errors,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+@app.get("/api/dashboard/summary")
+async def get_dashboard_summary(
+    product: Optional[str] = Query(None),
+    applicationtype: Optional[str] = Query(None),
+    owner: Optional[str] = Query(None),
+    spoc: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None, description="Transtracker build received on or after (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="Transtracker build received on or before (YYYY-MM-DD)"),
+    group_by: str = Query("day", pattern="^(day|week|month)$"),
+    task_date_from: Optional[str] = Query(None, description="Tasks created on or after (YYYY-MM-DD)"),
+    task_date_to: Optional[str] = Query(None, description="Tasks created on or before (YYYY-MM-DD)"),
+):
+    """
+    All dashboard aggregates in one payload: KPI counts, bug priority/status/
+    assignee/project breakdowns, users by role, task breakdowns, the filtered
+    transtracker charts and the transtracker filter options. Sections that
+    fail are null and listed in `errors`; such a payload is not cached.
+    """
+    filters = {"product": product, "applicationtype": applicationtype, "owner": owner, "spoc": spoc}
+    key = (product, applicationtype, owner, spoc, date_from, date_to, group_by, task_date_from, task_date_to)
+    try:
+        summary = await dashboard_cache.get(
+            key,
+            lambda: _load_dashboard_summary(filters, date_from, date_to, group_by, task_date_from, task_date_to),
+        )
+        if summary["errors"]:
+            dashboard_cache.invalidate(key)
+        return {"status": "success", "data": summary}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ---------- TRANSTRACKER ANALYTICS ----------
+
+# Release-quality KPIs over the whole transtracker table. The needed columns
+# are read once into a ColumnFrame (kept for TRANSTRACKER_ANALYTICS_TTL
+# seconds); each filter combination is then a handful of masks and bincounts,
+# and its result is memoized the same way. API writes drop both.
+TRANSTRACKER_ANALYTICS_TTL = float(os.getenv("TRANSTRACKER_ANALYTICS_TTL", "300"))
+TRANSTRACKER_ANALYTICS_STALE_TTL = float(os.getenv("TRANSTRACKER_ANALYTICS_STALE_TTL", "600"))
+transtracker_columns_cache = StaleWhileRevalidateCache(
+    ttl=TRANSTRACKER_ANALYTICS_TTL, stale_ttl=TRANSTRACKER_ANALYTICS_STALE_TTL, max_entries=1
+)
+transtracker_analytics_cache = StaleWhileRevalidateCache(
+    ttl=TRANSTRACKER_ANALYTICS_TTL, stale_ttl=TRANSTRACKER_ANALYTICS_STALE_TTL, max_entries=128
+)
+
+TRANSTRACKER_SEVERITIES = ("blocker", "high", "med", "low")
+TRANSTRACKER_ANALYTICS_SELECT = ",".join((
+    "id", "productsegregated", "projects_products", "applicationtype", "productowner", "spoc",
+    "totaltTestCases", "automatedTestCases", "signoffstatus", *TRANSTRACKER_SEVERITIES,
+    *transtracker_fields.SOURCE_FIELDS, "timesaved", "y_q",
+))
+TRANSTRACKER_ANALYTICS_SUMS = ("totaltTestCases", "automatedTestCases", "timesaved", *TRANSTRACKER_SEVERITIES, "signed_off")
+# response key -> frame column the rows are grouped by
+TRANSTRACKER_ANALYTICS_GROUPS = {"by_product": "product", "by_owner": "owner", "by_quarter": "quarter"}
+# filter param -> frame column; product matches the derived column the
+# by_product groups show (productsegregated, else projects_products)
+TRANSTRACKER_ANALYTICS_FILTERS = {**TRANSTRACKER_FILTER_COLUMNS, "product": "product"}
+
+
+def _invalidate_transtracker_analytics() -> None:
+    transtracker_columns_cache.invalidate()
+    transtracker_analytics_cache.invalidate()
+
+
+async def _load_transtracker_columns() -> ColumnFrame:
+    """Every transtracker row as columns; derived fields are recomputed on the way in."""
+    source = EXPORT_SOURCES["transtrackers"]
+    params = {"order": source.order, "limit": str(EXPORT_PAGE_SIZE), "select": TRANSTRACKER_ANALYTICS_SELECT}
+    rows: List[Dict[str, Any]] = []
+    async for page in _export_pages(source, params):
+        for row in transtracker_fields.derive_fields(page):
+            row["product"] = _transtracker_product(row)
+            row["owner"] = row.get("productowner")
+            row["quarter"] = row.get("y_q")
+            rows.append(row)
+    frame = ColumnFrame.from_rows(
+        rows,
+        numeric=("totaltTestCases", "automatedTestCases", "timesaved", *TRANSTRACKER_SEVERITIES),
+        categorical=tuple(dict.fromkeys((*TRANSTRACKER_ANALYTICS_FILTERS.values(), "owner", "quarter"))),
+        blank="Unknown",
+    )
+    frame.columns["received"] = text_column([str(row.get("buildreceiveddate") or "")[:10] for row in rows])
+    frame.columns["signed_off"] = np.array(
+        [_dashboard_signoff(row.get("signoffstatus")) == "Signed Off" for row in rows], dtype=float
+    )
+    return frame
+
+
+def _quality_kpis(names: np.ndarray, rows: np.ndarray, sums: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """One KPI dict per group; every ratio is computed for all groups at once."""
+    def percent(part: np.ndarray, whole: np.ndarray, digits: int = 1) -> List[Optional[float]]:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = np.round(part / whole * 100, digits)
+        return [float(v) if w > 0 else None for v, w in zip(values, whole)]
+
+    severity_total = sum(sums[s] for s in TRANSTRACKER_SEVERITIES)
+    coverage = percent(sums["automatedTestCases"], sums["totaltTestCases"])
+    signoff_rate = percent(sums["signed_off"], rows.astype(float))
+    mix = {s: percent(sums[s], severity_total) for s in TRANSTRACKER_SEVERITIES}
+    hours_saved = np.round(sums["timesaved"], 2)
+    return [
+        {
+            "name": str(names[i]),
+            "rows": int(rows[i]),
+            "total_test_cases": int(sums["totaltTestCases"][i]),
+            "automated_test_cases": int(sums["automatedTestCases"][i]),
+            "automation_coverage": coverage[i],
+            "hours_saved": float(hours_saved[i]),
+            "open_bugs": {s: int(sums[s][i]) for s in TRANSTRACKER_SEVERITIES},
+            "severity_mix": {s: mix[s][i] for s in TRANSTRACKER_SEVERITIES},
+            "signed_off": int(sums["signed_off"][i]),
+            "signoff_rate": signoff_rate[i],
+        }
+        for i in range(len(names))
+    ]
+
+
+def _transtracker_analytics(
+    frame: ColumnFrame,
+    filters: Dict[str, Any],
+    date_from: Optional[str],
+    date_to: Optional[str],
+) -> Dict[str, Any]:
+    where = frame.mask()
+    for key, column in TRANSTRACKER_ANALYTICS_FILTERS.items():
+        values = [v.strip() for v in str(filters.get(key) or "").split(",") if v.strip()]
+        if values:
+            where &= frame.isin(column, values)
+    # ISO dates compare correctly as text; rows without a date drop out of a range
+    received = frame["received"]
+    if date_from:
+        where &= received >= date_from[:10]
+    if date_to:
+        where &= received <= date_to[:10]
+
+    result: Dict[str, Any] = {}
+    for name, key in TRANSTRACKER_ANALYTICS_GROUPS.items():
+        groups, rows, sums = frame.group_sums(key, TRANSTRACKER_ANALYTICS_SUMS, where)
+        order = np.argsort(groups) if key == "quarter" else np.argsort(-rows, kind="stable")
+        result[name] = _quality_kpis(groups[order], rows[order], {k: v[order] for k, v in sums.items()})
+    totals = _quality_kpis(
+        np.array(["All"]),
+        np.array([int(where.sum())]),
+        {k: np.array([np.nansum(frame[k][where])]) for k in TRANSTRACKER_ANALYTICS_SUMS},
+    )
+    return {"totals": totals[0], **result}
+
+
+async def _load_transtracker_analytics(filters: Dict[str, Any], date_from: Optional[str], date_to: Optional[str]) -> Dict[str, Any]:
+    frame = await transtracker_columns_cache.get("all", _load_transtracker_columns)
+    started = time.perf_counter()
+    data = await run_blocking(_transtracker_analytics, frame, filters, date_from, date_to)
+    data["compute_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    data["generated_at"] = datetime.now(timezone.utc).isoformat()
+    return data
+
+
+@app.get("/api/transtracker/analytics")
+async def get_transtracker_analytics(
+    product: Optional[str] = Query(None),
+    applicationtype: Optional[str] = Query(None),
+    owner: Optional[str] = Query(None),
+    spoc: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None, description="Builds received on or after (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="Builds received on or before (YYYY-MM-DD)"),
+):
+    """
+    Release-quality KPIs for the filtered transtrackers: automation coverage
+    (automated / total test cases, %), hours saved, open-bug severity mix
+    (blocker/high/med/low counts and shares) and sign-off rate. Returned for
+    all matching rows (`totals`) and per product, owner and quarter.
+    Filters accept a single value or a comma-separated list.
+    """
+    filters = {"product": product, "applicationtype": applicationtype, "owner": owner, "spoc": spoc}
+    key = (product, applicationtype, owner, spoc, date_from, date_to)
+    try:
+        data = await transtracker_analytics_cache.get(
+            key, lambda: _load_transtracker_analytics(filters, date_from, date_to)
+        )
+        return {"status": "success", "data": data}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
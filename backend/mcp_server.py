@@ -6,6 +6,11 @@ from backend.main import (
     _select_bugs_with_fallback,
     _insert_bug_with_fallback,
     _get_bug_by_id,
+    _insert_bugs_bulk,
+    _update_bugs_bulk,
+    BUG_BULK_MAX_ITEMS,
+    get_bug_changes,
+    bug_ids,
     _select_tasks_with_fallback,
     _get_task_by_id,
     _insert_task_with_fallback,
@@ -19,12 +24,26 @@ mcp = FastMCP("Zentro")
 # ---------- BUG TOOLS ----------
 
 @mcp.tool()
-def list_bugs() -> str:
+async def list_bugs(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    assignee: Optional[str] = None,
+    product: Optional[str] = None,
+) -> str:
     """
-    List all bugs currently in the system.
-    Returns a JSON-like string of the list of bugs (brief info).
+    List one page of bugs, newest first.
+    Returns a JSON-like string with the bugs (brief info) and `next_cursor`;
+    pass `next_cursor` back as `cursor` to get the following page.
     """
-    result = _select_bugs_with_fallback()
+    filters = {"status": status, "priority": priority, "assignee": assignee, "product": product}
+    result = await _select_bugs_with_fallback(
+        limit=max(1, min(limit, 500)),
+        cursor=cursor,
+        filters=filters,
+        fields=["Summary", "Priority", "Status", "Assignee"],
+    )
     bugs = result.get("data", [])
     brief = []
     for b in bugs:
@@ -35,45 +54,68 @@ def list_bugs() -> str:
             "Status": b.get("Status"),
             "Assignee": b.get("Assignee"),
         })
-    return str(brief)
+    return str({"bugs": brief, "next_cursor": result.get("next_cursor")})
+
+
+@mcp.tool()
+async def list_bug_changes(since: Optional[str] = None, limit: int = 200) -> str:
+    """
+    Bugs created or changed since a watermark (brief info), plus deleted bug IDs.
+    Pass the returned `watermark` back as `since` to get only newer changes;
+    omit `since` for a full initial sync. Keep calling while `has_more` is true.
+    """
+    try:
+        result = await get_bug_changes(
+            since=since,
+            limit=max(1, min(limit, 2000)),
+            fields="Summary,Priority,Status,Assignee",
+            include=None,
+        )
+    except Exception as e:
+        return f"Error fetching bug changes: {getattr(e, 'detail', None) or str(e)}"
+    return str({
+        "bugs": result.get("data", []),
+        "deleted": result.get("deleted", []),
+        "watermark": result.get("watermark"),
+        "has_more": result.get("has_more"),
+    })
 
 
 @mcp.tool()
-def get_bug_details(bug_id: str) -> str:
+async def get_bug_details(bug_id: str) -> str:
     """
     Get detailed information about a specific bug by its ID (e.g. 'BUG-001' or '123').
     Returns a JSON-like string of the bug details.
     """
-    bug = _get_bug_by_id(bug_id)
+    bug = await _get_bug_by_id(bug_id)
     if not bug:
         return f"Bug with ID {bug_id} not found."
     return str(bug)
 
 
 @mcp.tool()
-def create_bug(
-    bug_id: str,
+async def create_bug(
     summary: str,
     description: str,
     priority: str = "Medium",
     defect_type: str = "Functional",
     product: str = "",
     assignee: str = "",
+    bug_id: str = "",
 ) -> str:
     """
     Create a new bug report.
 
     Args:
-        bug_id: Unique identifier for the bug (e.g. 'BUG-100')
         summary: Short title of the bug
         description: Detailed explanation of the bug
         priority: Priority of the bug (e.g. High, Medium, Low)
         defect_type: Type of defect (e.g. Functional)
         product: Product/module name
         assignee: Person responsible for the bug
+        bug_id: Optional explicit ID outside the server's "BUG-<n>" sequence
+                (e.g. 'LEGACY-17'); by default the next ID from the sequence is used
     """
-    if not bug_id or not bug_id.strip():
-        return "Error: Bug ID is required."
 
     payload = {
         "Bug ID": bug_id,
@@ -86,6 +128,11 @@ def create_bug(
     }
 
     try:
+        if not bug_id or not bug_id.strip():
+            payload["Bug ID"] = await bug_ids.next_id()
+        elif bug_ids.owns(bug_id):
+            return f"Error creating bug: {bug_id} is reserved for the Bug ID sequence; leave bug_id empty."
+
         # Minimal defaults similar to main.py logic
         defaults = {
             "Status": "OPEN",
@@ -99,12 +146,41 @@ def create_bug(
         for k, v in defaults.items():
             payload.setdefault(k, v)
 
-        result = _insert_bug_with_fallback(payload)
+        result = await _insert_bug_with_fallback(payload)
         return str(result)
     except Exception as e:
         return f"Error creating bug: {str(e)}"
 
 
+@mcp.tool()
+async def bulk_bugs(bugs: List[Dict[str, Any]], mode: str = "create") -> str:
+    """
+    Create or update many bugs in one call (chunked on the server).
+
+    Args:
+        bugs: Bug objects using the DB column names, e.g.
+              {"Bug ID": "BUG-100", "Summary": "...", "Priority": "High"}.
+              Every item needs "Bug ID".
+        mode: "create" to insert new bugs (create_bug defaults apply) or
+              "update" to change the given fields on existing bugs.
+    Returns a JSON-like string with one result per item.
+    """
+    if mode not in ("create", "update"):
+        return 'Error: mode must be "create" or "update".'
+    if not bugs:
+        return "Error: no bugs given."
+    if len(bugs) > BUG_BULK_MAX_ITEMS:
+        return f"Error: at most {BUG_BULK_MAX_ITEMS} bugs per call."
+    try:
+        if mode == "create":
+            result = await _insert_bugs_bulk(bugs)
+        else:
+            result = await _update_bugs_bulk(bugs)
+        return str(result)
+    except Exception as e:
+        return f"Error in bulk {mode}: {str(e)}"
+
+
 # ---------- TASK TOOLS ----------
 
 @mcp.tool()
@@ -0,0 +1,43 @@
+"""Bounded thread pool for the blocking calls left in async handlers."""
+import os
+import functools
+from typing import Any, Callable, Optional, TypeVar
+
+import anyio
+import anyio.to_thread
+
+T = TypeVar("T")
+
+try:
+    BLOCKING_POOL_SIZE = max(1, int(os.getenv("BLOCKING_POOL_SIZE", "16")))
+except ValueError:
+    BLOCKING_POOL_SIZE = 16
+
+_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+def _get_limiter() -> anyio.CapacityLimiter:
+    # created lazily: the limiter binds to the running event loop backend
+    global _limiter
+    if _limiter is None:
+        _limiter = anyio.CapacityLimiter(BLOCKING_POOL_SIZE)
+    return _limiter
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run `fn(*args, **kwargs)` in the bounded worker pool and await the result."""
+    return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs), limiter=_get_limiter())
+
+
+async def execute(query: Any) -> Any:
+    """Await a supabase-py query builder's blocking `.execute()` off the event loop."""
+    return await run_blocking(query.execute)
+
+
+def stats() -> dict:
+    limiter = _limiter
+    return {
+        "size": BLOCKING_POOL_SIZE,
+        "busy": limiter.borrowed_tokens if limiter else 0,
+        "waiting": limiter.statistics().tasks_waiting if limiter else 0,
+    }
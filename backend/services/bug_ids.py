@@ -0,0 +1,76 @@
+"""Block-allocated Bug ID sequence ("BUG-001", "BUG-002", ...)."""
+import os
+import re
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+try:
+    BUG_ID_BLOCK_SIZE = max(1, int(os.getenv("BUG_ID_BLOCK_SIZE", "50")))
+except ValueError:
+    BUG_ID_BLOCK_SIZE = 50
+
+
+class BugIdAllocator:
+    """
+    Hands out Bug IDs from blocks reserved in the database.
+
+    `reserve(count)` must atomically claim `count` numbers and return the
+    first one (the reserve_bug_ids RPC in backend/sql/bug_ids.sql). Numbers are
+    served from memory until the block runs out, so most allocations cost no
+    round trip; workers never share a block, so IDs never collide.
+    """
+
+    def __init__(
+        self,
+        reserve: Callable[[int], Awaitable[int]],
+        block_size: int = BUG_ID_BLOCK_SIZE,
+        prefix: str = "BUG-",
+        width: int = 3,
+    ):
+        self._reserve = reserve
+        self.block_size = block_size
+        self.prefix = prefix
+        self.width = width
+        self._next = 0
+        self._end = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self.allocated = 0
+        self.reservations = 0
+
+    def format(self, number: int) -> str:
+        return f"{self.prefix}{number:0{self.width}d}"
+
+    def owns(self, bug_id: str) -> bool:
+        """True for IDs in this sequence's format, which only the allocator may hand out."""
+        return re.fullmatch(rf"{re.escape(self.prefix)}\d+", bug_id.strip()) is not None
+
+    async def next_ids(self, count: int) -> List[str]:
+        if count <= 0:
+            return []
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            numbers: List[int] = []
+            while len(numbers) < count:
+                if self._next >= self._end:
+                    # a large request reserves everything it needs in one go
+                    size = max(self.block_size, count - len(numbers))
+                    first = int(await self._reserve(size))
+                    self._next, self._end = first, first + size
+                    self.reservations += 1
+                take = min(count - len(numbers), self._end - self._next)
+                numbers.extend(range(self._next, self._next + take))
+                self._next += take
+            self.allocated += count
+        return [self.format(n) for n in numbers]
+
+    async def next_id(self) -> str:
+        return (await self.next_ids(1))[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "block_size": self.block_size,
+            "remaining_in_block": max(0, self._end - self._next),
+            "allocated": self.allocated,
+            "reservations": self.reservations,
+        }
@@ -0,0 +1,216 @@
+"""In-process caches shared by the API endpoints."""
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Small thread-safe cache whose entries expire `ttl` seconds after being set.
+    The oldest entry is evicted once `max_entries` is reached.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING or entry[0] <= time.monotonic():
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable = _MISSING) -> None:
+        """Drop one key, or everything when called without a key."""
+        with self._lock:
+            self.invalidations += 1
+            if key is _MISSING:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "ttl_seconds": self.ttl,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "invalidations": self.invalidations,
+            }
+
+
+class LRUCache:
+    """
+    Small thread-safe least-recently-used cache without expiry; entries live
+    until evicted or explicitly invalidated.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable = _MISSING) -> None:
+        """Drop one key, or everything when called without a key."""
+        with self._lock:
+            self.invalidations += 1
+            if key is _MISSING:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "max_entries": self.max_entries,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
+class StaleWhileRevalidateCache:
+    """
+    Async memo for expensive loaders. An entry is served as-is for `ttl`
+    seconds; for `stale_ttl` seconds after that it is still served while one
+    background task reloads it. Missing or older entries are loaded inline,
+    and concurrent callers for the same key share that single load.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, max_entries: int = 64):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.invalidations = 0
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+        age = time.monotonic() - entry[0] if entry is not _MISSING else None
+        if age is not None and age < self.ttl:
+            self.hits += 1
+            return entry[1]
+        if age is not None and age < self.ttl + self.stale_ttl:
+            self.stale_hits += 1
+            self._load(key, loader)
+            return entry[1]
+        self.misses += 1
+        return await asyncio.shield(self._load(key, loader))
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Last stored value for `key` regardless of age, without counting a lookup."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, loader, self._generation))
+            # background refreshes nobody awaits must not log "never retrieved"
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._loading[key] = task
+        return task
+
+    async def _run(self, key: Hashable, loader: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        self.refreshes += 1
+        try:
+            value = await loader()
+        except Exception:
+            self.refresh_failures += 1
+            raise
+        finally:
+            self._loading.pop(key, None)
+        with self._lock:
+            # a load that started before invalidate() may predate the write
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key: Hashable = _MISSING) -> None:
+        """Drop one key, or everything when called without a key."""
+        with self._lock:
+            self.invalidations += 1
+            if key is _MISSING:
+                self._entries.clear()
+                self._generation += 1
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "ttl_seconds": self.ttl,
+                "stale_ttl_seconds": self.stale_ttl,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None,
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+                "in_flight": len(self._loading),
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,99 @@
+"""Rows held as one NumPy array per column, for vectorized filters and group-bys."""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def float_column(values: Sequence[Any]) -> np.ndarray:
+    """float64 array; NaN where a value is missing or not numeric."""
+    out = np.full(len(values), np.nan)
+    for i, value in enumerate(values):
+        if value is None or value == "":
+            continue
+        try:
+            out[i] = float(value)
+        except (TypeError, ValueError):
+            pass
+    return out
+
+
+def text_column(values: Sequence[Any], blank: str = "") -> np.ndarray:
+    """Object array of stripped strings; missing values become `blank`."""
+    return np.array([str(v).strip() or blank if v is not None else blank for v in values], dtype=object)
+
+
+def categorical_column(values: Sequence[Any], blank: str = "") -> Tuple[np.ndarray, np.ndarray]:
+    """(codes, labels): labels[codes] gives back the stripped strings."""
+    labels, codes = np.unique(text_column(values, blank).astype(str), return_inverse=True)
+    return codes.astype(np.int64), labels.astype(object)
+
+
+class ColumnFrame:
+    """
+    An immutable batch of rows stored column-wise. Build it once from the
+    rows, then filter with boolean masks and aggregate with group_sums().
+    Categorical columns are stored as integer codes plus their labels, so a
+    group-by is one np.bincount per aggregated column.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], labels: Optional[Dict[str, np.ndarray]] = None):
+        lengths = {len(a) for a in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        self.columns = columns
+        self.labels = labels or {}
+        self.size = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: List[Dict[str, Any]],
+        numeric: Iterable[str] = (),
+        categorical: Iterable[str] = (),
+        blank: str = "",
+    ) -> "ColumnFrame":
+        columns: Dict[str, np.ndarray] = {}
+        labels: Dict[str, np.ndarray] = {}
+        for name in numeric:
+            columns[name] = float_column([row.get(name) for row in rows])
+        for name in categorical:
+            columns[name], labels[name] = categorical_column([row.get(name) for row in rows], blank)
+        return cls(columns, labels)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def mask(self) -> np.ndarray:
+        return np.ones(self.size, dtype=bool)
+
+    def isin(self, name: str, values: Iterable[Any]) -> np.ndarray:
+        if name in self.labels:
+            wanted = np.flatnonzero(np.isin(self.labels[name], np.array(list(values), dtype=object)))
+            return np.isin(self.columns[name], wanted)
+        return np.isin(self.columns[name], np.array(list(values), dtype=object))
+
+    def group_sums(
+        self,
+        key: str,
+        sums: Iterable[str],
+        where: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        (keys, row counts, {column: sums}) per distinct value of `key` among
+        the rows selected by `where`. NaNs count as 0 in the sums.
+        """
+        keys = self.columns[key] if where is None else self.columns[key][where]
+        if key in self.labels:
+            inverse, groups = keys, self.labels[key]
+        else:
+            groups, inverse = np.unique(keys.astype(str), return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(groups))
+        present = counts > 0
+        totals = {}
+        for name in sums:
+            values = self.columns[name] if where is None else self.columns[name][where]
+            totals[name] = np.bincount(inverse, weights=np.nan_to_num(values), minlength=len(groups))[present]
+        return groups[present], counts[present], totals
@@ -1,4 +1,9 @@
 # backend/services/formatters.py
+import json
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+
 def normalize_control(row):
     # map raw DB columns to stable snake_case keys used by frontend
     return {
@@ -30,3 +35,208 @@ def normalize_control(row):
         "Date": row.get("Date"),
         "Comments_1": row.get("Comments_1") or row.get("Comments2") or row.get("Comments 2"),
     }
+
+
+# ---------- BUG ROWS ----------
+
+# Canonical bug field -> source columns in lookup order, in output order.
+# "Comments" is derived from the raw "Comment" column; the *_count fields
+# are the cheap list-view stand-ins for Comments / Attachments.
+BUG_FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "Bug ID": ("Bug ID", "bug_id", "id", "bugid"),
+    "Summary": ("Summary", "summary", "title"),
+    "Priority": ("Priority", "priority", "severity"),
+    "Status": ("Status", "status"),
+    "Assignee": ("Assignee", "assignee", "assignee_name"),
+    "Assignee Real Name": ("Assignee Real Name", "assignee_real_name"),
+    "Changed": ("Changed", "changed", "updated_at", "updated"),
+    "Product": ("Product", "product", "Project", "project"),
+    "Component": ("Component", "component"),
+    "Defect type": ("Defect type", "defect_type"),
+    "Steps to Reproduce": ("Steps to Reproduce", "steps_to_reproduce"),
+    "Reporter": ("Reporter", "reporter"),
+    "Resolution": ("Resolution", "resolution"),
+    "Sprint details": ("Sprint details", "sprint_details"),
+    "Automation Intent": ("Automation Intent", "automation_intent"),
+    "automation_owner": ("automation_owner",),
+    "automation status": ("automation status", "automation_status"),
+    "Device type": ("Device type", "device_type"),
+    "Browser tested": ("Browser tested", "browser_tested"),
+    "Project Owner": ("Project Owner", "project_owner"),
+    "Project Owner Name": ("Project Owner Name", "project_owner_name"),
+    "Description": ("Description", "description"),
+    "Comment": ("Comment", "comment"),
+    "Comments": ("Comment", "comment"),
+    "Attachments": ("Attachments", "attachments"),
+    "comment_count": ("Comment", "comment"),
+    "attachment_count": ("Attachments", "attachments"),
+}
+
+BUG_FIELDS: Tuple[str, ...] = tuple(BUG_FIELD_ALIASES)
+
+
+def parse_bug_comments(comment_value: Any, changed: Any) -> List[Dict[str, Any]]:
+    """
+    The DB "Comment" column holds raw text or a JSON array string; expose it
+    as a list of {text, user, timestamp} entries.
+    """
+    if not isinstance(comment_value, str) or not comment_value.strip():
+        return []
+    try:
+        parsed = json.loads(comment_value)
+        if isinstance(parsed, list):
+            return parsed
+    except Exception:
+        pass
+    return [{"text": str(comment_value), "user": "Unknown", "timestamp": changed}]
+
+
+def parse_bug_attachments(raw_attachments: Any) -> List[Dict[str, Any]]:
+    """Attachments JSONB column (or its JSON string form) as a list."""
+    if isinstance(raw_attachments, str):
+        try:
+            raw_attachments = json.loads(raw_attachments)
+        except Exception:
+            return []
+    return raw_attachments if isinstance(raw_attachments, list) else []
+
+
+def count_bug_comments(comment_value: Any) -> int:
+    """Number of entries parse_bug_comments would return."""
+    return len(parse_bug_comments(comment_value, None)) if isinstance(comment_value, str) else 0
+
+
+def count_bug_attachments(raw_attachments: Any) -> int:
+    if isinstance(raw_attachments, list):
+        return len(raw_attachments)
+    return len(parse_bug_attachments(raw_attachments))
+
+
+def _empty_bug(fields: Sequence[str]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for name in fields:
+        if name == "Bug ID":
+            out[name] = None
+        elif name in ("Comments", "Attachments"):
+            out[name] = []
+        elif name in ("comment_count", "attachment_count"):
+            out[name] = 0
+        else:
+            out[name] = ""
+    return out
+
+
+# how _project fills a field
+_SINGLE, _PLAIN, _BUG_ID, _COMMENTS, _COMMENT_COUNT, _ATTACHMENTS, _ATTACHMENT_COUNT = range(7)
+_FIELD_KINDS = {
+    "Bug ID": _BUG_ID,
+    "Comments": _COMMENTS,
+    "comment_count": _COMMENT_COUNT,
+    "Attachments": _ATTACHMENTS,
+    "attachment_count": _ATTACHMENT_COUNT,
+}
+
+
+class BugRowNormalizer:
+    """
+    Bug row normalizer planned for one table schema.
+
+    Each canonical field is resolved up front to the source columns that
+    actually exist in `columns`, so normalizing a row walks a short
+    precomputed column list per field instead of every alias.
+    """
+
+    def __init__(self, columns: Iterable[str], fields: Optional[Sequence[str]] = None):
+        self.columns: FrozenSet[str] = frozenset(columns)
+        self.fields: Tuple[str, ...] = tuple(f for f in BUG_FIELDS if not fields or f in fields)
+        self.plan: Dict[str, Tuple[str, ...]] = {
+            name: tuple(c for c in BUG_FIELD_ALIASES[name] if c in self.columns)
+            for name in BUG_FIELDS
+        }
+        self._steps = tuple(self._step(name) for name in self.fields)
+        self._changed_sources = self.plan["Changed"]
+        # like the old alias chain: with the last alias present, an all-falsy
+        # "Bug ID" keeps that column's value instead of becoming None
+        bug_id_sources = self.plan["Bug ID"]
+        self._raw_bug_id = bool(bug_id_sources) and bug_id_sources[-1] == BUG_FIELD_ALIASES["Bug ID"][-1]
+
+    def _step(self, name: str) -> Tuple[str, Any, int]:
+        sources = self.plan[name]
+        kind = _FIELD_KINDS.get(name, _PLAIN)
+        if kind == _PLAIN and len(sources) == 1:
+            # the common case once the plan is resolved: one existing column
+            return name, sources[0], _SINGLE
+        return name, sources, kind
+
+    def _project(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        get = row.get
+        out: Dict[str, Any] = {}
+        for name, sources, kind in self._steps:
+            if kind == _SINGLE:
+                out[name] = get(sources) or ""
+                continue
+            # first truthy source value, else the last one looked at
+            value = None
+            for column in sources:
+                value = get(column)
+                if value:
+                    break
+            if kind == _PLAIN:
+                out[name] = value or ""
+            elif kind == _BUG_ID:
+                out[name] = value if self._raw_bug_id else (value or None)
+            elif kind == _COMMENTS:
+                changed = None
+                for column in self._changed_sources:
+                    changed = get(column)
+                    if changed:
+                        break
+                out[name] = parse_bug_comments(value or "", changed or "")
+            elif kind == _COMMENT_COUNT:
+                out[name] = count_bug_comments(value)
+            elif kind == _ATTACHMENTS:
+                out[name] = parse_bug_attachments(value or [])
+            else:
+                out[name] = count_bug_attachments(value or [])
+        return out
+
+    def __call__(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return self._project(row)
+        except Exception:
+            # Fallback minimal shape if something unexpected happens
+            return _empty_bug(self.fields)
+
+    def normalize_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        project = self._project
+        try:
+            return [project(row) for row in rows]
+        except Exception:
+            return [self(row) for row in rows]
+
+
+@lru_cache(maxsize=64)
+def _bug_normalizer(columns: FrozenSet[str], fields: Optional[Tuple[str, ...]]) -> BugRowNormalizer:
+    return BugRowNormalizer(columns, fields)
+
+
+def bug_normalizer_for(columns: Iterable[str], fields: Optional[Sequence[str]] = None) -> BugRowNormalizer:
+    """Memoized normalizer for a schema (column set) and optional field subset."""
+    return _bug_normalizer(frozenset(columns), tuple(fields) if fields else None)
+
+
+def normalize_bug_row(row: Dict[str, Any], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Map a raw bug row to the canonical shape served to the frontend.
+    `fields` narrows the output to those canonical keys.
+    """
+    if not isinstance(row, dict):
+        return _empty_bug(bug_normalizer_for((), fields).fields)
+    return bug_normalizer_for(row.keys(), fields)(row)
+
+
+def normalize_bug_rows(rows: List[Dict[str, Any]], fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """Normalize a batch of rows from one table with a single column plan."""
+    if not rows:
+        return []
+    return bug_normalizer_for(rows[0].keys(), fields).normalize_rows(rows)
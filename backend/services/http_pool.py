@@ -0,0 +1,136 @@
+"""Shared, connection-pooled HTTP client for the Supabase REST helpers."""
+import os
+import asyncio
+import threading
+import time
+import importlib.util
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# Pool sizing, overridable from .env
+POOL_MAX_CONNECTIONS = _env_int("SUPABASE_HTTP_POOL_SIZE", 20)
+POOL_MAX_KEEPALIVE = _env_int("SUPABASE_HTTP_MAX_KEEPALIVE", POOL_MAX_CONNECTIONS)
+POOL_PER_HOST_LIMIT = _env_int("SUPABASE_HTTP_PER_HOST_LIMIT", POOL_MAX_CONNECTIONS)
+POOL_KEEPALIVE_EXPIRY = _env_float("SUPABASE_HTTP_KEEPALIVE_EXPIRY", 30.0)
+
+# HTTP/2 needs the optional `h2` package (pip install "httpx[http2]")
+HTTP2_ENABLED = (
+    os.getenv("SUPABASE_HTTP2", "1").lower() not in ("0", "false", "no")
+    and importlib.util.find_spec("h2") is not None
+)
+
+
+class PooledHTTPClient:
+    """
+    Keep-alive HTTP client shared by every REST helper.
+
+    Wraps one httpx.AsyncClient and adds a per-host concurrency limit plus the pool
+    counters reported by stats(): connections opened, requests that reused an
+    open connection, and requests that had to wait for a free slot.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = POOL_MAX_CONNECTIONS,
+        max_keepalive: int = POOL_MAX_KEEPALIVE,
+        per_host_limit: int = POOL_PER_HOST_LIMIT,
+        keepalive_expiry: float = POOL_KEEPALIVE_EXPIRY,
+        http2: bool = HTTP2_ENABLED,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.per_host_limit = max(1, per_host_limit)
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._connections_opened = 0
+        self._waited = 0
+        self._wait_seconds = 0.0
+        self._in_flight = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+        return self._client
+
+    def _slots_for(self, host: str) -> asyncio.Semaphore:
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = self._host_slots.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        return slots
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._stats_lock:
+                self._connections_opened += 1
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        slots = self._slots_for(httpx.URL(url).host)
+        if slots.locked():
+            started = time.perf_counter()
+            await slots.acquire()
+            with self._stats_lock:
+                self._waited += 1
+                self._wait_seconds += time.perf_counter() - started
+        else:
+            await slots.acquire()
+        with self._stats_lock:
+            self._requests += 1
+            self._in_flight += 1
+        try:
+            return await self.client.request(method, url, extensions={"trace": self._trace}, **kwargs)
+        finally:
+            with self._stats_lock:
+                self._in_flight -= 1
+            slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "http2": self.http2,
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive,
+                "per_host_limit": self.per_host_limit,
+                "keepalive_expiry": self.keepalive_expiry,
+                "requests": self._requests,
+                "in_flight": self._in_flight,
+                "connections_opened": self._connections_opened,
+                "connections_reused": max(0, self._requests - self._connections_opened),
+                "waited": self._waited,
+                "wait_ms_total": round(self._wait_seconds * 1000, 1),
+            }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+rest_client = PooledHTTPClient()
@@ -0,0 +1,277 @@
+"""In-memory indexes kept up to date row by row and rebuilt periodically."""
+import time
+import asyncio
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+from backend.services.cache import LRUCache
+
+GRANULARITIES = ("day", "week", "month", "year")
+
+
+def time_bucket(day: date, granularity: str) -> Tuple[str, date]:
+    """(label, first day) of the bucket holding `day`; weeks are ISO weeks."""
+    if granularity == "week":
+        iso = day.isocalendar()
+        return f"{iso[0]}-W{iso[1]:02d}", day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.strftime("%Y-%m"), day.replace(day=1)
+    if granularity == "year":
+        return str(day.year), day.replace(month=1, day=1)
+    return day.strftime("%Y-%m-%d"), day
+
+
+class TimeRollup:
+    """
+    Sums of a numeric value per time bucket and per dimension value (e.g. open
+    bugs per product per week), for every granularity at once.
+
+    Rows are keyed by id, so adding a row again replaces its old contribution
+    and discard() takes it back out; updates and deletes stay exact.
+    """
+
+    def __init__(self, granularities: Iterable[str] = GRANULARITIES):
+        self.granularities = tuple(granularities)
+        # granularity -> label -> dimension -> [sum, rows]
+        self._sums: Dict[str, Dict[str, Dict[Hashable, list]]] = {g: {} for g in self.granularities}
+        self._starts: Dict[str, Dict[str, date]] = {g: {} for g in self.granularities}
+        self._rows: Dict[Hashable, Tuple[date, float, Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def _apply(self, day: date, value: float, dimension: Hashable, rows: int) -> None:
+        for g in self.granularities:
+            label, start = time_bucket(day, g)
+            bucket = self._sums[g].setdefault(label, {})
+            cell = bucket.setdefault(dimension, [0, 0])
+            cell[0] += value
+            cell[1] += rows
+            if cell[1] <= 0:
+                del bucket[dimension]
+                if not bucket:
+                    del self._sums[g][label]
+                    del self._starts[g][label]
+                    continue
+            self._starts[g][label] = start
+
+    def add(self, row_id: Hashable, when: datetime | date, value: float, dimension: Hashable = None) -> None:
+        day = when.date() if isinstance(when, datetime) else when
+        with self._lock:
+            previous = self._rows.pop(row_id, None)
+            if previous is not None:
+                self._apply(previous[0], -previous[1], previous[2], -1)
+            self._rows[row_id] = (day, value, dimension)
+            self._apply(day, value, dimension, 1)
+
+    def discard(self, row_id: Hashable) -> None:
+        with self._lock:
+            previous = self._rows.pop(row_id, None)
+            if previous is not None:
+                self._apply(previous[0], -previous[1], previous[2], -1)
+
+    def series(
+        self,
+        granularity: str,
+        dimensions: Optional[Iterable[Hashable]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        [{"date": label, "value": sum}] in time order, optionally limited to
+        some dimension values and to days in [start, end]. Coarser buckets cut
+        by the range are re-summed from the day buckets inside it.
+        """
+        wanted = None if dimensions is None else set(dimensions)
+        source = "day" if (start or end) and granularity != "day" else granularity
+        out: Dict[str, float] = {}
+        out_starts: Dict[str, date] = {}
+        with self._lock:
+            for label, bucket in self._sums[source].items():
+                first = self._starts[source][label]
+                if (start and first < start) or (end and first > end):
+                    continue
+                cells = [cell for d, cell in bucket.items() if wanted is None or d in wanted]
+                if not cells:
+                    continue
+                value = sum(cell[0] for cell in cells)
+                if source != granularity:
+                    label, first = time_bucket(first, granularity)
+                out[label] = out.get(label, 0) + value
+                out_starts.setdefault(label, first)
+        return [
+            {"date": label, "value": int(out[label]) if float(out[label]).is_integer() else out[label]}
+            for label in sorted(out, key=out_starts.__getitem__)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"rows": len(self._rows), "buckets": {g: len(self._sums[g]) for g in self.granularities}}
+
+
+class DistinctValueIndex:
+    """
+    Distinct values with row counts for a fixed set of columns (filter
+    dropdowns). Rows are kept by id, so inserts, updates and deletes adjust
+    the counts exactly.
+
+    facets() narrows each column by the values selected on the *other*
+    columns, which gives cascading filters (products for one application
+    type, and so on). Results are memoized until the next change, keeping
+    the `max_views` most recently used selections.
+    """
+
+    def __init__(self, columns: Iterable[str], max_views: int = 256):
+        self.columns = tuple(columns)
+        self._rows: Dict[Hashable, Tuple[Optional[str], ...]] = {}
+        self._counts: Dict[str, Dict[str, int]] = {c: {} for c in self.columns}
+        self._facets = LRUCache(max_entries=max_views)
+        self._lock = threading.Lock()
+
+    def _apply(self, values: Tuple[Optional[str], ...], delta: int) -> None:
+        for column, value in zip(self.columns, values):
+            if value is None:
+                continue
+            counts = self._counts[column]
+            n = counts.get(value, 0) + delta
+            if n > 0:
+                counts[value] = n
+            else:
+                counts.pop(value, None)
+
+    def add(self, row_id: Hashable, values: Dict[str, Any]) -> None:
+        """Insert or replace a row; blank values are not indexed."""
+        row = tuple((str(values.get(c) or "").strip() or None) for c in self.columns)
+        with self._lock:
+            previous = self._rows.get(row_id)
+            if previous == row:
+                return
+            if previous is not None:
+                self._apply(previous, -1)
+            self._rows[row_id] = row
+            self._apply(row, 1)
+            self._facets.invalidate()
+
+    def discard(self, row_id: Hashable) -> None:
+        with self._lock:
+            previous = self._rows.pop(row_id, None)
+            if previous is not None:
+                self._apply(previous, -1)
+                self._facets.invalidate()
+
+    def facets(self, selected: Optional[Dict[str, Iterable[str]]] = None) -> Dict[str, Dict[str, int]]:
+        """{column: {value: rows}} with values sorted, narrowed by `selected`."""
+        chosen = {c: frozenset(v) for c, v in (selected or {}).items() if c in self.columns and v}
+        key = tuple(sorted(chosen.items()))
+        with self._lock:
+            cached = self._facets.get(key)
+            if cached is not None:
+                return cached
+            if not chosen:
+                counts = self._counts
+            else:
+                positions = {c: self.columns.index(c) for c in chosen}
+                counts = {c: {} for c in self.columns}
+                for row in self._rows.values():
+                    misses = [c for c, i in positions.items() if row[i] not in chosen[c]]
+                    if len(misses) > 1:
+                        continue
+                    for i, column in enumerate(self.columns):
+                        # a column's own selection doesn't narrow its options
+                        if row[i] is None or (misses and misses[0] != column):
+                            continue
+                        counts[column][row[i]] = counts[column].get(row[i], 0) + 1
+            result = {c: dict(sorted(counts[c].items())) for c in self.columns}
+            self._facets.set(key, result)
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rows": len(self._rows),
+                "distinct": {c: len(v) for c, v in self._counts.items()},
+                "memoized_views": self._facets.stats(),
+            }
+
+
+T = TypeVar("T")
+
+
+class RefreshingIndex(Generic[T]):
+    """
+    Holds an in-memory index that is built by scanning the source table and
+    then maintained incrementally through apply().
+
+    The first get() builds the index inline. After `ttl` seconds it is rebuilt
+    in the background, which also catches writes that bypassed the API, while
+    the current copy keeps being served. Writes applied during a rebuild go to
+    both copies so none are lost in the swap.
+    """
+
+    def __init__(self, factory: Callable[[], T], load: Callable[[T], Awaitable[None]], ttl: float):
+        self._factory = factory
+        self._load = load
+        self.ttl = ttl
+        self._index: Optional[T] = None
+        self._building: Optional[T] = None
+        self._built_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._refresh: Optional[asyncio.Future] = None
+        self.rebuilds = 0
+        self.rebuild_failures = 0
+        self.last_build_ms: Optional[float] = None
+
+    async def get(self) -> T:
+        if self._index is None:
+            await self._rebuild()
+        elif time.monotonic() - self._built_at >= self.ttl and self._refresh is None:
+            self._refresh = asyncio.ensure_future(self._rebuild())
+            self._refresh.add_done_callback(self._refresh_done)
+        return self._index
+
+    def _refresh_done(self, task: asyncio.Future) -> None:
+        self._refresh = None
+        if not task.cancelled():
+            task.exception()
+
+    async def _rebuild(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._index is not None and time.monotonic() - self._built_at < self.ttl:
+                return
+            started = time.perf_counter()
+            building = self._building = self._factory()
+            try:
+                await self._load(building)
+            except Exception:
+                self.rebuild_failures += 1
+                raise
+            finally:
+                self._building = None
+            self._index = building
+            self._built_at = time.monotonic()
+            self.rebuilds += 1
+            self.last_build_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    def apply(self, change: Callable[[T], Any]) -> None:
+        """Apply one row change to the live index and to any copy being built."""
+        for index in (self._index, self._building):
+            if index is not None:
+                change(index)
+
+    def invalidate(self) -> None:
+        """Treat the index as stale: the next get() starts a rebuild."""
+        self._built_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        stats_fn = getattr(self._index, "stats", None)
+        return {
+            "ttl_seconds": self.ttl,
+            "built": self._index is not None,
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if self._index is not None else None,
+            "rebuilds": self.rebuilds,
+            "rebuild_failures": self.rebuild_failures,
+            "last_build_ms": self.last_build_ms,
+            "rebuilding": self._building is not None,
+            **({"index": stats_fn()} if callable(stats_fn) else {}),
+        }
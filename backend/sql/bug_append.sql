@@ -0,0 +1,83 @@
+-- Atomic appends to a bug's Comment / Attachments history.
+--
+-- Each function is a single UPDATE, so concurrent appends to the same bug
+-- serialize on the row lock instead of overwriting each other, and the API
+-- pays one round trip however long the history is.
+--
+-- Apply once in the Supabase SQL editor (or psql). Called from the API as
+--   POST /rest/v1/rpc/append_bug_comments
+--   POST /rest/v1/rpc/append_bug_attachments
+-- Both return the new number of entries, or NULL when the bug does not exist.
+-- Parameters bound with `using` keep their declared (text) types, so they are
+-- cast explicitly to the column types in the dynamic SQL below.
+
+-- "Comment" is a text column holding a JSON array; older rows may hold plain text.
+create or replace function bug_comment_array(raw text, changed text)
+returns jsonb
+language plpgsql
+immutable
+as $$
+declare
+  parsed jsonb;
+begin
+  if raw is null or btrim(raw) = '' then
+    return '[]'::jsonb;
+  end if;
+  begin
+    parsed := raw::jsonb;
+  exception when others then
+    parsed := null;
+  end;
+  if jsonb_typeof(parsed) = 'array' then
+    return parsed;
+  end if;
+  return jsonb_build_array(jsonb_build_object('text', raw, 'user', 'Unknown', 'timestamp', changed));
+end;
+$$;
+
+
+create or replace function append_bug_comments(p_table text, p_bug_id text, p_items jsonb, p_changed text)
+returns integer
+language plpgsql
+as $$
+declare
+  new_count integer;
+begin
+  if p_table not in ('bugs', 'Bugs_file', 'bugs_file') then
+    raise exception 'unknown bug table %', p_table;
+  end if;
+  execute format(
+    'update %I
+        set "Comment" = (bug_comment_array("Comment", "Changed"::text) || $1)::text,
+            "Changed" = $3::timestamptz
+      where "Bug ID"::text = $2
+  returning jsonb_array_length("Comment"::jsonb)',
+    p_table
+  ) into new_count using p_items, p_bug_id, p_changed;
+  return new_count;
+end;
+$$;
+
+
+create or replace function append_bug_attachments(p_table text, p_bug_id text, p_items jsonb, p_changed text)
+returns integer
+language plpgsql
+as $$
+declare
+  new_count integer;
+begin
+  if p_table not in ('bugs', 'Bugs_file', 'bugs_file') then
+    raise exception 'unknown bug table %', p_table;
+  end if;
+  execute format(
+    'update %I
+        set "Attachments" = case when jsonb_typeof("Attachments"::jsonb) = ''array''
+                                 then "Attachments"::jsonb else ''[]''::jsonb end || $1,
+            "Changed" = $3::timestamptz
+      where "Bug ID"::text = $2
+  returning jsonb_array_length("Attachments"::jsonb)',
+    p_table
+  ) into new_count using p_items, p_bug_id, p_changed;
+  return new_count;
+end;
+$$;
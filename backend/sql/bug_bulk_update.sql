@@ -0,0 +1,66 @@
+-- Set-based bulk update for PATCH /api/bugs/bulk.
+--
+-- p_rows is a jsonb array of partial bugs, each with its "Bug ID" plus the
+-- columns to change; items may set different columns. The whole array is
+-- applied by one UPDATE ... FROM jsonb_array_elements, so a chunk of the
+-- bulk request costs one round trip. A column is only written for the items
+-- that carry its key, and jsonb_populate_record casts each value to the
+-- column's type. Keys that are not columns of the table fail the call
+-- (SQLSTATE 42703), as they would for a plain PATCH.
+--
+-- Apply once in the Supabase SQL editor (or psql). Called from the API as
+--   POST /rest/v1/rpc/bug_bulk_update
+-- Returns the "Bug ID" of every row it updated.
+
+create or replace function bug_bulk_update(p_table text, p_rows jsonb)
+returns table (bug_id text)
+language plpgsql
+as $$
+declare
+  rel regclass;
+  unknown text;
+  assignments text;
+begin
+  if p_table not in ('bugs', 'Bugs_file', 'bugs_file') then
+    raise exception 'unknown bug table %', p_table;
+  end if;
+  rel := to_regclass(format('public.%I', p_table));
+
+  select string_agg(k, ', ')
+    into unknown
+    from (select distinct jsonb_object_keys(e) as k from jsonb_array_elements(p_rows) e) keys
+   where not exists (
+     select 1 from pg_attribute a
+      where a.attrelid = rel and a.attname = keys.k and a.attnum > 0 and not a.attisdropped
+   );
+  if unknown is not null then
+    raise exception 'unknown bug columns: %', unknown using errcode = '42703';
+  end if;
+
+  -- every column some item sets, kept as-is on the items that don't
+  select string_agg(
+           format('%1$I = case when u.item ? %2$L then (u.rec).%1$I else t.%1$I end', a.attname, a.attname),
+           ', '
+         )
+    into assignments
+    from pg_attribute a
+   where a.attrelid = rel
+     and a.attnum > 0
+     and not a.attisdropped
+     and a.attname <> 'Bug ID'
+     and exists (select 1 from jsonb_array_elements(p_rows) e where e ? a.attname);
+  if assignments is null then
+    return;
+  end if;
+
+  return query execute format(
+    'update %1$I t
+        set %2$s
+       from (select item, jsonb_populate_record(null::%1$I, item) as rec
+               from jsonb_array_elements($1) as item) u
+      where t."Bug ID"::text = u.item->>''Bug ID''
+  returning t."Bug ID"::text',
+    p_table, assignments
+  ) using p_rows;
+end;
+$$;
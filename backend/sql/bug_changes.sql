@@ -0,0 +1,66 @@
+-- Deletion tombstones for GET /api/bugs/changes.
+--
+-- Updates are found through "Changed". The API stamps it on every update and
+-- a trigger stamps writes that leave it untouched (e.g. straight from the
+-- Supabase client). Deleted rows leave nothing behind, so a second trigger
+-- records each delete here and the change feed returns them as tombstones.
+-- Old tombstones can be pruned once every client has synced past them, e.g.
+--   delete from bug_tombstones where deleted_at < now() - interval '90 days';
+--
+-- Apply once in the Supabase SQL editor (or psql).
+
+create table if not exists bug_tombstones (
+  id bigserial primary key,
+  bug_id text not null,
+  source_table text not null,
+  deleted_at timestamptz not null default clock_timestamp()
+);
+
+create index if not exists bug_tombstones_deleted_at_idx on bug_tombstones (deleted_at, id);
+
+create or replace function record_bug_tombstone()
+returns trigger
+language plpgsql
+as $$
+begin
+  insert into bug_tombstones (bug_id, source_table) values (old."Bug ID"::text, tg_table_name);
+  return old;
+end;
+$$;
+
+create or replace function stamp_bug_changed()
+returns trigger
+language plpgsql
+as $$
+begin
+  if new."Changed" is not distinct from old."Changed" then
+    new."Changed" := clock_timestamp();
+  end if;
+  return new;
+end;
+$$;
+
+-- Attach to whichever of the candidate bug tables exist
+do $$
+declare
+  t text;
+begin
+  foreach t in array array['bugs', 'Bugs_file', 'bugs_file'] loop
+    if to_regclass(format('public.%I', t)) is not null then
+      execute format('drop trigger if exists bug_tombstone on %I', t);
+      execute format(
+        'create trigger bug_tombstone after delete on %I for each row execute function record_bug_tombstone()',
+        t
+      );
+      execute format('drop trigger if exists bug_changed on %I', t);
+      execute format(
+        'create trigger bug_changed before update on %I for each row execute function stamp_bug_changed()',
+        t
+      );
+    end if;
+  end loop;
+end;
+$$;
+
+-- Keyset scans of the feed ("Changed" then "Bug ID") should use an index:
+--   create index if not exists bugs_changed_bug_id_idx on bugs ("Changed", "Bug ID");
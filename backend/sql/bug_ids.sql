@@ -0,0 +1,46 @@
+-- Server-side Bug ID allocation ("BUG-001", "BUG-002", ...).
+--
+-- One counter row holds the next free number. reserve_bug_ids(n) hands out a
+-- block of n numbers in a single atomic UPDATE, so API workers can allocate
+-- most IDs from memory (see backend/services/bug_ids.py). Numbers skipped by
+-- a worker that restarts mid-block are simply never used.
+--
+-- Apply once in the Supabase SQL editor (or psql). Called from the API as
+--   POST /rest/v1/rpc/reserve_bug_ids
+
+create table if not exists bug_id_counter (
+  id boolean primary key default true check (id),
+  next_value bigint not null
+);
+
+-- Start after the highest existing BUG-<n> in any candidate bug table
+do $$
+declare
+  t text;
+  table_max bigint;
+  start_value bigint := 1;
+begin
+  foreach t in array array['bugs', 'Bugs_file', 'bugs_file'] loop
+    if to_regclass(format('public.%I', t)) is not null then
+      execute format(
+        'select max(substring("Bug ID"::text from ''^BUG-(\d+)$'')::bigint) from %I',
+        t
+      ) into table_max;
+      start_value := greatest(start_value, coalesce(table_max, 0) + 1);
+    end if;
+  end loop;
+  insert into bug_id_counter (id, next_value) values (true, start_value)
+  on conflict (id) do update set next_value = greatest(bug_id_counter.next_value, excluded.next_value);
+end;
+$$;
+
+-- First number of a freshly reserved block [first, first + p_count)
+create or replace function reserve_bug_ids(p_count integer)
+returns bigint
+language sql
+as $$
+  update bug_id_counter
+     set next_value = next_value + greatest(p_count, 1)
+   where id
+  returning next_value - greatest(p_count, 1);
+$$;
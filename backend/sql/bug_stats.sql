@@ -0,0 +1,52 @@
+-- Grouped bug counts for /api/priority-stats and the dashboard.
+--
+-- Each function returns one row per distinct group, so the API moves a
+-- handful of rows instead of the whole bug table. Bucketing into
+-- high / medium / low stays in the API (see _priority_bucket).
+--
+-- Apply once in the Supabase SQL editor (or psql). Called from the API as
+--   POST /rest/v1/rpc/bug_priority_status_counts
+--   POST /rest/v1/rpc/bug_assignee_project_counts
+
+create or replace function bug_priority_status_counts(p_table text)
+returns table (priority text, status text, count bigint)
+language plpgsql
+stable
+as $$
+begin
+  if p_table not in ('bugs', 'Bugs_file', 'bugs_file') then
+    raise exception 'unknown bug table %', p_table;
+  end if;
+  return query execute format(
+    'select "Priority"::text, "Status"::text, count(*)
+       from %I
+      group by 1, 2',
+    p_table
+  );
+end;
+$$;
+
+-- (assignee, project) pairs for the dashboard's bug charts. The project is
+-- the first non-empty of Product / Project / Component, else 'Unknown'; rows
+-- go through to_jsonb so tables without a Project column work too.
+create or replace function bug_assignee_project_counts(p_table text)
+returns table (assignee text, project text, count bigint)
+language plpgsql
+stable
+as $$
+begin
+  if p_table not in ('bugs', 'Bugs_file', 'bugs_file') then
+    raise exception 'unknown bug table %', p_table;
+  end if;
+  return query execute format(
+    'select btrim(coalesce(r->>''Assignee'', '''')),
+            coalesce(nullif(btrim(coalesce(
+              nullif(r->>''Product'', ''''), nullif(r->>''Project'', ''''), r->>''Component'', ''''
+            )), ''''), ''Unknown''),
+            count(*)
+       from (select to_jsonb(t) as r from %I t) s
+      group by 1, 2',
+    p_table
+  );
+end;
+$$;
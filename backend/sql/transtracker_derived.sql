@@ -0,0 +1,34 @@
+-- Set-based write-back for POST /api/transtracker/derived/backfill.
+--
+-- p_rows is a jsonb array of {id, <derived fields>} objects. The whole array
+-- is applied by one UPDATE ... FROM jsonb_populate_recordset, which casts
+-- every value to the transtrackers column type, so a page of changes costs
+-- one round trip instead of a PATCH per row.
+--
+-- Apply once in the Supabase SQL editor (or psql). Called from the API as
+--   POST /rest/v1/rpc/update_transtracker_derived
+-- Returns the number of rows updated.
+
+create or replace function update_transtracker_derived(p_rows jsonb)
+returns integer
+language sql
+as $$
+  with updated as (
+    update transtrackers t
+       set year = r.year,
+           monthname = r.monthname,
+           quarternumber = r.quarternumber,
+           monthnumber = r.monthnumber,
+           weeknumber = r.weeknumber,
+           dayname = r.dayname,
+           y_q = r.y_q,
+           y_q_m_w = r.y_q_m_w,
+           m_y = r.m_y,
+           timesaved = r.timesaved,
+           timesavedpercent = r.timesavedpercent
+      from jsonb_populate_recordset(null::transtrackers, p_rows) r
+     where t.id = r.id
+    returning 1
+  )
+  select count(*)::integer from updated;
+$$;
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend import main
+from backend.services.bug_ids import BugIdAllocator
+
+
+def test_allocator_owns_its_format():
+    ids = BugIdAllocator(reserve=None)
+    assert ids.owns("BUG-001")
+    assert ids.owns(" BUG-12345 ")
+    assert not ids.owns("BUG-")
+    assert not ids.owns("LEGACY-17")
+    assert not ids.owns("BUG-12a")
+
+
+def test_explicit_sequence_id_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        main._prepare_new_bug({"Bug ID": "BUG-900", "Summary": "x"})
+    assert exc.value.status_code == 400
+
+
+def test_allocated_and_foreign_ids_are_accepted():
+    assert main._prepare_new_bug({"Bug ID": "BUG-900"}, allocated=True)["Bug ID"] == "BUG-900"
+    assert main._prepare_new_bug({"Bug ID": "LEGACY-17"})["Bug ID"] == "LEGACY-17"
+
+
+def test_bulk_create_rejects_explicit_sequence_ids(monkeypatch):
+    async def reserve(count):
+        return 500
+
+    async def post_rows(rows, prefer, params=None):
+        return type("Resp", (), {"is_success": True})()
+
+    monkeypatch.setattr(main, "bug_ids", BugIdAllocator(reserve))
+    monkeypatch.setattr(main, "_post_bug_rows", post_rows)
+    monkeypatch.setattr(main, "_invalidate_bug_lists", lambda: None)
+    result = asyncio.run(main._insert_bugs_bulk([{"Summary": "a"}, {"Bug ID": "BUG-900"}, {"Bug ID": "LEGACY-1"}]))
+    statuses = [(r["Bug ID"], r["status"]) for r in result["data"]["results"]]
+    assert statuses == [("BUG-500", "created"), ("BUG-900", "error"), ("LEGACY-1", "created")]
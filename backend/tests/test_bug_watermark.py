@@ -0,0 +1,29 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from backend.main import BugWatermark, _decode_bug_watermark, _encode_bug_watermark
+
+
+def _watermark(raw):
+    return "w." + base64.urlsafe_b64encode(json.dumps(raw).encode()).decode().rstrip("=")
+
+
+def test_watermark_round_trip():
+    mark = BugWatermark("2024-01-01T00:00:00+00:00", "BUG-001", "2024-01-02T00:00:00+00:00", 42)
+    assert _decode_bug_watermark(_encode_bug_watermark(mark)) == mark
+
+
+@pytest.mark.parametrize("since", [
+    _watermark({"c": None, "b": None, "d": "2024-01-02", "t": "1)"}),
+    _watermark({"t": [1]}),
+    _watermark([1, 2]),
+    "w.not-base64!",
+])
+def test_tampered_watermark_is_a_400(since):
+    with pytest.raises(HTTPException) as exc:
+        _decode_bug_watermark(since)
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Invalid watermark"
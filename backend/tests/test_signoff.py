@@ -0,0 +1,25 @@
+import pytest
+
+from backend.main import _dashboard_signoff
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("", "Pending"),
+    (None, "Pending"),
+    ("Go", "Signed Off"),
+    ("GO", "Signed Off"),
+    ("Signed Off", "Signed Off"),
+    ("signed-off", "Signed Off"),
+    ("Approved", "Signed Off"),
+    ("No Go", "No Go"),
+    ("NO-GO", "No Go"),
+    ("no_go", "No Go"),
+    ("Not signed off", "No Go"),
+    ("Rejected", "No Go"),
+    ("Conditional Go", "Conditional Go"),
+    ("conditional-go", "Conditional Go"),
+    ("Ongoing", "Pending"),
+    ("In progress", "Pending"),
+])
+def test_dashboard_signoff(raw, expected):
+    assert _dashboard_signoff(raw) == expected
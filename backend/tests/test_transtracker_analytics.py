@@ -0,0 +1,22 @@
+import asyncio
+
+from backend import main
+
+
+def _frame(monkeypatch, statuses):
+    async def pages(source, params, first_page=None):
+        yield [
+            {"id": i, "productsegregated": "Alpha", "buildreceiveddate": "2024-01-09", "signoffstatus": status}
+            for i, status in enumerate(statuses, 1)
+        ]
+
+    monkeypatch.setattr(main, "_export_pages", pages)
+    return asyncio.run(main._load_transtracker_columns())
+
+
+def test_only_approvals_count_as_signed_off(monkeypatch):
+    frame = _frame(monkeypatch, ["Go", "Signed Off", "Conditional Go", "NO-GO", "Not signed off", "Ongoing"])
+    totals = main._transtracker_analytics(frame, {}, None, None)["totals"]
+    assert totals["rows"] == 6
+    assert totals["signed_off"] == 2
+    assert totals["signoff_rate"] == 33.3
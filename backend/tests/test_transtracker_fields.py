@@ -0,0 +1,19 @@
+import pytest
+from fastapi import HTTPException
+
+from backend.main import _parse_transtracker_fields
+
+
+def test_fields_match_columns_case_insensitively():
+    assert _parse_transtracker_fields("spoc,totalttestcases,automatedTestCases,id") == [
+        "id",
+        "spoc",
+        "totalttestcases",
+        "automatedtestcases",
+    ]
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        _parse_transtracker_fields("spoc,nope")
+    assert exc.value.status_code == 400
@@ -1,7 +1,8 @@
 
-import { useEffect, useState, useMemo } from "react";
+import { useEffect, useState } from "react";
 import { Card, CardBody, Typography, Input } from "@material-tailwind/react";
 import { supabase } from "../supabaseClient";
+import { get, post } from "../services/api";
 import { useAuth } from "../hooks/useAuth";
 import FormField from "../components/FormField";
 import SearchableSelect from "../components/SearchableSelect";
@@ -138,19 +139,6 @@ const normalizeBug = (row) => {
   };
 };
 
-/* Generate next BUG-xxx style ID based on existing bugs */
-const generateBugId = (bugs) => {
-  const numbers = bugs
-    .map((b) => String(b["Bug ID"] || ""))
-    .filter((id) => /^BUG-\d+$/.test(id))
-    .map((id) => parseInt(id.replace("BUG-", ""), 10))
-    .filter((n) => !Number.isNaN(n))
-    .sort((a, b) => b - a);
-
-  const nextNum = numbers.length > 0 ? numbers[0] + 1 : 1;
-  return `BUG-${String(nextNum).padStart(3, "0")}`;
-};
-
 // helper to display attachment type label
 const getAttachmentTypeLabel = (att) => {
   const name = (att.filename || att.name || "").toLowerCase();
@@ -191,9 +179,6 @@ const getStatusClass = (status) => {
   }
 };
 
-/* small helper to avoid recreating in useMemo */
-const safeLower = (s) => String(s || "").toLowerCase();
-
 /* ---------- SUPABASE HELPERS ---------- */
 
 // we now always use the `bugs` table
@@ -232,6 +217,7 @@ const buildDbPayload = (payload) => {
 const buildCommentTree = (flatComments) => {
   const roots = [];
   const levelMap = { "-1": roots };
+  const byIndex = {};
 
   flatComments.forEach((c, idx) => {
     // Preserve originalIndex if it exists, otherwise use current index
@@ -242,9 +228,13 @@ const buildCommentTree = (flatComments) => {
     };
     const level = c.level || 0;
 
+    // Replies appended through the API name their parent; older ones sit right after it
+    const parent = c.replyToIndex !== undefined ? byIndex[c.replyToIndex] : null;
+
     // Find parent array (default to roots if hierarchy is broken)
-    const parentArray = levelMap[level - 1] || roots;
+    const parentArray = parent ? parent.children : levelMap[level - 1] || roots;
     parentArray.push(node);
+    byIndex[node.originalIndex] = node;
 
     // This node becomes the parent for the next level
     levelMap[level] = node.children;
@@ -272,8 +262,11 @@ export default function BugsPage() {
   // which Supabase table we ended up using (always "bugs" now)
   const [bugTable, setBugTable] = useState(BUG_TABLE_NAME);
 
-  // pagination
+  // pagination: the API pages with cursors, so remember how each visited
+  // page was reached (pageCursors[n - 1] loads page n)
   const [page, setPage] = useState(1);
+  const [pageCursors, setPageCursors] = useState([null]);
+  const [nextCursor, setNextCursor] = useState(null);
 
   // Product dropdown options (from Supabase transtrackers.projects_products)
   const [productOptions, setProductOptions] = useState([]);
@@ -365,25 +358,29 @@ export default function BugsPage() {
 
   /* ---------- DATA LOADERS ---------- */
 
-  // load bugs ONLY from `bugs` table in Supabase
-  const fetchBugs = async () => {
+  // load one page of bugs from GET /api/bugs (newest first, search applied server-side)
+  const fetchBugs = async (
+    targetPage = page,
+    cursor = pageCursors[targetPage - 1] ?? null,
+    searchText = search
+  ) => {
     setLoading(true);
     try {
-      const { data, error } = await supabase
-        .from(BUG_TABLE_NAME)
-        .select("*")
-        .order("Bug ID", { ascending: false });
-
-      if (error) {
-        console.error("Error fetching bugs from Supabase:", error);
-        setBugs([]);
-        return;
-      }
+      const params = new URLSearchParams({
+        limit: String(ITEMS_PER_PAGE),
+        include: "comments,attachments",
+      });
+      if (searchText.trim()) params.set("search", searchText.trim());
+      if (cursor) params.set("cursor", cursor);
+      const res = await get(`/api/bugs?${params}`);
 
       setBugTable(BUG_TABLE_NAME);
+      setNextCursor(res?.next_cursor || null);
+      setPage(targetPage);
+      setPageCursors((prev) => [...prev.slice(0, targetPage - 1), cursor]);
 
       // Normalize bugs
-      const normalizedBugs = (data || []).map(normalizeBug);
+      const normalizedBugs = (res?.data || []).map(normalizeBug);
 
       // Fetch all unique assignee IDs (filter out UUIDs only)
       const assigneeIds = [...new Set(
@@ -436,17 +433,20 @@ export default function BugsPage() {
 
       setBugs(bugsWithNames);
     } catch (err) {
-      console.error("Error fetching bugs from Supabase:", err);
+      console.error("Error fetching bugs:", err);
       setBugs([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
+  // first page on load, and again (debounced) whenever the search changes
   useEffect(() => {
-    fetchBugs();
+    const timer = setTimeout(() => fetchBugs(1, null, search), search ? 300 : 0);
+    return () => clearTimeout(timer);
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
+  }, [search]);
 
   // fetch product list from Supabase transtrackers.projects_products
   useEffect(() => {
@@ -513,6 +513,12 @@ export default function BugsPage() {
     setFiles(validFiles);
   };
 
+  // Re-read one bug through the API after appending to its history
+  const reloadBug = async (bugId) => {
+    const res = await get(`/api/bugs/${encodeURIComponent(bugId)}`);
+    return normalizeBug(res?.data);
+  };
+
   // Upload attachments directly to Supabase Storage
   const uploadAttachments = async (bugId, filesArray) => {
     if (!filesArray || filesArray.length === 0) return [];
@@ -558,8 +564,8 @@ export default function BugsPage() {
     e.preventDefault();
     setLoading(true);
 
-    const bugId =
-      isEditing && form["Bug ID"] ? form["Bug ID"] : generateBugId(bugs);
+    // New bugs get their ID from the server's Bug ID sequence
+    const bugId = isEditing && form["Bug ID"] ? form["Bug ID"] : null;
 
     const description = editCommentDraft.trim();
 
@@ -676,27 +682,22 @@ export default function BugsPage() {
       payload.Comments = [...(payload.Comments || []), firstComment];
     }
 
-    // For EDIT, append new comment if present
+    // For EDIT, the new comment is appended through the API after the save
+    let editComment = null;
     if (isEditing && description) {
-      const newComment = {
+      editComment = {
         text: description,
         user: currentUserName,
         timestamp: new Date().toISOString(),
         isReply: replyingToIndex !== null,
       };
 
-      let updatedComments = [...(form.Comments || [])];
-
-      if (
-        replyingToIndex !== null &&
-        replyingToIndex >= 0 &&
-        replyingToIndex < updatedComments.length
-      ) {
-        updatedComments.splice(replyingToIndex + 1, 0, newComment);
-      } else {
-        updatedComments.push(newComment);
+      const parentComment =
+        replyingToIndex !== null ? (form.Comments || [])[replyingToIndex] : null;
+      if (parentComment) {
+        editComment.level = (parentComment.level || 0) + 1;
+        editComment.replyToIndex = replyingToIndex;
       }
-      payload.Comments = updatedComments;
     }
 
     try {
@@ -704,24 +705,27 @@ export default function BugsPage() {
       const dbPayload = buildDbPayload(payload);
 
       if (isEditing) {
+        // Comment and Attachments are history: never write them back from the form
+        const { Comment: _comment, Attachments: _attachments, ...fields } = dbPayload;
         const { data, error } = await supabase
           .from(bugTable)
-          .update(dbPayload)
+          .update(fields)
           .eq("Bug ID", bugId)
           .select("*")
           .single();
 
         if (error) throw error;
         savedRow = data;
-      } else {
-        const { data, error } = await supabase
-          .from(bugTable)
-          .insert(dbPayload)
-          .select("*")
-          .single();
 
-        if (error) throw error;
-        savedRow = data;
+        if (editComment) {
+          await post(`/api/bugs/${encodeURIComponent(bugId)}/comments`, editComment);
+          savedRow = await reloadBug(bugId);
+        }
+      } else {
+        const { "Bug ID": _id, Changed: _changed, ...newBug } = dbPayload;
+        const res = await post("/api/bugs", newBug);
+        savedRow = res?.data?.[0];
+        if (!savedRow) throw new Error("Bug was not created");
       }
 
       let saved = normalizeBug(savedRow);
@@ -732,22 +736,16 @@ export default function BugsPage() {
         const uploaded = await uploadAttachments(savedId, files);
         const successful = uploaded.filter((u) => u.url);
 
-        const updatedAttachments = [
-          ...(saved.Attachments || []),
-          ...successful,
-        ];
-
-        const { data: updatedData, error: updErr } = await supabase
-          .from(bugTable)
-          .update({ Attachments: updatedAttachments })
-          .eq("Bug ID", savedId)
-          .select("*")
-          .single();
-
-        if (!updErr && updatedData) {
-          saved = normalizeBug(updatedData);
-        } else {
-          saved.Attachments = updatedAttachments;
+        if (successful.length > 0) {
+          await post(
+            `/api/bugs/${encodeURIComponent(savedId)}/attachments/append`,
+            { attachments: successful }
+          );
+          try {
+            saved = await reloadBug(savedId);
+          } catch {
+            saved.Attachments = [...(saved.Attachments || []), ...successful];
+          }
         }
 
         setUploadedFiles(saved.Attachments || []);
@@ -803,32 +801,14 @@ export default function BugsPage() {
         timestamp: new Date().toISOString(),
       };
 
-      const updatedComments = [...(form.Comments || []), newComment];
-
-      const payload = {
-        ...form,
-        Comments: updatedComments,
-        "Bug ID": bugId,
-        Changed: new Date().toISOString(),
-      };
-
-      const dbPayload = buildDbPayload(payload);
-
-      const { data, error } = await supabase
-        .from(bugTable)
-        .update(dbPayload)
-        .eq("Bug ID", bugId)
-        .select("*")
-        .single();
-
-      if (error) throw error;
-
-      const saved = normalizeBug(data);
+      await post(`/api/bugs/${encodeURIComponent(bugId)}/comments`, newComment);
+      const saved = await reloadBug(bugId);
 
       setBugs((prev) =>
         prev.map((b) => (b["Bug ID"] === saved["Bug ID"] ? saved : b))
       );
-      setForm(saved);
+      // keep unsaved edits in the form; only the comment history was written
+      setForm((prev) => ({ ...prev, Comments: saved.Comments, Changed: saved.Changed }));
       setSelectedBug(saved);
       setEditCommentDraft("");
       alert("✅ Comment added");
@@ -933,75 +913,53 @@ export default function BugsPage() {
         parentType: activeReplyBox.type, // Mark if this is a reply to 'description' or 'comment'
       };
 
-      let updatedComments = [...(selectedBug.Comments || [])];
+      const comments = selectedBug.Comments || [];
 
       if (
         activeReplyBox.type === "comment" &&
         activeReplyBox.index !== null
       ) {
-        const parentComment = updatedComments[activeReplyBox.index];
+        const parentComment = comments[activeReplyBox.index];
 
         // Safety check: ensure parent comment exists
         if (parentComment) {
           newComment.level = (parentComment.level || 0) + 1;
           newComment.parentIndex = activeReplyBox.index; // Track parent comment index
+          newComment.replyToIndex = activeReplyBox.index; // Nests it, wherever it lands
 
           // Do NOT inherit parentType - comment replies should stay in Comments section
           // Always set parentType to 'comment' for replies to comments
           newComment.parentType = "comment";
-
-          updatedComments.splice(activeReplyBox.index + 1, 0, newComment);
         } else {
           // Fallback: append as regular comment
           newComment.parentType = "comment";
-          updatedComments.push(newComment);
         }
       } else if (
         activeReplyBox.type === "description" &&
         activeReplyBox.index !== null
       ) {
         // Replying to an existing description reply
-        const parentComment = updatedComments[activeReplyBox.index];
+        const parentComment = comments[activeReplyBox.index];
 
         // Safety check: ensure parent comment exists
         if (parentComment) {
           newComment.level = (parentComment.level || 0) + 1;
           newComment.parentIndex = activeReplyBox.index;
           newComment.parentType = "description"; // Keep it in description section
-
-          updatedComments.splice(activeReplyBox.index + 1, 0, newComment);
         } else {
           // Fallback: append as description reply
           newComment.level = 0;
           newComment.parentType = "description";
-          updatedComments.push(newComment);
         }
       } else {
         // Replying directly to the main description (no index)
         newComment.level = 0;
         newComment.parentType = "description";
-        updatedComments.push(newComment);
       }
 
-      const payload = {
-        ...selectedBug,
-        Comments: updatedComments,
-        "Bug ID": bugId,
-        Changed: new Date().toISOString(),
-      };
-
-      const dbPayload = buildDbPayload(payload);
-
-      const { data, error } = await supabase
-        .from(bugTable)
-        .update(dbPayload)
-        .eq("Bug ID", bugId)
-        .select("*")
-        .single();
-
-      if (error) throw error;
-
-      const saved = normalizeBug(data);
+      // Appended server-side; the reply is placed by replyToIndex, not position
+      await post(`/api/bugs/${encodeURIComponent(bugId)}/comments`, newComment);
+      const saved = await reloadBug(bugId);
 
       setSelectedBug(saved);
       setBugs((prev) =>
@@ -1020,31 +978,8 @@ export default function BugsPage() {
 
   /* ---------- SEARCH + PAGINATION ---------- */
 
-  const { filteredBugs, totalPages } = useMemo(() => {
-    const searchLower = safeLower(search);
-
-    const filteredAll = bugs.filter((b) => {
-      const summary = safeLower(b["Summary"]);
-      const product = safeLower(b["Product"]);
-      const assignee = safeLower(b["Assignee"]);
-      const id = String(b["Bug ID"] || "");
-      return (
-        summary.includes(searchLower) ||
-        product.includes(searchLower) ||
-        assignee.includes(searchLower) ||
-        id.includes(search)
-      );
-    });
-
-    const total = Math.max(1, Math.ceil(filteredAll.length / ITEMS_PER_PAGE));
-    const start = (page - 1) * ITEMS_PER_PAGE;
-    const slice = filteredAll.slice(start, start + ITEMS_PER_PAGE);
-
-    return {
-      filteredBugs: slice,
-      totalPages: total,
-    };
-  }, [bugs, search, page]);
+  // the API returns one filtered page at a time
+  const filteredBugs = bugs;
 
   /* ---------- RENDERERS ---------- */
 
@@ -1082,10 +1017,7 @@ export default function BugsPage() {
               type="text"
               placeholder="Search bugs, product, assignee..."
               value={search}
-              onChange={(e) => {
-                setSearch(e.target.value);
-                setPage(1);
-              }}
+              onChange={(e) => setSearch(e.target.value)}
               className="!pl-10 !rounded-lg !border-borderLight focus:!border-accent"
               containerProps={{ className: "min-w-0" }}
             />
@@ -1233,41 +1165,33 @@ export default function BugsPage() {
             <div className="text-sm text-textMuted font-medium">
               Showing{" "}
               {filteredBugs.length ? (page - 1) * ITEMS_PER_PAGE + 1 : 0} -{" "}
-              {Math.min(page * ITEMS_PER_PAGE, bugs.length)} of {bugs.length}{" "}
-              bugs
+              {(page - 1) * ITEMS_PER_PAGE + filteredBugs.length} bugs
             </div>
             <div className="flex items-center gap-2 flex-wrap justify-center sm:justify-end">
               <button
-                disabled={page <= 1}
-                onClick={() => setPage(1)}
+                disabled={page <= 1 || loading}
+                onClick={() => fetchBugs(1, null)}
                 className="px-3 py-2 rounded-lg border border-borderLight bg-white text-primary hover:bg-primary/5 disabled:opacity-40 disabled:cursor-not-allowed font-medium text-sm"
               >
                 First
               </button>
               <button
-                disabled={page <= 1}
-                onClick={() => setPage((p) => Math.max(1, p - 1))}
+                disabled={page <= 1 || loading}
+                onClick={() => fetchBugs(page - 1)}
                 className="px-3 py-2 rounded-lg border border-borderLight bg-white text-primary hover:bg-primary/5 disabled:opacity-40 disabled:cursor-not-allowed font-medium text-sm"
               >
                 Prev
               </button>
               <div className="px-4 py-2 bg-primary/10 rounded-lg text-primary font-bold text-sm">
-                {page} / {totalPages}
+                {page}
               </div>
               <button
-                disabled={page >= totalPages}
-                onClick={() => setPage((p) => Math.min(totalPages, p + 1))}
+                disabled={!nextCursor || loading}
+                onClick={() => fetchBugs(page + 1, nextCursor)}
                 className="px-3 py-2 rounded-lg border border-borderLight bg-white text-primary hover:bg-primary/5 disabled:opacity-40 disabled:cursor-not-allowed font-medium text-sm"
               >
                 Next
               </button>
-              <button
-                disabled={page >= totalPages}
-                onClick={() => setPage(totalPages)}
-                className="px-3 py-2 rounded-lg border border-borderLight bg-white text-primary hover:bg-primary/5 disabled:opacity-40 disabled:cursor-not-allowed font-medium text-sm"
-              >
-                Last
-              </button>
             </div>
           </div>
         </CardBody>
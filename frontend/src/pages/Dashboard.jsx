@@ -16,7 +16,6 @@ console.warn = (...args) => {
 import { useEffect, useState, useMemo } from "react";
 import { Bug, Users as UsersIcon, TrendingUp, ShieldCheck, CheckSquare } from "lucide-react";
 import { Card, CardBody, Typography } from "@material-tailwind/react";
-import { supabase } from "../supabaseClient";
 
 import {
   ResponsiveContainer,
@@ -42,32 +41,45 @@ const API_BASE =
     import.meta.env.VITE_PUBLIC_API_BASE ||
     "https://nexus-z97n.onrender.com");
 
+// columns the transtracker table shows
+const TT_TABLE_FIELDS = [
+  "buildreceiveddate",
+  "buildreceivedtime",
+  "testreportsentdate",
+  "productsegregated",
+  "projects_products",
+  "productowner",
+  "spoc",
+  "totalopenbugs",
+  "blocker",
+  "high",
+  "med",
+  "low",
+];
+
 export default function Dashboard() {
   // ---------------- high-level dashboard states ---------------
   const [totalBugs, setTotalBugs] = useState(0);
   const [totalUsers, setTotalUsers] = useState(0);
   const [transactionCount, setTransactionCount] = useState(0);
   const [securityAlerts, setSecurityAlerts] = useState(0);
-  const [recentBugs, setRecentBugs] = useState([]);
 
   const [priorityData, setPriorityData] = useState([
     { priority: "High", count: 0 },
     { priority: "Medium", count: 0 },
     { priority: "Low", count: 0 },
   ]);
-  const [priorityLoading, setPriorityLoading] = useState(false);
 
   const [userChartData, setUserChartData] = useState([]);
-  const [userChartLoading, setUserChartLoading] = useState(false);
-  const [userMap, setUserMap] = useState({});
 
-  // comprehensive bugs for charts
-  const [allBugs, setAllBugs] = useState([]);
-  const [allBugsLoading, setAllBugsLoading] = useState(false);
-  
+  // every chart and KPI aggregate comes from /api/dashboard/summary
+  const [summary, setSummary] = useState(null);
+  const [summaryLoading, setSummaryLoading] = useState(false);
+
+  // release-quality KPIs from /api/transtracker/analytics
+  const [quality, setQuality] = useState(null);
+
   // ---------------- Tasks for charts ----------------
-  const [allTasks, setAllTasks] = useState([]);
-  const [allTasksLoading, setAllTasksLoading] = useState(false);
   const [taskStartDate, setTaskStartDate] = useState("");
   const [taskEndDate, setTaskEndDate] = useState("");
 
@@ -89,15 +101,13 @@ export default function Dashboard() {
   const [ttEnd, setTtEnd] = useState(endDefault);
   const [ttGroupBy, setTtGroupBy] = useState("day"); // day|week|month
   const [ttLoading, setTtLoading] = useState(false);
-  const [ttTimeseries, setTtTimeseries] = useState([]);
   const [ttRows, setTtRows] = useState([]);
   const [ttLimit, setTtLimit] = useState(10);
   const [ttOffset, setTtOffset] = useState(0);
+  const [ttPageCursors, setTtPageCursors] = useState([null]);
+  const [ttNextCursor, setTtNextCursor] = useState(null);
   const [ttError, setTtError] = useState(null);
 
-  const [ttBarData, setTtBarData] = useState([]);
-  const [ttBarLoading, setTtBarLoading] = useState(false);
-
   // NEW: dropdown options for filters
   const [ttAppTypeOptions, setTtAppTypeOptions] = useState([]);
   const [ttProductOptions, setTtProductOptions] = useState([]);
@@ -159,529 +169,166 @@ export default function Dashboard() {
     return null;
   }
 
-  function normalizeGroupKey(dt, groupBy = "day") {
-    if (!dt) return null;
-    const yy = dt.getFullYear();
-    const mm = String(dt.getMonth() + 1).padStart(2, "0");
-    const dd = String(dt.getDate()).padStart(2, "0");
-    if (groupBy === "month") return `${yy}-${mm}-01`;
-    if (groupBy === "week") {
-      const day = dt.getDay(); // 0 Sun .. 6 Sat
-      const diffToMonday = (day + 6) % 7;
-      const monday = new Date(dt);
-      monday.setDate(dt.getDate() - diffToMonday);
-      const my = monday.getFullYear();
-      const mm2 = String(monday.getMonth() + 1).padStart(2, "0");
-      const dd2 = String(monday.getDate()).padStart(2, "0");
-      return `${my}-${mm2}-${dd2}`;
-    }
-    return `${yy}-${mm}-${dd}`;
-  }
-
-  function aggregateRowsToBarData(rows = [], groupBy = ttGroupBy) {
-    const map = new Map();
-    for (const r of rows || []) {
-      const dt = parseDateFromRow(r);
-      if (!dt) continue;
-      const key = normalizeGroupKey(dt, groupBy || "day");
-      const val = r.totalopenbugs != null ? Number(r.totalopenbugs) : 0;
-      map.set(key, (map.get(key) || 0) + (isNaN(val) ? 0 : val));
-    }
-    return Array.from(map.entries())
-      .map(([date, value]) => ({ date, value: Number(value) }))
-      .sort((a, b) => (a.date > b.date ? 1 : -1));
-  }
-
-  // ---------------- Transtracker fetchers ----------------
-  async function fetchTranstrackerAll({
-    product,
-    owner,
-    start_date,
-    end_date,
-    group_by,
-    app_type,
-    spoc,
-  } = {}) {
+  // ---------------- Transtracker table ----------------
+  // The table reads one page at a time from /api/transtracker/all: filters are
+  // applied server-side and `next_cursor` leads to the following page.
+  async function fetchTranstrackerPage(page, cursor, signal) {
+    if (!API_BASE) return;
     setTtLoading(true);
-    setTtError(null);
     try {
-      const { data, error } = await supabase
-        .from("transtrackers")
-        .select("*")
-        .limit(5000);
-
-      if (error) {
-        console.error("Supabase fetchTranstrackerAll error:", error);
+      const params = new URLSearchParams({
+        limit: String(ttLimit),
+        fields: TT_TABLE_FIELDS.join(","),
+      });
+      const optional = {
+        product: ttProduct,
+        owner: ttOwner,
+        applicationtype: ttAppType,
+        spoc: ttSpoc,
+        date_from: ttStart,
+        date_to: ttEnd,
+      };
+      Object.entries(optional).forEach(([key, value]) => {
+        const v = (value || "").trim();
+        if (v) params.set(key, v);
+      });
+      if (cursor) params.set("cursor", cursor);
+      const url = `${API_BASE.replace(/\/$/, "")}/api/transtracker/all?${params}`;
+      const res = await fetch(url, { signal });
+      if (!res.ok) {
+        console.warn("/api/transtracker/all responded", res.status);
         setTtRows([]);
-        setTtTimeseries([]);
-        setTtError(null);
+        setTtNextCursor(null);
         return;
       }
-
-      const rows = data || [];
-
-      const prodQ = (product || ttProduct || "").trim().toLowerCase();
-      const ownerQ = (owner || ttOwner || "").trim().toLowerCase();
-      const appQ = (app_type || ttAppType || "").trim().toLowerCase();
-      const spocQ = (spoc || ttSpoc || "").trim().toLowerCase();
-      const sdt = start_date ? new Date(start_date + "T00:00:00") : null;
-      const edt = end_date ? new Date(end_date + "T23:59:59") : null;
-
-      const filtered = rows.filter((r) => {
-        const p = (
-          r.productsegregated ||
-          r.projects_products ||
-          r.applicationtype ||
-          r.product ||
-          ""
-        )
-          .toString()
-          .toLowerCase();
-        if (prodQ && !p.includes(prodQ)) return false;
-
-        const o = (r.productowner || r.spoc || r.owner || "")
-          .toString()
-          .toLowerCase();
-        if (ownerQ && !o.includes(ownerQ)) return false;
-
-        const appVal = (
-          r.applicationtype ||
-          r.application ||
-          ""
-        )
-          .toString()
-          .toLowerCase();
-        if (appQ && !appVal.includes(appQ)) return false;
-
-        const spocVal = (r.spoc || "").toString().toLowerCase();
-        if (spocQ && !spocVal.includes(spocQ)) return false;
-
-        if (sdt || edt) {
-          const dt = parseDateFromRow(r);
-          if (!dt) return false;
-          if (sdt && dt < sdt) return false;
-          if (edt && dt > edt) return false;
-        }
-        return true;
-      });
-
-      const buckets = new Map();
-      for (const r of filtered) {
-        const dt = parseDateFromRow(r);
-        if (!dt) continue;
-        const key = normalizeGroupKey(dt, group_by || "day");
-        const val =
-          r.totalopenbugs != null ? Number(r.totalopenbugs) : 1;
-        buckets.set(key, (buckets.get(key) || 0) + (isNaN(val) ? 0 : val));
-      }
-
-      const timeseries = Array.from(buckets.entries())
-        .map(([date, value]) => ({ date, value: Number(value) }))
-        .sort((a, b) => (a.date > b.date ? 1 : -1));
-
-      setTtRows(filtered);
-      setTtTimeseries(timeseries);
-      setTtError(null);
+      const json = await res.json().catch(() => null);
+      setTtRows(json?.status === "success" ? json.data || [] : []);
+      setTtNextCursor(json?.next_cursor || null);
+      setTtOffset(page * ttLimit);
+      // remember how each visited page was reached so Prev can go back
+      setTtPageCursors((prev) => [...prev.slice(0, page), cursor]);
     } catch (err) {
-      console.error("fetchTranstrackerAll error:", err);
-      setTtError(null); // no UI error message
+      if (err?.name === "AbortError") return;
+      console.error("Error fetching /api/transtracker/all:", err);
       setTtRows([]);
-      setTtTimeseries([]);
+      setTtNextCursor(null);
     } finally {
-      setTtLoading(false);
+      if (!signal?.aborted) setTtLoading(false);
     }
   }
 
-  async function fetchTranstrackerBar({
-    product,
-    owner,
-    start_date,
-    end_date,
-    group_by,
-    app_type,
-    spoc,
-  } = {}) {
-    setTtBarLoading(true);
-    setTtError(null);
+  // ---------------- Dashboard summary ----------------
+  // One request for every chart and KPI: the API aggregates server-side and
+  // caches the result per filter combination.
+  async function fetchDashboardSummary(signal) {
+    if (!API_BASE) return;
+    setSummaryLoading(true);
     try {
-      const { data, error } = await supabase
-        .from("transtrackers")
-        .select(
-          "buildreceiveddate, totalopenbugs, productsegregated, productowner, applicationtype, spoc, signoffstatus, blocker, high, med, low"
-        )
-        .limit(5000);
-
-      if (error) {
-        console.error("Supabase fetchTranstrackerBar error:", error);
-        setTtBarData([]);
-        setTtError(null); // do not show any error text
+      const params = new URLSearchParams({ group_by: ttGroupBy || "day" });
+      const optional = {
+        product: ttProduct,
+        owner: ttOwner,
+        applicationtype: ttAppType,
+        spoc: ttSpoc,
+        date_from: ttStart,
+        date_to: ttEnd,
+        task_date_from: taskStartDate,
+        task_date_to: taskEndDate,
+      };
+      Object.entries(optional).forEach(([key, value]) => {
+        const v = (value || "").trim();
+        if (v) params.set(key, v);
+      });
+      const url = `${API_BASE.replace(/\/$/, "")}/api/dashboard/summary?${params}`;
+      const res = await fetch(url, { signal });
+      if (!res.ok) {
+        console.warn("/api/dashboard/summary responded", res.status);
         return;
       }
-
-      const rows = data || [];
-
-      const prodQ = (product || ttProduct || "").trim().toLowerCase();
-      const ownerQ = (owner || ttOwner || "").trim().toLowerCase();
-      const appQ = (app_type || ttAppType || "").trim().toLowerCase();
-      const spocQ = (spoc || ttSpoc || "").trim().toLowerCase();
-      const sdt = start_date
-        ? new Date(start_date + "T00:00:00")
-        : ttStart
-          ? new Date(ttStart + "T00:00:00")
-          : null;
-      const edt = end_date
-        ? new Date(end_date + "T23:59:59")
-        : ttEnd
-          ? new Date(ttEnd + "T23:59:59")
-          : null;
-
-      const filtered = rows.filter((r) => {
-        const p = (r.productsegregated || "").toString().toLowerCase();
-        if (prodQ && !p.includes(prodQ)) return false;
-
-        const o = (r.productowner || "").toString().toLowerCase();
-        if (ownerQ && !o.includes(ownerQ)) return false;
-
-        const appVal = (
-          r.applicationtype ||
-          r.application ||
-          ""
-        )
-          .toString()
-          .toLowerCase();
-        if (appQ && !appVal.includes(appQ)) return false;
-
-        const spocVal = (r.spoc || "").toString().toLowerCase();
-        if (spocQ && !spocVal.includes(spocQ)) return false;
-
-        if (sdt || edt) {
-          const dt = parseDateFromRow(r);
-          if (!dt) return false;
-          if (sdt && dt < sdt) return false;
-          if (edt && dt > edt) return false;
-        }
-        return true;
-      });
-
-      const buckets = new Map();
-      for (const r of filtered) {
-        const dt = parseDateFromRow(r);
-        if (!dt) continue;
-        const key = normalizeGroupKey(dt, group_by || ttGroupBy || "day");
-        const val =
-          r.totalopenbugs != null ? Number(r.totalopenbugs) : 0;
-        buckets.set(key, (buckets.get(key) || 0) + (isNaN(val) ? 0 : val));
+      const json = await res.json().catch(() => null);
+      if (json?.status !== "success" || !json.data) return;
+      const data = json.data;
+      if (data.errors?.length) {
+        console.warn("Dashboard sections unavailable:", data.errors);
       }
 
-      const result = Array.from(buckets.entries())
-        .map(([date, value]) => ({ date, value: Number(value) }))
-        .sort((a, b) => (a.date > b.date ? 1 : -1));
-
-      setTtBarData(result);
-      setTtRows(filtered);
-      setTtError(null);
+      setSummary(data);
+      if (data.counts) {
+        setTotalBugs(Number(data.counts.total_bugs || 0));
+        setTotalUsers(Number(data.counts.users || 0));
+        setTransactionCount(Number(data.counts.transactions || 0));
+      }
+      if (data.priority) {
+        setPriorityData([
+          { priority: "High", count: Number(data.priority.high || 0) },
+          { priority: "Medium", count: Number(data.priority.medium || 0) },
+          { priority: "Low", count: Number(data.priority.low || 0) },
+        ]);
+      }
+      if (data.users) setUserChartData(data.users.by_role || []);
+      if (data.filters) {
+        setTtAppTypeOptions(data.filters.application_types || []);
+        setTtProductOptions(data.filters.products || []);
+        setTtOwnerOptions(data.filters.owners || []);
+        setTtSpocOptions(data.filters.spocs || []);
+      }
     } catch (err) {
-      console.error("fetchTranstrackerBar error:", err);
-      setTtError(null); // no UI error message
-      setTtBarData([]);
+      if (err?.name === "AbortError") return;
+      console.error("Error fetching /api/dashboard/summary:", err);
     } finally {
-      setTtBarLoading(false);
+      if (!signal?.aborted) setSummaryLoading(false);
     }
   }
 
-  // NEW: fetch distinct values for dropdown filters
-  async function fetchTranstrackerFilterOptions() {
+  // ---------------- Release quality analytics ----------------
+  // Coverage, hours saved, severity mix and sign-off rate are computed by the
+  // API (vectorized, cached per filter set) rather than row by row here.
+  async function fetchTranstrackerAnalytics(signal) {
     if (!API_BASE) return;
     try {
-      const url = `${API_BASE.replace(/\/$/, "")}/api/transtracker/filters`;
-      const res = await fetch(url);
+      const params = new URLSearchParams();
+      const optional = {
+        product: ttProduct,
+        owner: ttOwner,
+        applicationtype: ttAppType,
+        spoc: ttSpoc,
+        date_from: ttStart,
+        date_to: ttEnd,
+      };
+      Object.entries(optional).forEach(([key, value]) => {
+        const v = (value || "").trim();
+        if (v) params.set(key, v);
+      });
+      const url = `${API_BASE.replace(/\/$/, "")}/api/transtracker/analytics?${params}`;
+      const res = await fetch(url, { signal });
       if (!res.ok) {
-        console.error("Failed to fetch transtracker filters:", res.status);
+        console.warn("/api/transtracker/analytics responded", res.status);
         return;
       }
-      const json = await res.json();
-      if (json.status === "success" && json.data) {
-        setTtAppTypeOptions(json.data.application_types || []);
-        setTtProductOptions(json.data.products || []);
-        setTtOwnerOptions(json.data.owners || []);
-        setTtSpocOptions(json.data.spocs || []);
-      }
+      const json = await res.json().catch(() => null);
+      if (json?.status === "success" && json.data) setQuality(json.data);
     } catch (err) {
-      console.error("fetchTranstrackerFilterOptions error:", err);
+      if (err?.name === "AbortError") return;
+      console.error("Error fetching /api/transtracker/analytics:", err);
     }
   }
 
-  // ---------------- initial data fetch ----------------
   useEffect(() => {
+    if (ttStart && ttEnd && new Date(ttStart) > new Date(ttEnd)) return;
     const controller = new AbortController();
-    const signal = controller.signal;
-
-    const fetchCounts = async () => {
-      if (!API_BASE) return;
-      try {
-        const url = `${API_BASE.replace(/\/$/, "")}/api/counts`;
-        const res = await fetch(url, { signal });
-        if (!res.ok) {
-          console.warn("/api/counts responded", res.status);
-          return;
-        }
-        const json = await res.json().catch(() => null);
-        if (json?.status === "success" && json.data) {
-          const data = json.data;
-          setTotalBugs(Number(data.total_bugs || 0));
-          setTotalUsers(Number(data.users || 0));
-          setTransactionCount(Number(data.transactions || 0));
-          setSecurityAlerts(Number(data.security_alerts || 0));
-        }
-      } catch (err) {
-        if (err?.name === "AbortError") return;
-        console.error("Error fetching /api/counts:", err);
-      }
-    };
-
-    const fetchRecentBugs = async () => {
-      try {
-        const res = await supabase
-          .from("bugs")
-          .select(`
-            "Bug ID",
-            Summary,
-            Priority,
-            Status
-          `)
-          .order("Changed", { ascending: false })
-          .limit(5);
-
-        const { data, error } = res ?? {};
-        if (error) {
-          console.error("Error fetching recent bugs:", error);
-          setRecentBugs([]);
-          return;
-        }
-
-        setRecentBugs(
-          (data || []).map((b) => ({
-            id:
-              b?.["Bug ID"] ??
-              b?.["bug id"] ??
-              b?.bug_id ??
-              b?.id ??
-              null,
-            title:
-              b?.["Summary"] ??
-              b?.summary ??
-              b?.Title ??
-              "-",
-            severity: b?.["Priority"] ?? b?.priority ?? "-",
-            status: b?.["Status"] ?? b?.status ?? "-",
-          }))
-        );
-      } catch (err) {
-        if (err?.name === "AbortError") return;
-        console.error("Error loading recent bugs:", err);
-        setRecentBugs([]);
-      }
-    };
-
-    const fetchPriorityCountsFromApi = async () => {
-      // Skip API fetch and go directly to fallback
-      return false;
-    };
-
-    const fetchPriorityCountsFallback = async () => {
-      const normalize = (val) => {
-        if (val == null) return "Low";
-        const s = String(val).trim().toLowerCase();
-        if (["critical", "crit", "p0", "p1", "high"].includes(s))
-          return "High";
-        if (["medium", "med", "p2"].includes(s)) return "Medium";
-        if (["low", "minor", "p3", "p4"].includes(s)) return "Low";
-        if (s.includes("high")) return "High";
-        if (s.includes("med")) return "Medium";
-        if (s.includes("low")) return "Low";
-        return "Low";
-      };
-
-      try {
-        setPriorityLoading(true);
-
-        let attempt = await supabase.from("bugs").select('"Priority"');
-        let rows = attempt?.data ?? [];
-
-        if (!rows || rows.length === 0) {
-          const r2 = await supabase.from("bugs").select("Priority");
-          rows = r2?.data && r2.data.length ? r2.data : rows;
-        }
-
-        if (!rows || rows.length === 0) {
-          const r3 = await supabase.from("bugs").select("*").limit(1000);
-          rows = r3?.data && r3.data.length ? r3.data : rows;
-        }
-
-        if (!rows || rows.length === 0) {
-          console.warn(
-            "Supabase returned no rows for Bugs_file (fallback). Check RLS/permissions."
-          );
-          setPriorityData([
-            { priority: "High", count: 0 },
-            { priority: "Medium", count: 0 },
-            { priority: "Low", count: 0 },
-          ]);
-          return;
-        }
-
-        const counts = { High: 0, Medium: 0, Low: 0 };
-        rows.forEach((r) => {
-          let raw = null;
-          if (r && typeof r === "object") {
-            raw = r["Priority"] ?? r.priority ?? null;
-            if (raw == null) {
-              const found = Object.keys(r).find(
-                (k) => k && k.toLowerCase() === "priority"
-              );
-              raw = found ? r[found] : Object.values(r)[0];
-            }
-          } else {
-            raw = r;
-          }
-          const p = normalize(raw);
-          counts[p] = (counts[p] || 0) + 1;
-        });
-
-        setPriorityData([
-          { priority: "High", count: counts.High },
-          { priority: "Medium", count: counts.Medium },
-          { priority: "Low", count: counts.Low },
-        ]);
-      } catch (err) {
-        if (err?.name === "AbortError") return;
-        console.error("Priority fallback fetch failed:", err);
-        setPriorityData([
-          { priority: "High", count: 0 },
-          { priority: "Medium", count: 0 },
-          { priority: "Low", count: 0 },
-        ]);
-      } finally {
-        setPriorityLoading(false);
-      }
-    };
-
-    const fetchUserStats = async () => {
-      try {
-        setUserChartLoading(true);
-        const { data: rows, error } = await supabase
-          .from("users")
-          .select("*");
-        if (error) {
-          console.error("Error fetching users:", error);
-          setUserChartData([]);
-          return;
-        }
-
-        // Build user map for ID -> Name resolution
-        const map = {};
-        (rows || []).forEach((u) => {
-          if (u.id) {
-            // prioritize full_name, then email, then split email, then id
-            let name = u.full_name;
-            if (!name && u.email) {
-              name = u.email.split('@')[0]; // fallback to email prefix
-            }
-            map[u.id] = name || u.id;
-          }
-        });
-        setUserMap(map);
-
-        const freq = {};
-        (rows || []).forEach((r) => {
-          const name =
-            (r && (r.role ?? r.Role ?? r.role_name)) ||
-            "Unknown";
-          const key = String(name).trim() || "Unknown";
-          freq[key] = (freq[key] || 0) + 1;
-        });
-        const pieData = Object.entries(freq).map(([name, value]) => ({
-          name,
-          value,
-        }));
-        setUserChartData(pieData);
-      } catch (err) {
-        if (err?.name === "AbortError") return;
-        console.error("Error fetching user stats:", err);
-        setUserChartData([]);
-      } finally {
-        setUserChartLoading(false);
-      }
-    };
-
-    const fetchAllBugs = async () => {
-      try {
-        setAllBugsLoading(true);
-        const { data, error } = await supabase
-          .from("bugs")
-          .select(`
-            "Bug ID",
-            Summary,
-            Priority,
-            Status,
-            Assignee,
-            Changed,
-            Product,
-            Project,
-            Component,
-            Description
-          `)
-          .limit(2000);
-        if (error) {
-          console.error("Error fetching all bugs:", error);
-          return;
-        }
-        setAllBugs(data || []);
-      } catch (err) {
-        console.error("Error fetching all bugs:", err);
-      } finally {
-        setAllBugsLoading(false);
-      }
-    };
-
-    const fetchAllTasks = async () => {
-      try {
-        setAllTasksLoading(true);
-        const { data, error } = await supabase
-          .from("tasks")
-          .select("*")
-          .limit(2000);
-        if (error) {
-          console.error("Error fetching all tasks:", error);
-          return;
-        }
-        setAllTasks(data || []);
-      } catch (err) {
-        console.error("Error fetching all tasks:", err);
-      } finally {
-        setAllTasksLoading(false);
-      }
-    };
-
-    fetchCounts();
-    fetchRecentBugs();
-    fetchAllBugs();
-    fetchAllTasks();
-    (async () => {
-      const ok = await fetchPriorityCountsFromApi();
-      if (!ok) await fetchPriorityCountsFallback();
-    })();
-    fetchUserStats();
-
-    fetchTranstrackerAll({ group_by: ttGroupBy });
-    fetchTranstrackerBar({ group_by: ttGroupBy });
-
-    // NEW: load dropdown values
-    fetchTranstrackerFilterOptions();
+    fetchTranstrackerAnalytics(controller.signal);
+    return () => controller.abort();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [ttProduct, ttOwner, ttStart, ttEnd, ttAppType, ttSpoc]);
 
+  // reload the summary whenever a filter changes
+  useEffect(() => {
+    if (ttStart && ttEnd && new Date(ttStart) > new Date(ttEnd)) return;
+    const controller = new AbortController();
+    fetchDashboardSummary(controller.signal);
     return () => controller.abort();
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []); // mount only
+  }, [ttProduct, ttOwner, ttStart, ttEnd, ttGroupBy, ttAppType, ttSpoc, taskStartDate, taskEndDate]);
 
   // Delay chart rendering to avoid Recharts dimension warnings
   useEffect(() => {
@@ -691,15 +338,6 @@ export default function Dashboard() {
     return () => clearTimeout(timer);
   }, []);
 
-  // derive ttBarData if missing
-  useEffect(() => {
-    if ((!ttBarData || ttBarData.length === 0) && ttRows && ttRows.length > 0) {
-      const derived = aggregateRowsToBarData(ttRows, ttGroupBy);
-      setTtBarData(derived);
-    }
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [ttRows, ttGroupBy]);
-
   // auto-refresh transtracker when filters change
   useEffect(() => {
     if (ttStart && ttEnd && new Date(ttStart) > new Date(ttEnd)) {
@@ -709,26 +347,12 @@ export default function Dashboard() {
       setTtError(null);
     }
 
-    fetchTranstrackerAll({
-      product: ttProduct,
-      owner: ttOwner,
-      start_date: ttStart,
-      end_date: ttEnd,
-      group_by: ttGroupBy,
-      app_type: ttAppType,
-      spoc: ttSpoc,
-    });
-    fetchTranstrackerBar({
-      product: ttProduct,
-      owner: ttOwner,
-      start_date: ttStart,
-      end_date: ttEnd,
-      group_by: ttGroupBy,
-      app_type: ttAppType,
-      spoc: ttSpoc,
-    });
+    // a filter change starts again from the first page
+    const controller = new AbortController();
+    fetchTranstrackerPage(0, null, controller.signal);
+    return () => controller.abort();
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [ttProduct, ttOwner, ttStart, ttEnd, ttGroupBy, ttAppType, ttSpoc]);
+  }, [ttProduct, ttOwner, ttStart, ttEnd, ttAppType, ttSpoc]);
 
   // ---------------- small components & helpers ----------------
   function KpiCard({
@@ -791,276 +415,46 @@ export default function Dashboard() {
   }
 
   // ---------------- Transtracker derived datasets ----------------
-  const ttFilteredRows = useMemo(() => {
-    const appQuery = ttAppType.trim().toLowerCase();
-    const spocQuery = ttSpoc.trim().toLowerCase();
-    if (!appQuery && !spocQuery) return ttRows;
-
-    return (ttRows || []).filter((r) => {
-      const appVal = (
-        r.applicationtype ||
-        r.application_type ||
-        r.application ||
-        ""
-      )
-        .toString()
-        .toLowerCase();
-      if (appQuery && !appVal.includes(appQuery)) return false;
-
-      const spocVal = (r.spoc || "").toString().toLowerCase();
-      if (spocQuery && !spocVal.includes(spocQuery)) return false;
-
-      return true;
-    });
-  }, [ttRows, ttAppType, ttSpoc]);
-
-  const ttOpenByProduct = useMemo(() => {
-    const m = new Map();
-    for (const r of ttFilteredRows || []) {
-      const p = (
-        r.productsegregated ??
-        r.product ??
-        r.projects_products ??
-        "Unknown"
-      ).toString();
-      const val = Number(r.totalopenbugs ?? 0);
-      m.set(p, (m.get(p) || 0) + (isNaN(val) ? 0 : val));
-    }
-    return Array.from(m.entries())
-      .map(([name, value]) => ({ name, value }))
-      .sort((a, b) => b.value - a.value);
-  }, [ttFilteredRows]);
-
-  const ttBuildByDateSeries = useMemo(
-    () => aggregateRowsToBarData(ttFilteredRows || [], ttGroupBy),
-    [ttFilteredRows, ttGroupBy]
-  );
-
-  const ttApplicationTypeDistribution = useMemo(() => {
-    const m = new Map();
-    for (const r of ttFilteredRows || []) {
-      const name = (
-        r.applicationtype ??
-        r.application ??
-        "Unknown"
-      ).toString();
-      m.set(name, (m.get(name) || 0) + 1);
-    }
-    return Array.from(m.entries())
-      .map(([name, value]) => ({ name, value }))
-      .sort((a, b) => b.value - a.value);
-  }, [ttFilteredRows]);
-
-  const ttSignoffStatus = useMemo(() => {
-    const m = new Map();
-    for (const r of ttFilteredRows || []) {
-      const raw =
-        r.signoffstatus ??
-        r.sign_off_status ??
-        r.signoff_status ??
-        r.qa_signoff ??
-        "";
-      let label;
-      if (!raw) {
-        label = "Pending";
-      } else {
-        const s = String(raw).trim().toLowerCase();
-        if (["go", "signed off", "signoff", "approved"].some((w) =>
-          s.includes(w)
-        )) {
-          label = "Signed Off";
-        } else if (["no go", "rejected"].some((w) => s.includes(w))) {
-          label = "No Go";
-        } else {
-          label = "Conditional Go";
-        }
-      }
-      m.set(label, (m.get(label) || 0) + 1);
-    }
-    return Array.from(m.entries()).map(([name, value]) => ({ name, value }));
-  }, [ttFilteredRows]);
-
-  const ttBuildToReportStats = useMemo(() => {
-    let totalDays = 0;
-    let count = 0;
-
-    for (const r of ttFilteredRows || []) {
-      const buildRaw =
-        r.buildreceiveddate ??
-        r.buildreceived_date ??
-        r.build_received_date ??
-        r.buildreceivedtime ??
-        null;
-      const reportRaw =
-        r.testreportsentdate ??
-        r.report_sent_date ??
-        r.reportsentdate ??
-        null;
-
-      if (!buildRaw || !reportRaw) continue;
-      const bd = new Date(buildRaw);
-      const rd = new Date(reportRaw);
-      if (isNaN(bd) || isNaN(rd)) continue;
-
-      const diffMs = rd.getTime() - bd.getTime();
-      if (diffMs < 0) continue;
-      const days = diffMs / (1000 * 60 * 60 * 24);
-      totalDays += days;
-      count += 1;
-    }
-
-    const avgDays = count ? totalDays / count : 0;
-    const total = ttFilteredRows?.length || 0;
-    const completionRate = total ? Math.round((count / total) * 100) : 0;
+  // chart aggregates come precomputed in the summary; rows feed the table only
+  const ttSummary = summary?.transtracker;
+  const ttOpenByProduct = ttSummary?.open_by_product ?? [];
+  const ttBuildByDateSeries = ttSummary?.open_by_date ?? [];
+  const ttApplicationTypeDistribution = ttSummary?.application_types ?? [];
+  const ttSignoffStatus = ttSummary?.signoff ?? [];
+  const ttBuildToReportStats = {
+    avgDays: Number(ttSummary?.build_to_report?.avg_days ?? 0),
+    completed: ttSummary?.build_to_report?.completed ?? 0,
+    total: ttSummary?.build_to_report?.total ?? 0,
+    completionRate: ttSummary?.build_to_report?.completion_rate ?? 0,
+  };
 
-    return {
-      avgDays: Number(avgDays.toFixed(1)),
-      completed: count,
-      total,
-      completionRate,
-    };
-  }, [ttFilteredRows]);
+  const qualityTotals = quality?.totals;
+  const qualityByQuarter = quality?.by_quarter ?? [];
+  const formatPercent = (v) => (v == null ? "-" : `${v}%`);
 
-  // pagination uses filtered rows
-  const totalRows = ttFilteredRows.length;
-  const currentPage = Math.floor(ttOffset / ttLimit) + 1;
-  const totalPages = Math.max(1, Math.ceil(totalRows / ttLimit));
-  const paginatedRows = ttFilteredRows.slice(ttOffset, ttOffset + ttLimit);
+  // the API already returns one filtered page
+  const paginatedRows = ttRows;
+  const currentPage = Math.floor(ttOffset / ttLimit);
 
   function gotoPrevPage() {
-    setTtOffset((o) => Math.max(0, o - ttLimit));
+    if (currentPage === 0 || ttLoading) return;
+    fetchTranstrackerPage(currentPage - 1, ttPageCursors[currentPage - 1]);
   }
   function gotoNextPage() {
-    setTtOffset((o) =>
-      Math.min(Math.max(0, totalRows - ttLimit), o + ttLimit)
-    );
+    if (!ttNextCursor || ttLoading) return;
+    fetchTranstrackerPage(currentPage + 1, ttNextCursor);
   }
 
   // ---------------- Bug overview (new 3 charts) ----------------
-  const { bugsByStatus, bugsByAssignee, bugsByProject } = useMemo(() => {
-    const statusMap = {};
-    const assigneeMap = {};
-    const projectMap = {};
-
-    const normalizeStatus = (val) => {
-      if (!val) return "Open";
-      const s = String(val).trim().toLowerCase();
-      if (["new", "open", "reopen"].some((w) => s.includes(w))) return "Open";
-      if (
-        ["in progress", "dev in progress", "assigned"].some((w) =>
-          s.includes(w)
-        )
-      )
-        return "In Progress";
-      if (
-        ["fixed", "resolved", "verified", "qa"].some((w) => s.includes(w))
-      )
-        return "Resolved";
-      return "Open";
-    };
-
-    (allBugs || []).forEach((b) => {
-      // status
-      const statusRaw = b.Status ?? b.status ?? b["Status "] ?? null;
-      const status = normalizeStatus(statusRaw);
-      statusMap[status] = (statusMap[status] || 0) + 1;
-
-      // assignee
-      const rawAssignee =
-        b.Assignee ??
-        b.assignee ??
-        b["Assignee "] ??
-        "";
-      if (rawAssignee && String(rawAssignee).trim() !== "") {
-        const keyRaw = String(rawAssignee).trim();
-        // map ID to name if present. check both exact match and lowercase match
-        let key = userMap[keyRaw] || userMap[keyRaw.toLowerCase()] || keyRaw;
-        
-        // If still looks like a UUID (long string with dashes), try to find partial match or leave as is
-        // but often the map lookup should have worked if the ID is correct.
-        assigneeMap[key] = (assigneeMap[key] || 0) + 1;
-      }
-
-      // project
-      const project =
-        b.Project ??
-        b.project ??
-        b.Component ??
-        b.component ??
-        "Unknown";
-      const projectKey = String(project).trim() || "Unknown";
-      projectMap[projectKey] = (projectMap[projectKey] || 0) + 1;
-    });
-
-    // order for status like screenshot
-    const statusOrder = ["Open", "In Progress", "Resolved"];
-    const bugsByStatus = Object.entries(statusMap)
-      .map(([name, value]) => ({ name, value }))
-      .sort((a, b) => {
-        const ia = statusOrder.indexOf(a.name);
-        const ib = statusOrder.indexOf(b.name);
-        if (ia === -1 && ib === -1) return b.value - a.value;
-        if (ia === -1) return 1;
-        if (ib === -1) return -1;
-        return ia - ib;
-      });
-
-    const bugsByAssignee = Object.entries(assigneeMap)
-      .map(([name, value]) => ({ name, value }))
-      .sort((a, b) => b.value - a.value)
-      .slice(0, 5); // top 5 like small card
-
-    const bugsByProject = Object.entries(projectMap)
-      .map(([name, value]) => ({ name, value }))
-      .sort((a, b) => b.value - a.value)
-      .slice(0, 6); // top projects for bottom chart
-
-    return { bugsByStatus, bugsByAssignee, bugsByProject };
-  }, [allBugs, userMap]);
+  // assignee ids are already resolved to names by the API
+  const bugsByStatus = summary?.bugs?.by_status ?? [];
+  const bugsByAssignee = summary?.bugs?.by_assignee ?? [];
+  const bugsByProject = summary?.bugs?.by_project ?? [];
 
   // ---------------- Tasks derived datasets ----------------
-  const { tasksByStatus, tasksByAssignee, tasksByDate } = useMemo(() => {
-    const statusMap = {};
-    const assigneeMap = {};
-    const dateMap = {};
-
-    (allTasks || []).forEach((t) => {
-      // Date filtering
-      if (t.created_at) {
-        const date = t.created_at.slice(0, 10);
-        if (taskStartDate && date < taskStartDate) return;
-        if (taskEndDate && date > taskEndDate) return;
-        
-        dateMap[date] = (dateMap[date] || 0) + 1;
-      } else if (taskStartDate || taskEndDate) {
-        // if filtering by date but no date on task, exclude it? 
-        // usually safer to exclude if date is missing when range is active
-        return; 
-      }
-
-      // Status
-      const statusRaw = t.task_status || "todo";
-      const status = String(statusRaw).charAt(0).toUpperCase() + String(statusRaw).slice(1);
-      statusMap[status] = (statusMap[status] || 0) + 1;
-
-      // Assignee
-      const rawAssignee = t.assigned_to || "Unassigned";
-      const assignee = userMap[rawAssignee] || userMap[rawAssignee.toLowerCase()] || rawAssignee;
-      assigneeMap[assignee] = (assigneeMap[assignee] || 0) + 1;
-    });
-
-    const tasksByStatus = Object.entries(statusMap).map(([name, value]) => ({ name, value }));
-    const tasksByAssignee = Object.entries(assigneeMap)
-      .map(([name, value]) => ({ name, value }))
-      .sort((a, b) => b.value - a.value)
-      .slice(0, 5);
-    
-    const tasksByDate = Object.entries(dateMap)
-      .map(([date, value]) => ({ date, value }))
-      .sort((a, b) => (a.date > b.date ? 1 : -1));
-
-    return { tasksByStatus, tasksByAssignee, tasksByDate };
-  }, [allTasks, taskStartDate, taskEndDate, userMap]);
+  const tasksByStatus = summary?.tasks?.by_status ?? [];
+  const tasksByAssignee = summary?.tasks?.by_assignee ?? [];
+  const tasksByDate = summary?.tasks?.by_date ?? [];
 
   // total for Bugs by Project (for bottom label)
   const bugsByProjectTotal = bugsByProject.reduce(
@@ -1122,7 +516,7 @@ export default function Dashboard() {
             />
             <KpiCard
               title="Total Tasks"
-              value={allTasks ? allTasks.length : 0}
+              value={summary?.tasks?.total ?? 0}
               Icon={CheckSquare}
               gradientFrom="#EFF6FF"
               gradientTo="#DBEAFE"
@@ -1164,7 +558,7 @@ export default function Dashboard() {
               </div>
             </div>
 
-            {allTasksLoading ? (
+            {summaryLoading ? (
               <div className="flex items-center justify-center py-12">
                 <div className="text-textMuted font-medium animate-pulse">
                   Loading task overview...
@@ -1298,7 +692,7 @@ export default function Dashboard() {
               </Typography>
             </div>
 
-            {allBugsLoading ? (
+            {summaryLoading ? (
               <div className="flex items-center justify-center py-12">
                 <div className="text-textMuted font-medium animate-pulse">
                   Loading bug overview...
@@ -1568,7 +962,7 @@ export default function Dashboard() {
                 </div>
 
                 <div className="mt-5 h-64 md:h-72 lg:h-72">
-                  {priorityLoading ? (
+                  {summaryLoading ? (
                     <p className="text-sm text-textMuted py-8 text-center">
                       Loading chart...
                     </p>
@@ -1695,7 +1089,7 @@ export default function Dashboard() {
                     }}
                     className="flex items-center justify-center overflow-visible"
                   >
-                    {userChartLoading ? (
+                    {summaryLoading ? (
                       <p className="text-sm text-textMuted py-8 text-center">
                         Loading users...
                       </p>
@@ -1937,7 +1331,7 @@ export default function Dashboard() {
                       </div>
                     </div>
                     <div className="flex-1">
-                      {ttLoading ? (
+                      {summaryLoading ? (
                         <div className="text-sm text-textMuted">
                           Loading...
                         </div>
@@ -1990,7 +1384,7 @@ export default function Dashboard() {
                       </div>
                     </div>
                     <div className="flex-1">
-                      {ttBarLoading ? (
+                      {summaryLoading ? (
                         <div className="text-sm text-textMuted">
                           Loading...
                         </div>
@@ -2050,7 +1444,7 @@ export default function Dashboard() {
                       </div>
                     </div>
                     <div className="flex-1">
-                      {ttLoading ? (
+                      {summaryLoading ? (
                         <div className="text-sm text-textMuted">
                           Loading...
                         </div>
@@ -2110,7 +1504,7 @@ export default function Dashboard() {
                       </div>
                     </div>
                     <div className="flex-1">
-                      {ttBarLoading ? (
+                      {summaryLoading ? (
                         <div className="text-sm text-textMuted">
                           Loading...
                         </div>
@@ -2155,6 +1549,66 @@ export default function Dashboard() {
                   </div>
                 </div>
 
+                {/* Release quality */}
+                <div className="mt-6 p-4 bg-white rounded-lg shadow-sm">
+                  <div className="text-sm font-semibold text-text mb-3">
+                    Release Quality
+                  </div>
+                  <div className="grid grid-cols-2 lg:grid-cols-4 gap-4">
+                    {[
+                      ["Automation Coverage", formatPercent(qualityTotals?.automation_coverage)],
+                      ["Hours Saved", qualityTotals ? qualityTotals.hours_saved : "-"],
+                      ["Sign-Off Rate", formatPercent(qualityTotals?.signoff_rate)],
+                      [
+                        "Blocker / High Share",
+                        qualityTotals
+                          ? `${formatPercent(qualityTotals.severity_mix.blocker)} / ${formatPercent(qualityTotals.severity_mix.high)}`
+                          : "-",
+                      ],
+                    ].map(([label, value]) => (
+                      <div key={label} className="p-3 rounded-lg bg-slate-50">
+                        <div className="text-xs uppercase text-slate-500 font-semibold tracking-wider">
+                          {label}
+                        </div>
+                        <div className="mt-1 text-xl font-bold text-slate-800">
+                          {value}
+                        </div>
+                      </div>
+                    ))}
+                  </div>
+
+                  {qualityByQuarter.length > 0 && (
+                    <div className="mt-4 w-full overflow-x-auto">
+                      <table className="w-full text-sm">
+                        <thead className="text-left text-textMuted">
+                          <tr>
+                            <th className="px-3 py-2 font-semibold">Quarter</th>
+                            <th className="px-3 py-2 font-semibold">Builds</th>
+                            <th className="px-3 py-2 font-semibold">Coverage</th>
+                            <th className="px-3 py-2 font-semibold">Hours Saved</th>
+                            <th className="px-3 py-2 font-semibold">Blocker / High / Med / Low</th>
+                            <th className="px-3 py-2 font-semibold">Sign-Off Rate</th>
+                          </tr>
+                        </thead>
+                        <tbody>
+                          {qualityByQuarter.map((q) => (
+                            <tr key={q.name} className="border-t border-borderLight">
+                              <td className="px-3 py-2">{q.name}</td>
+                              <td className="px-3 py-2">{q.rows}</td>
+                              <td className="px-3 py-2">{formatPercent(q.automation_coverage)}</td>
+                              <td className="px-3 py-2">{q.hours_saved}</td>
+                              <td className="px-3 py-2">
+                                {q.open_bugs.blocker} / {q.open_bugs.high} / {q.open_bugs.med} / {q.open_bugs.low}
+                              </td>
+                              <td className="px-3 py-2">{formatPercent(q.signoff_rate)}</td>
+                            </tr>
+                          ))}
+                        </tbody>
+                      </table>
+                    </div>
+                  )}
+                </div>
+
                 {/* Build Received → Report Sent slider
                 <div className="mt-6 p-4 bg-white rounded-lg shadow-sm">
                   <div className="flex items-center justify-between mb-2">
@@ -2287,8 +1741,8 @@ export default function Dashboard() {
                     </div>
                     <button
                       onClick={gotoNextPage}
-                      disabled={ttOffset + ttLimit >= totalRows}
-                      className={`px-3 py-1 rounded-md text-sm border border-borderLight ${ttOffset + ttLimit >= totalRows
+                      disabled={!ttNextCursor}
+                      className={`px-3 py-1 rounded-md text-sm border border-borderLight ${!ttNextCursor
                         ? "opacity-50 cursor-not-allowed"
                         : "hover:bg-backgroundAlt"
                         }`}
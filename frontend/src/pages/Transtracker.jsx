@@ -2,6 +2,9 @@
 import React, { useEffect, useState, useRef } from "react";
 // import { useNavigate } from "react-router-dom"; // not used now
 import { supabase } from "../supabaseClient";
+import { get } from "../services/api";
+
+const PAGE_SIZE = 50;
 
 /**
  * Transtracker.jsx — adapted to the provided schema.
@@ -29,6 +32,12 @@ export default function Transtracker() {
   const [showValidationPrompt, setShowValidationPrompt] = useState(false);
   const [validationMessage, setValidationMessage] = useState("");
 
+  // pagination: /api/transtracker/all pages with cursors, so remember how each
+  // visited page was reached (pageCursors[n - 1] loads page n)
+  const [page, setPage] = useState(1);
+  const [pageCursors, setPageCursors] = useState([null]);
+  const [nextCursor, setNextCursor] = useState(null);
+
   const pad2 = (n) => String(n).padStart(2, "0");
   const normalizeDate = (val) => {
     if (!val) return null;
@@ -207,33 +216,35 @@ export default function Transtracker() {
     );
   };
 
-  // fetch data
-  const fetchData = async () => {
+  // fetch one page; view/edit need every form column, so those are requested
+  const fetchData = async (targetPage = page, cursor = pageCursors[targetPage - 1] ?? null) => {
     setLoading(true);
     try {
-      const { data, error } = await supabase
-        .from("transtrackers")
-        .select("*")
-        .order("buildreceiveddate", { ascending: true });
-      if (error) {
-        console.error("Fetch error:", error);
-        setStatusMsg(`❌ Fetch error: ${error.message}`);
-        setRows([]);
-      } else {
-        // normalize dates to yyyy-mm-dd for display
-        const stamped = (data || []).map((d, i) => ({
-          ...d,
-          buildreceiveddate: d.buildreceiveddate ? normalizeDate(d.buildreceiveddate) : null,
-          testreportsentdate: d.testreportsentdate ? normalizeDate(d.testreportsentdate) : null,
-          __uid: d.id != null ? String(d.id) : `__r_${i}_${Date.now()}`,
-        }));
-        setRows(stamped);
-        setStatusMsg("");
-      }
+      const params = new URLSearchParams({
+        limit: String(PAGE_SIZE),
+        fields: Object.keys(initialForm).join(","),
+      });
+      if (cursor) params.set("cursor", cursor);
+      const res = await get(`/api/transtracker/all?${params}`);
+
+      setNextCursor(res?.next_cursor || null);
+      setPage(targetPage);
+      setPageCursors((prev) => [...prev.slice(0, targetPage - 1), cursor]);
+
+      // normalize dates to yyyy-mm-dd for display
+      const stamped = (res?.data || []).map((d, i) => ({
+        ...d,
+        buildreceiveddate: d.buildreceiveddate ? normalizeDate(d.buildreceiveddate) : null,
+        testreportsentdate: d.testreportsentdate ? normalizeDate(d.testreportsentdate) : null,
+        __uid: d.id != null ? String(d.id) : `__r_${i}_${Date.now()}`,
+      }));
+      setRows(stamped);
+      setStatusMsg("");
     } catch (err) {
-      console.error(err);
-      setStatusMsg("❌ Unexpected fetch error");
+      console.error("Fetch error:", err);
+      setStatusMsg(`❌ Fetch error: ${err.message}`);
       setRows([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
       setSelectedSet(new Set());
@@ -646,6 +657,38 @@ export default function Transtracker() {
               </div>
             )}
 
+            {!showAddForm && (
+              <div className="flex justify-between items-center mt-3 text-sm">
+                <div className="text-gray-600">
+                  Showing {rows.length ? (page - 1) * PAGE_SIZE + 1 : 0} - {(page - 1) * PAGE_SIZE + rows.length}
+                </div>
+                <div className="flex items-center gap-2">
+                  <button
+                    disabled={page <= 1}
+                    onClick={() => fetchData(1, null)}
+                    className="px-3 py-1 border rounded disabled:opacity-40"
+                  >
+                    First
+                  </button>
+                  <button
+                    disabled={page <= 1}
+                    onClick={() => fetchData(page - 1)}
+                    className="px-3 py-1 border rounded disabled:opacity-40"
+                  >
+                    Prev
+                  </button>
+                  <span className="px-2 font-medium">{page}</span>
+                  <button
+                    disabled={!nextCursor}
+                    onClick={() => fetchData(page + 1, nextCursor)}
+                    className="px-3 py-1 border rounded disabled:opacity-40"
+                  >
+                    Next
+                  </button>
+                </div>
+              </div>
+            )}
+
             {showAddForm && (
               <div className="mt-6 bg-white p-4 rounded shadow">
                 <div className="flex justify-between items-center mb-4">